@@ -0,0 +1,193 @@
+"""
+Approximate nearest-neighbour (ANN) index for large idea corpora, NumPy only.
+
+IVFIndex clusters the idea vectors with spherical k-means (the "coarse quantizer")
+and keeps one inverted list per cluster. A query only scans the n_probe lists whose
+centroids are closest to it, trading a little recall for a large drop in latency.
+Runs on CPU with no external services.
+"""
+
+import math
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Rows scored at once when assigning vectors to clusters, to bound memory
+ASSIGN_CHUNK = 65536
+
+# Clusters scanned per query; on hashed TF-IDF idea vectors (200k ideas, 1788 lists)
+# this gives recall@10 of about 0.95 (see benchmark_ann.py)
+DEFAULT_N_PROBE = 64
+
+
+def _normalize(rows: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving all-zero rows as zeros."""
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return rows / norms
+
+
+def exact_search(matrix: np.ndarray, query: np.ndarray, k: int) -> List[Tuple[float, int]]:
+    """Brute-force cosine search over normalized rows: (score, row) pairs, best first."""
+    if len(matrix) == 0:
+        return []
+    scores = matrix @ query
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [(float(scores[i]), int(i)) for i in top]
+
+
+class IVFIndex:
+    """Inverted-file index with a k-means coarse quantizer."""
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = DEFAULT_N_PROBE,
+        iterations: int = 10,
+        train_size: int = 50000,
+        seed: int = 0
+    ):
+        """
+        Configure the index; call build() to train it.
+
+        Args:
+            n_lists: Number of clusters (defaults to about 4 * sqrt(corpus size))
+            n_probe: Clusters scanned per query (more = better recall, slower)
+            iterations: k-means iterations
+            train_size: Vectors sampled to train k-means
+            seed: Random seed for reproducible clustering
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.iterations = iterations
+        self.train_size = train_size
+        self.seed = seed
+        self.centroids = None
+        self._list_ids: List[np.ndarray] = []
+        self._list_vectors: List[np.ndarray] = []
+        self.size = 0
+
+    def build(self, vectors: np.ndarray, ids: Optional[np.ndarray] = None) -> "IVFIndex":
+        """Train the quantizer on the vectors and fill the inverted lists."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = np.arange(len(vectors)) if ids is None else np.asarray(ids)
+        n_lists = self.n_lists or max(1, int(4 * math.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors)) if len(vectors) else 1
+        self.n_lists = n_lists
+
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(len(vectors), max(self.train_size, n_lists))
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)] if len(vectors) else vectors
+        self.centroids = self._kmeans(sample, n_lists, rng)
+
+        assignments = self._assign(vectors)
+        order = np.argsort(assignments, kind="stable")
+        boundaries = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self._list_ids = [ids[order[boundaries[i]:boundaries[i + 1]]] for i in range(n_lists)]
+        self._list_vectors = [vectors[order[boundaries[i]:boundaries[i + 1]]] for i in range(n_lists)]
+        self.size = len(vectors)
+        return self
+
+    def _kmeans(self, sample: np.ndarray, n_lists: int, rng: np.random.Generator) -> np.ndarray:
+        """Spherical k-means: centroids are unit vectors, similarity is cosine."""
+        if len(sample) == 0:
+            return np.zeros((1, sample.shape[1]), dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            # Sum members per cluster with one sort + reduceat (much faster than np.add.at)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=n_lists)
+            sums = np.zeros_like(centroids)
+            present = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[present]
+            sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+            # Re-seed empty clusters with random sample points
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = _normalize(sums).astype(np.float32)
+        return centroids
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest centroid for every vector, computed in chunks."""
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), ASSIGN_CHUNK):
+            chunk = vectors[start:start + ASSIGN_CHUNK]
+            assignments[start:start + ASSIGN_CHUNK] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return assignments
+
+    def add(self, vectors: np.ndarray, ids: np.ndarray):
+        """Add vectors to the trained index without retraining the quantizer."""
+        if self.centroids is None:
+            raise ValueError("Index must be built before adding vectors.")
+        vectors = np.asarray(vectors, dtype=np.float32)
+        assignments = self._assign(vectors)
+        for cluster in np.unique(assignments):
+            mask = assignments == cluster
+            self._list_ids[cluster] = np.concatenate([self._list_ids[cluster], np.asarray(ids)[mask]])
+            self._list_vectors[cluster] = np.vstack([self._list_vectors[cluster], vectors[mask]])
+        self.size += len(vectors)
+
+    def search(self, query: np.ndarray, k: int = 10, n_probe: Optional[int] = None) -> List[Tuple[float, int]]:
+        """
+        Approximate cosine search.
+
+        Args:
+            query: Normalized query vector
+            k: Number of neighbours
+            n_probe: Clusters to scan (defaults to the index setting)
+
+        Returns:
+            (score, id) pairs, best first
+        """
+        if self.centroids is None or self.size == 0:
+            return []
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        centroid_scores = self.centroids @ query
+        probes = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+
+        ids = np.concatenate([self._list_ids[p] for p in probes])
+        if len(ids) == 0:
+            return []
+        vectors = np.concatenate([self._list_vectors[p] for p in probes])
+        scores = vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[i]), int(ids[i])) for i in top]
+
+    def save(self, directory: str):
+        """Write the index as .npy files that load() can memory-map."""
+        os.makedirs(directory, exist_ok=True)
+        lengths = [len(ids) for ids in self._list_ids]
+        dimensions = self.centroids.shape[1]
+        np.save(os.path.join(directory, "centroids.npy"), self.centroids)
+        np.save(os.path.join(directory, "list_offsets.npy"), np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64))
+        np.save(os.path.join(directory, "list_ids.npy"), np.concatenate(self._list_ids) if lengths else np.zeros(0, np.int64))
+        np.save(
+            os.path.join(directory, "list_vectors.npy"),
+            np.concatenate(self._list_vectors) if lengths else np.zeros((0, dimensions), np.float32)
+        )
+
+    @classmethod
+    def load(cls, directory: str, n_probe: int = 8, mmap_mode: Optional[str] = "r") -> "IVFIndex":
+        """
+        Load an index written by save().
+
+        With mmap_mode="r" the inverted lists are views into memory-mapped files, so
+        processes loading the same index share one copy through the page cache.
+        """
+        index = cls(n_probe=n_probe)
+        index.centroids = np.load(os.path.join(directory, "centroids.npy"))
+        offsets = np.load(os.path.join(directory, "list_offsets.npy"))
+        ids = np.load(os.path.join(directory, "list_ids.npy"), mmap_mode=mmap_mode)
+        vectors = np.load(os.path.join(directory, "list_vectors.npy"), mmap_mode=mmap_mode)
+        index.n_lists = len(index.centroids)
+        index._list_ids = [ids[offsets[i]:offsets[i + 1]] for i in range(index.n_lists)]
+        index._list_vectors = [vectors[offsets[i]:offsets[i + 1]] for i in range(index.n_lists)]
+        index.size = int(offsets[-1])
+        return index
@@ -0,0 +1,513 @@
+"""
+Headless HTTP API server for the Hackathon Idea Generator.
+Exposes the RAG engine as a JSON API so other services can use it without the Streamlit UI.
+
+Endpoints:
+    POST /generate  - Generate an idea (body uses the same fields as generate_idea)
+    POST /retrieve  - Retrieve similar ideas ({"query": "...", "k": 3})
+    GET  /random    - Get a random idea for inspiration
+    GET  /complete  - Topic typeahead completions (?q=ai+for+he&limit=5)
+    POST /batch     - Generate several ideas ({"specs": [{...}, {...}]})
+    POST /events    - Create or extend an event overlay ({"name": "...", "ideas": [...], "exclude": [titles]})
+    GET  /metrics   - Request counters, queue depth and latency percentiles
+
+Run with: python api_server.py --port 8000 --workers 8 --queue-size 64
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from rag_engine import HackathonRAGEngine, IDEA_PARAMETERS
+from retrieval_workers import RetrievalWorkerPool
+from llm_cassette import TraceWriter
+from typeahead import MAX_COMPLETIONS
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+# Number of recent latencies kept per endpoint for percentile reporting
+LATENCY_WINDOW = 10000
+
+# Most similar ideas one /retrieve request may ask for
+MAX_RETRIEVE_K = 50
+
+
+class QueueFullError(Exception):
+    """Raised when the worker pool queue cannot accept more work."""
+
+
+class WorkerPool:
+    """Fixed pool of worker threads fed by a bounded queue."""
+
+    def __init__(self, workers: int = 8, queue_size: int = 64):
+        """Start the worker threads."""
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._submit_lock = threading.Lock()
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._run, name=f"idea-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue a call, raising QueueFullError if the queue is full."""
+        return self.submit_many([(fn, args, kwargs)])[0]
+
+    def submit_many(self, calls: List[Tuple[Callable, tuple, dict]]) -> List[Future]:
+        """Queue several calls at once; either all are accepted or none are."""
+        if len(calls) > self.queue_size:
+            # Would be refused however long the client waited
+            raise ValueError(f"At most {self.queue_size} calls can be queued at once")
+        with self._submit_lock:
+            if self.queue_size - self._queue.qsize() < len(calls):
+                raise QueueFullError(f"Worker queue is full ({self.queue_size} pending)")
+            futures = []
+            for fn, args, kwargs in calls:
+                future = Future()
+                self._queue.put_nowait((future, fn, args, kwargs))
+                futures.append(future)
+            return futures
+
+    def _run(self):
+        """Worker loop: run queued calls until a shutdown sentinel arrives."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._busy_lock:
+                self._busy += 1
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._busy_lock:
+                    self._busy -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current pool utilisation."""
+        return {
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self.queue_size,
+        }
+
+    def shutdown(self):
+        """Stop all worker threads after the queued work has run."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+class Metrics:
+    """Thread-safe request counters and latency windows per endpoint."""
+
+    def __init__(self):
+        """Create empty metrics."""
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._requests = {}
+        self._statuses = {}
+        self._latencies = {}
+
+    def observe(self, endpoint: str, status: int, latency: float):
+        """Record one finished request."""
+        with self._lock:
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+            self._statuses[status] = self._statuses.get(status, 0) + 1
+            if endpoint not in self._latencies:
+                self._latencies[endpoint] = deque(maxlen=LATENCY_WINDOW)
+            self._latencies[endpoint].append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return counters and latency percentiles (in milliseconds)."""
+        with self._lock:
+            latencies = {
+                endpoint: _percentiles(list(window))
+                for endpoint, window in self._latencies.items()
+            }
+            return {
+                "uptime_seconds": round(time.time() - self._started, 3),
+                "requests": dict(self._requests),
+                "statuses": {str(status): count for status, count in self._statuses.items()},
+                "latency_ms": latencies,
+            }
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    """Compute p50/p95/p99/max over latency samples given in seconds."""
+    if not samples:
+        return {}
+    samples.sort()
+
+    def pick(q):
+        return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3)
+
+    return {
+        "count": len(samples),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(samples[-1] * 1000, 3),
+    }
+
+
+class BadRequest(Exception):
+    """Raised by request handlers for malformed input."""
+
+
+def _clean_spec(spec: Any) -> Dict[str, Any]:
+    """Validate a generation spec and keep only generate_idea parameters."""
+    if not isinstance(spec, dict):
+        raise BadRequest("Generation spec must be a JSON object")
+    unknown = set(spec) - set(IDEA_PARAMETERS)
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(sorted(unknown))}")
+    for field, value in spec.items():
+        if field == "tech_stack":
+            if value is not None and (
+                not isinstance(value, list) or not all(isinstance(tech, str) for tech in value)
+            ):
+                raise BadRequest("tech_stack must be a list of strings")
+        elif value is not None and not isinstance(value, str):
+            raise BadRequest(f"{field} must be a string")
+    return {key: value for key, value in spec.items() if value not in (None, "", [])}
+
+
+# Fields every event idea needs; tech_stack is a list, the others are strings
+IDEA_FIELDS = ("title", "description", "theme", "difficulty", "tech_stack", "team_size")
+
+
+def _clean_idea(idea: Any) -> Dict[str, Any]:
+    """Validate an event idea's fields and types."""
+    if not isinstance(idea, dict) or not all(field in idea for field in IDEA_FIELDS):
+        raise BadRequest(f"ideas must be a list of objects with: {', '.join(IDEA_FIELDS)}")
+    for field in IDEA_FIELDS:
+        value = idea[field]
+        if field == "tech_stack":
+            if not isinstance(value, list) or not all(isinstance(tech, str) for tech in value):
+                raise BadRequest("Idea tech_stack must be a list of strings")
+        elif not isinstance(value, str) or not value.strip():
+            raise BadRequest(f"Idea {field} must be a non-empty string")
+    return idea
+
+
+class IdeaAPIHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the shared engine through the worker pool."""
+
+    # HTTP/1.1 keeps connections alive between requests
+    protocol_version = "HTTP/1.1"
+    server_version = "HackathonIdeaAPI/1.0"
+    # Headers and body are separate writes; with Nagle on, the body waits for the
+    # client's delayed ACK (~40 ms) on every kept-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Handle GET requests."""
+        routes = {
+            "/random": self._handle_random,
+            "/complete": self._handle_complete,
+            "/metrics": self._handle_metrics,
+            "/health": self._handle_health,
+        }
+        self._dispatch(routes)
+
+    def do_POST(self):
+        """Handle POST requests."""
+        routes = {
+            "/generate": self._handle_generate,
+            "/retrieve": self._handle_retrieve,
+            "/batch": self._handle_batch,
+            "/events": self._handle_events,
+        }
+        self._dispatch(routes)
+
+    def _dispatch(self, routes: Dict[str, Callable[[], Tuple[int, Any]]]):
+        """Run the matching route and record metrics for it."""
+        start = time.perf_counter()
+        path = self.path.split("?", 1)[0]
+        handler = routes.get(path)
+        try:
+            # Always consume the body so the kept-alive connection stays in sync
+            self._body = self._read_body()
+            if handler is None:
+                status, payload = 404, {"error": f"Unknown endpoint: {self.command} {path}"}
+            else:
+                status, payload = handler()
+        except BadRequest as e:
+            status, payload = 400, {"error": str(e)}
+        except QueueFullError as e:
+            status, payload = 429, {"error": str(e)}
+        except FutureTimeoutError:
+            status, payload = 504, {"error": "Timed out waiting for a worker"}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+        self._send_json(status, payload)
+        if handler is not None:
+            self.server.metrics.observe(path, status, time.perf_counter() - start)
+
+    def _read_body(self) -> bytes:
+        """Read the raw request body."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Without a usable length the body can't be skipped, so drop the connection
+            self.close_connection = True
+            raise BadRequest("Content-Length must be a non-negative integer")
+        if length > MAX_BODY_SIZE:
+            # The unread body would corrupt the next request on this connection
+            self.close_connection = True
+            raise BadRequest("Request body too large")
+        return self.rfile.read(length) if length else b""
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Parse the JSON request body."""
+        try:
+            data = json.loads(self._body or b"{}")
+        except ValueError:
+            raise BadRequest("Request body must be valid JSON")
+        if not isinstance(data, dict):
+            raise BadRequest("Request body must be a JSON object")
+        return data
+
+    def _send_json(self, status: int, payload: Any):
+        """Write a JSON response with an explicit Content-Length for keep-alive."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _run_in_pool(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a call on the worker pool and wait for its result."""
+        future = self.server.pool.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.server.request_timeout)
+        except FutureTimeoutError:
+            # Nobody is waiting for the result any more; skip it if it hasn't started
+            future.cancel()
+            raise
+
+    def _handle_generate(self) -> Tuple[int, Any]:
+        """Generate one idea, optionally with an event's overlay ({"event": "..."})."""
+        data = self._read_json()
+        event = self._event_name(data.pop("event", None))
+        spec = _clean_spec(data)
+        if self.server.trace is not None:
+            self.server.trace.write(spec)
+        return 200, self._run_in_pool(self.server.engine.generate_idea, event=event, **spec)
+
+    def _handle_retrieve(self) -> Tuple[int, Any]:
+        """Retrieve ideas similar to a query."""
+        data = self._read_json()
+        query = data.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise BadRequest("query must be a non-empty string")
+        k = data.get("k", 3)
+        if not isinstance(k, int) or isinstance(k, bool) or not 1 <= k <= MAX_RETRIEVE_K:
+            raise BadRequest(f"k must be an integer between 1 and {MAX_RETRIEVE_K}")
+        event = self._event_name(data.get("event"))
+        results = self._run_in_pool(self.server.engine.retrieve_similar_ideas, query, k=k, event=event)
+        return 200, {"query": query, "results": results}
+
+    def _handle_random(self) -> Tuple[int, Any]:
+        """Return a random idea for inspiration."""
+        return 200, {"inspiration": self._run_in_pool(self.server.engine.get_random_inspiration)}
+
+    def _handle_complete(self) -> Tuple[int, Any]:
+        """Complete a partly typed topic (fast enough to skip the worker queue)."""
+        params = parse_qs(urlsplit(self.path).query)
+        text = params.get("q", [""])[0]
+        try:
+            limit = int(params.get("limit", ["5"])[0])
+        except ValueError:
+            raise BadRequest("limit must be an integer")
+        if not 1 <= limit <= MAX_COMPLETIONS:
+            raise BadRequest(f"limit must be between 1 and {MAX_COMPLETIONS}")
+        return 200, {"q": text, "completions": self.server.engine.complete_topic(text, limit)}
+
+    def _handle_batch(self) -> Tuple[int, Any]:
+        """Generate one idea per spec, all queued together."""
+        specs = self._read_json().get("specs")
+        if not isinstance(specs, list) or not specs:
+            raise BadRequest("specs must be a non-empty list")
+        if len(specs) > self.server.pool.queue_size:
+            raise BadRequest(f"A batch can have at most {self.server.pool.queue_size} specs")
+        cleaned = [_clean_spec(spec) for spec in specs]
+        if self.server.trace is not None:
+            for spec in cleaned:
+                self.server.trace.write(spec)
+        futures = self.server.pool.submit_many(
+            [(self.server.engine.generate_idea, (), spec) for spec in cleaned]
+        )
+        deadline = time.monotonic() + self.server.request_timeout
+        results = []
+        for future in futures:
+            try:
+                result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                results.append({"ok": True, "result": result})
+            except FutureTimeoutError:
+                for pending in futures:
+                    pending.cancel()
+                raise
+            except Exception as e:
+                results.append({"ok": False, "error": str(e)})
+        return 200, {"results": results}
+
+    def _handle_events(self) -> Tuple[int, Any]:
+        """Create or extend an event overlay."""
+        data = self._read_json()
+        name = data.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise BadRequest("name must be a non-empty string")
+        ideas = data.get("ideas") or []
+        if not isinstance(ideas, list):
+            raise BadRequest(f"ideas must be a list of objects with: {', '.join(IDEA_FIELDS)}")
+        ideas = [_clean_idea(idea) for idea in ideas]
+        exclude = data.get("exclude") or []
+        if not isinstance(exclude, list) or not all(isinstance(title, str) for title in exclude):
+            raise BadRequest("exclude must be a list of idea titles")
+        overlay = self.server.engine.create_event(name, ideas=ideas, exclude=exclude)
+        return 200, {"event": name, **overlay.stats()}
+
+    def _event_name(self, event: Any) -> Optional[str]:
+        """Validate an optional event name against the engine's overlays."""
+        if event is None:
+            return None
+        if not isinstance(event, str):
+            raise BadRequest("event must be a string")
+        try:
+            self.server.engine.get_event(event)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        return event
+
+    def _handle_metrics(self) -> Tuple[int, Any]:
+        """Return metrics and worker pool stats."""
+        metrics = self.server.metrics.snapshot()
+        metrics["pool"] = self.server.pool.stats()
+        return 200, metrics
+
+    def _handle_health(self) -> Tuple[int, Any]:
+        """Report liveness and corpus size."""
+        return 200, {"status": "ok", "ideas": len(self.server.engine.ideas)}
+
+    def log_message(self, format, *args):
+        """Only log requests when the server runs in verbose mode."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class IdeaAPIServer(ThreadingHTTPServer):
+    """HTTP server sharing one engine and worker pool across all connections."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        engine: HackathonRAGEngine,
+        workers: int = 8,
+        queue_size: int = 64,
+        request_timeout: float = 120.0,
+        verbose: bool = False,
+        trace: Optional[TraceWriter] = None
+    ):
+        """Bind the server and start the worker pool."""
+        super().__init__(address, IdeaAPIHandler)
+        self.engine = engine
+        self.pool = WorkerPool(workers=workers, queue_size=queue_size)
+        self.metrics = Metrics()
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+        # Optional log of generation requests, for replay_trace.py
+        self.trace = trace
+
+    def server_close(self):
+        """Close the socket and stop the worker pool."""
+        super().server_close()
+        self.pool.shutdown()
+
+
+def create_server(
+    engine: Optional[HackathonRAGEngine] = None,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    **kwargs
+) -> IdeaAPIServer:
+    """Create an API server, building a default engine if none is given."""
+    if engine is None:
+        engine = HackathonRAGEngine()
+        engine.initialize_knowledge_base()
+    return IdeaAPIServer((host, port), engine, **kwargs)
+
+
+def main():
+    """Parse arguments and serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Hackathon Idea Generator API server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=8, help="Number of worker threads")
+    parser.add_argument("--queue-size", type=int, default=64,
+                        help="Pending requests allowed before answering 429")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="Seconds to wait for a worker before answering 504")
+    parser.add_argument("--retrieval-workers", type=int, default=0,
+                        help="Processes that run retrieval outside the server process (0 = in-process)")
+    parser.add_argument("--compress-text", action="store_true",
+                        help="Keep idea descriptions compressed in memory (for large corpora)")
+    parser.add_argument("--record-trace", metavar="PATH",
+                        help="Append every generation request to a JSONL trace for replay_trace.py")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    retrieval_workers = RetrievalWorkerPool(args.retrieval_workers) if args.retrieval_workers > 0 else None
+    engine = HackathonRAGEngine(retrieval_workers=retrieval_workers, compress_text=args.compress_text)
+    engine.initialize_knowledge_base()
+    server = create_server(
+        engine=engine,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        request_timeout=args.timeout,
+        verbose=args.verbose,
+        trace=TraceWriter(args.record_trace) if args.record_trace else None
+    )
+    print(f"🚀 Hackathon Idea API listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        if server.trace is not None:
+            server.trace.close()
+        if retrieval_workers is not None:
+            retrieval_workers.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,10 @@ import os
 from dotenv import load_dotenv
 from rag_engine import HackathonRAGEngine
 from knowledge_base import get_all_ideas
+from idea_store import IdeaStore, DEFAULT_STORE_PATH
+from sampler import PermutationCursor
+from retrieval_workers import RetrievalWorkerPool
+from session_memory import SessionRegistry, SessionSlot, deep_sizeof, process_rss, DEFAULT_IDLE_TTL
 
 # Load environment variables
 load_dotenv()
@@ -62,17 +66,52 @@ st.markdown("""
 # Initialize session state
 if 'rag_engine' not in st.session_state:
     st.session_state.rag_engine = None
-if 'generated_idea' not in st.session_state:
-    st.session_state.generated_idea = None
+if 'session_slot' not in st.session_state:
+    # Large payloads (the generated result) live here, where idle eviction can reach them
+    st.session_state.session_slot = SessionSlot()
 if 'api_key_set' not in st.session_state:
     st.session_state.api_key_set = False
+if 'inspiration_cursors' not in st.session_state:
+    # Compact no-repeat cursors (only a seed and a counter each), one per theme and
+    # weighting, so switching filters back and forth doesn't replay ideas
+    st.session_state.inspiration_cursors = {}
+
+@st.cache_resource
+def get_idea_store():
+    """Open the generated-idea store once and share it across sessions."""
+    return IdeaStore(DEFAULT_STORE_PATH)
+
+@st.cache_resource
+def get_retrieval_workers():
+    """Start retrieval worker processes shared by all sessions (set RETRIEVAL_WORKERS to enable)."""
+    processes = int(os.getenv("RETRIEVAL_WORKERS", "0"))
+    return RetrievalWorkerPool(processes) if processes > 0 else None
+
+@st.cache_resource
+def get_session_registry():
+    """Track every session's memory; idle ones are spilled to the idea store after SESSION_IDLE_TTL seconds."""
+    return SessionRegistry(
+        get_idea_store(),
+        idle_ttl=float(os.getenv("SESSION_IDLE_TTL", DEFAULT_IDLE_TTL)),
+        max_result_bytes=int(os.getenv("SESSION_MAX_RESULT_KB", "256")) * 1024
+    )
+
+@st.cache_resource(show_spinner="Initializing knowledge base...")
+def get_rag_engine(api_key):
+    """Build the RAG engine once per API key and share it across sessions."""
+    engine = HackathonRAGEngine(
+        gemini_api_key=api_key,
+        idea_store=get_idea_store(),
+        retrieval_workers=get_retrieval_workers()
+    )
+    engine.initialize_knowledge_base()
+    return engine
 
 def initialize_rag_engine(api_key):
     """Initialize the RAG engine with the provided API key."""
     try:
-        engine = HackathonRAGEngine(gemini_api_key=api_key)
-        with st.spinner("Initializing knowledge base..."):
-            num_docs = engine.initialize_knowledge_base()
+        engine = get_rag_engine(api_key)
+        num_docs = len(engine.ideas)
         st.session_state.rag_engine = engine
         st.session_state.api_key_set = True
         st.success(f"✅ RAG engine initialized with {num_docs} sample ideas!")
@@ -81,8 +120,42 @@ def initialize_rag_engine(api_key):
         st.error(f"❌ Error initializing RAG engine: {str(e)}")
         return False
 
+def use_completion(completion):
+    """Replace the topic with a typeahead completion."""
+    st.session_state.topic = completion
+
+def add_technology(tech):
+    """Add a suggested technology to the selection."""
+    st.session_state.tech_options = st.session_state.tech_options + [tech]
+
+def track_session():
+    """Record this session's activity and memory, and evict idle sessions."""
+    registry = get_session_registry()
+    state = {key: value for key, value in st.session_state.items() if key not in ("rag_engine", "session_slot")}
+    registry.touch(st.session_state.session_slot, state_bytes=deep_sizeof(state))
+    registry.sweep()
+    return registry
+
+def show_session_debug(registry):
+    """Debug page: memory held per session and by the whole process."""
+    st.header("Session Memory")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Process RSS", f"{process_rss() / 1e6:.0f} MB")
+    col2.metric("Sessions", len(registry))
+    col3.metric("Session payloads", f"{registry.total_bytes() / 1024:.0f} KB")
+    col4.metric("Evicted / restored", f"{registry.evictions} / {registry.restores}")
+    st.caption(
+        f"Results idle for more than {registry.idle_ttl:.0f} s are spilled to the idea store; "
+        f"each result is capped at {registry.max_result_bytes // 1024} KB."
+    )
+    st.dataframe(registry.stats(), use_container_width=True)
+    if st.button("🧹 Evict idle sessions now"):
+        st.success(f"Evicted {registry.sweep()} session results.")
+
 def main():
     """Main application function."""
+    registry = track_session()
+    slot = st.session_state.session_slot
     
     # Header
     st.markdown('<h1 class="main-header">🚀 Hackathon Idea Generator</h1>', unsafe_allow_html=True)
@@ -141,7 +214,11 @@ def main():
         return
     
     # Tabs for different functionalities
-    tab1, tab2, tab3 = st.tabs(["🎨 Generate Idea", "💡 Random Inspiration", "📊 Browse Knowledge Base"])
+    tab_names = ["🎨 Generate Idea", "💡 Random Inspiration", "📊 Browse Knowledge Base", "🗂️ Idea History"]
+    # Memory accounting page for operators (set SESSION_DEBUG=1)
+    show_debug = bool(os.getenv("SESSION_DEBUG"))
+    tabs = st.tabs(tab_names + (["🩺 Sessions"] if show_debug else []))
+    tab1, tab2, tab3, tab4 = tabs[:4]
     
     with tab1:
         st.header("Generate Custom Hackathon Idea")
@@ -149,10 +226,18 @@ def main():
         # Topic input - Main feature
         topic = st.text_input(
             "🎯 Enter Your Topic",
+            key="topic",
             placeholder="E.g., 'AI for climate change', 'Blockchain voting', 'Mental health app'",
             help="Enter the main topic or idea for your hackathon project"
         )
         
+        # Typeahead: topics the knowledge base knows retrieve better than vague ones
+        completions = st.session_state.rag_engine.complete_topic(topic, limit=4) if topic else []
+        if completions:
+            st.caption("Suggestions")
+            for column, completion in zip(st.columns(len(completions)), completions):
+                column.button(completion, key=f"complete_{completion}", on_click=use_completion, args=(completion,))
+        
         col1, col2 = st.columns(2)
         
         with col1:
@@ -176,13 +261,25 @@ def main():
                 help="How many people will work on this project?"
             )
             
+            common_tech = ["Python", "JavaScript", "React", "Node.js", "TensorFlow", 
+                           "PyTorch", "MongoDB", "PostgreSQL", "Firebase", "AWS",
+                           "Docker", "Kubernetes", "Blockchain", "Unity", "Flutter"]
+            # Every technology in the knowledge base can be picked, so suggestions always fit
+            corpus_tech = [tech for tech in st.session_state.rag_engine.known_technologies() if tech not in common_tech]
             tech_options = st.multiselect(
                 "Preferred Technologies (optional)",
-                ["Python", "JavaScript", "React", "Node.js", "TensorFlow", 
-                 "PyTorch", "MongoDB", "PostgreSQL", "Firebase", "AWS",
-                 "Docker", "Kubernetes", "Blockchain", "Unity", "Flutter"],
+                common_tech + sorted(corpus_tech),
+                key="tech_options",
                 help="Select technologies you'd like to use"
             )
+            
+            tech_suggestions = st.session_state.rag_engine.suggest_tech(
+                tech_options, theme=None if theme == "Any" else theme, limit=3
+            )
+            if tech_suggestions:
+                st.caption("Often used with your picks" if tech_options else "Popular for this theme")
+                for column, (tech, _) in zip(st.columns(len(tech_suggestions)), tech_suggestions):
+                    column.button(f"+ {tech}", key=f"suggest_{tech}", on_click=add_technology, args=(tech,))
         
         custom_requirements = st.text_area(
             "Additional Requirements (optional)",
@@ -190,6 +287,24 @@ def main():
             help="Add any specific requirements or constraints"
         )
         
+        with st.expander("⚙️ Advanced"):
+            mmr_lambda = st.slider(
+                "Reference ideas: relevance vs. variety",
+                min_value=0.0, max_value=1.0, value=0.7, step=0.1,
+                help="1.0 uses the most relevant reference ideas; lower values pick more varied ones"
+            )
+            retrieval_mode = st.radio(
+                "Reference idea search",
+                ["hybrid", "keyword", "vector"],
+                horizontal=True,
+                help="Hybrid fuses exact keyword matches with similar-meaning matches"
+            )
+            best_of = st.slider(
+                "Candidates to generate",
+                min_value=1, max_value=5, value=1,
+                help="Generates several ideas at once and shows the one that is most novel and best fits your choices"
+            )
+        
         if st.button("🚀 Generate Hackathon Idea", type="primary"):
             # Prepare parameters
             params = {
@@ -198,36 +313,67 @@ def main():
                 "difficulty": None if difficulty == "Any" else difficulty,
                 "tech_stack": tech_options if tech_options else None,
                 "team_size": None if team_size == "Any" else team_size,
-                "custom_requirements": custom_requirements if custom_requirements else None
+                "custom_requirements": custom_requirements if custom_requirements else None,
+                "mmr_lambda": mmr_lambda,
+                "retrieval_mode": retrieval_mode,
+                "best_of": best_of
             }
             
             # Generate idea
             with st.spinner("🤖 AI is generating your hackathon idea..."):
                 try:
                     result = st.session_state.rag_engine.generate_idea(**params)
-                    st.session_state.generated_idea = result
+                    registry.set_result(slot, result)
                 except Exception as e:
                     st.error(f"❌ Error generating idea: {str(e)}")
                     return
         
-        # Display generated idea
-        if st.session_state.generated_idea:
+        # Display generated idea (restored from the idea store if it was evicted while idle)
+        generated = registry.get_result(slot)
+        if generated:
             st.divider()
             st.subheader("✨ Your Generated Hackathon Idea")
             
             # Main idea
-            st.markdown(st.session_state.generated_idea['generated_idea'])
+            st.markdown(generated['generated_idea'])
+            
+            # Other candidates from best-of-N generation
+            candidates = generated.get('candidates')
+            if candidates:
+                best_scores = candidates[0]['scores']
+                st.caption(
+                    f"Best of {len(candidates)} candidates · novelty {best_scores['novelty']:.2f}, "
+                    f"fit {best_scores['facet_fit']:.2f}, sections {best_scores['sections']:.2f}"
+                )
+                with st.expander(f"🥈 Other Candidates ({len(candidates) - 1})"):
+                    for i, candidate in enumerate(candidates[1:], 2):
+                        scores = candidate['scores']
+                        st.markdown(f"**Candidate {i}** · score {scores['total']:.2f}")
+                        st.markdown(candidate['generated_idea'])
+                        st.divider()
             
             # Similar ideas used for context
             with st.expander("🔍 Similar Ideas Used for Context (RAG)"):
-                for i, idea in enumerate(st.session_state.generated_idea['similar_ideas'], 1):
+                for i, idea in enumerate(generated['similar_ideas'], 1):
                     st.markdown(f"**{i}. Reference Idea**")
                     st.text(idea['content'])
                     st.caption(f"Similarity Score: {idea['similarity_score']:.4f}")
                     st.divider()
+                timings = generated.get('retrieval_timings', {})
+                if timings:
+                    st.caption("Retrieval time: " + ", ".join(
+                        f"{stage.replace('_ms', '')} {ms:.1f} ms" for stage, ms in timings.items() if stage.endswith('_ms')
+                    ))
+                query_plan = generated.get('query_plan')
+                if query_plan:
+                    st.markdown("**Query plan**")
+                    st.code(query_plan, language=None)
+            
+            if generated.get('trimmed'):
+                st.caption(f"Trimmed to save memory: {', '.join(generated['trimmed'])}")
             
             # Download button
-            idea_text = st.session_state.generated_idea['generated_idea']
+            idea_text = generated['generated_idea']
             st.download_button(
                 label="📥 Download Idea as Text",
                 data=idea_text,
@@ -239,8 +385,35 @@ def main():
         st.header("Get Random Inspiration")
         st.write("Not sure where to start? Get a random idea from our knowledge base!")
         
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            inspiration_theme = st.selectbox(
+                "Theme",
+                ["Any"] + sorted(set(idea['theme'] for idea in st.session_state.rag_engine.ideas)),
+                key="inspiration_theme"
+            )
+        with col2:
+            favor = st.selectbox(
+                "Favor",
+                ["Nothing", "Popular themes & tech", "Recent ideas"],
+                key="inspiration_weighting"
+            )
+            weighting = {"Nothing": "uniform", "Popular themes & tech": "popularity", "Recent ideas": "freshness"}[favor]
+        with col3:
+            no_repeat = st.checkbox("Don't repeat ideas", value=True,
+                                    help="Show every idea once before any repeats")
+        
         if st.button("🎲 Get Random Idea"):
-            inspiration = st.session_state.rag_engine.get_random_inspiration()
+            cursor = None
+            if no_repeat:
+                cursor = st.session_state.inspiration_cursors.setdefault(
+                    (inspiration_theme, weighting), PermutationCursor()
+                )
+            inspiration = st.session_state.rag_engine.get_random_inspiration(
+                cursor=cursor,
+                theme=None if inspiration_theme == "Any" else inspiration_theme,
+                weighting=weighting
+            )
             st.markdown('<div class="idea-box">', unsafe_allow_html=True)
             st.markdown(inspiration)
             st.markdown('</div>', unsafe_allow_html=True)
@@ -292,6 +465,48 @@ def main():
                         st.write(f"**Team Size:** {idea['team_size']}")
             
             st.divider()
+    
+    with tab4:
+        st.header("Search Generated Ideas")
+        st.write("Every generated idea is saved. Search them before generating a new one!")
+        
+        store = get_idea_store()
+        search_text = st.text_input("🔎 Search", placeholder="E.g., 'solar', 'mental health', 'Solidity'")
+        
+        col1, col2, col3 = st.columns(3)
+        counts = store.facet_counts(text=search_text)
+        with col1:
+            history_theme = st.selectbox("Theme", ["All"] + list(counts["theme"]), key="history_theme")
+        with col2:
+            history_difficulty = st.selectbox("Difficulty", ["All"] + list(counts["difficulty"]), key="history_difficulty")
+        with col3:
+            history_tech = st.text_input("Technology", placeholder="E.g., 'React'", key="history_tech")
+        
+        results = store.search(
+            text=search_text,
+            theme=None if history_theme in ("All", "Any") else history_theme,
+            difficulty=None if history_difficulty in ("All", "Any") else history_difficulty,
+            tech=history_tech or None,
+            limit=25
+        )
+        st.write(f"**Showing {len(results)} of {store.count()} saved ideas**")
+        
+        for stored in results:
+            with st.expander(f"💡 {stored['title'] or 'Untitled Idea'}"):
+                st.caption(
+                    f"Theme: {stored['theme'] or 'Any'} | Difficulty: {stored['difficulty'] or 'Any'} | "
+                    f"Tech: {', '.join(stored['tech_stack']) or 'Any'}"
+                )
+                st.markdown(stored['generated_idea'])
+                if stored['promoted']:
+                    st.success("✅ Part of the knowledge base")
+                elif st.button("➕ Add to Knowledge Base", key=f"promote_{stored['idea_id']}"):
+                    st.session_state.rag_engine.promote_generated_idea(stored['idea_id'])
+                    st.success("✅ Added to the knowledge base!")
+    
+    if show_debug:
+        with tabs[4]:
+            show_session_debug(registry)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,84 @@
+"""
+Recall vs. latency benchmark for the IVF approximate nearest-neighbour index.
+Vectorizes a synthetic idea corpus with the same hashed TF-IDF IdeaVectors the
+engine uses, then compares IVF search at several probe counts against exact
+brute-force search for queries written like user topics.
+
+Run with: python benchmark_ann.py --count 1000000 --queries 200
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from ann_index import IVFIndex, exact_search
+from benchmark_text_store import synthetic_ideas
+from text_vectors import IdeaVectors
+
+
+def make_queries(count: int, seed: int) -> List[str]:
+    """Short topic-like queries: a held-out idea's title and the start of its description."""
+    queries = []
+    for idea in synthetic_ideas(count, seed=seed):
+        words = idea["description"].split()
+        queries.append(" ".join([idea["title"]] + words[:6]))
+    return queries
+
+
+def percentile(samples, q):
+    """Percentile of a list of latencies, in milliseconds."""
+    return float(np.percentile(samples, q)) * 1000
+
+
+def main():
+    """Run the benchmark and print a recall/latency table."""
+    parser = argparse.ArgumentParser(description="Benchmark IVF ANN search against exact search")
+    parser.add_argument("--count", type=int, default=200000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--probes", default="1,2,4,8,16,32,64", help="Comma-separated n_probe values")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"Vectorizing {args.count:,} synthetic ideas...")
+    start = time.perf_counter()
+    vectors = IdeaVectors(list(synthetic_ideas(args.count, seed=args.seed)))
+    corpus = vectors.matrix
+    print(f"Vectorized in {time.perf_counter() - start:.1f}s ({corpus.shape[1]} dims)")
+    queries = [vectors.encode_query(text) for text in make_queries(args.queries, args.seed + 1)]
+    queries = [query for query in queries if query.any()]
+
+    start = time.perf_counter()
+    index = IVFIndex(seed=args.seed).build(corpus)
+    print(f"Built IVF index with {index.n_lists} lists in {time.perf_counter() - start:.1f}s")
+
+    exact_latencies, truth = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = exact_search(corpus, query, args.k)
+        exact_latencies.append(time.perf_counter() - start)
+        truth.append({i for _, i in result})
+
+    print("\n" + "=" * 60)
+    print(f"  {'method':<14}{'recall@' + str(args.k):>10}{'p50 ms':>12}{'p99 ms':>12}")
+    print("=" * 60)
+    print(f"  {'exact':<14}{1.0:>10.3f}{percentile(exact_latencies, 50):>12.2f}"
+          f"{percentile(exact_latencies, 99):>12.2f}")
+
+    for n_probe in [int(p) for p in args.probes.split(",")]:
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            result = index.search(query, args.k, n_probe=n_probe)
+            latencies.append(time.perf_counter() - start)
+            hits += len(expected & {i for _, i in result})
+        recall = hits / (len(queries) * args.k)
+        print(f"  {'ivf probe=' + str(n_probe):<14}{recall:>10.3f}{percentile(latencies, 50):>12.2f}"
+              f"{percentile(latencies, 99):>12.2f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Memory and lookup-latency benchmark for compressed idea descriptions.
+Builds the same synthetic corpus as a plain list of dicts and as CompressedIdeas,
+each in its own process so resident memory (RSS) is measured cleanly, then times
+random idea lookups with a hot/cold access mix.
+
+Synthetic text is recombined from the sample ideas with random product names mixed
+in; real descriptions compress differently, so treat the ratio as indicative.
+
+Run with: python benchmark_text_store.py --count 1000000
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import re
+import resource
+import string
+import time
+from typing import Dict, Iterator
+
+import numpy as np
+
+from compressed_text import CompressedIdeas
+from knowledge_base import get_all_ideas
+
+
+def current_rss() -> int:
+    """Resident memory of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak RSS where /proc is unavailable (kilobytes on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def synthetic_ideas(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Stream ideas whose descriptions mix sample-idea sentences with random names."""
+    rng = random.Random(seed)
+    base = get_all_ideas()
+    sentences = [s for idea in base for s in re.split(r"(?<=\.)\s+", idea["description"]) if s]
+    for i in range(count):
+        template = base[i % len(base)]
+        name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))).capitalize()
+        text = " ".join(rng.choices(sentences, k=3))
+        words = [name if rng.random() < 0.08 else word for word in text.split()]
+        yield {
+            **template,
+            "title": f"{name} - {template['title'].split(' - ')[-1]}",
+            "description": " ".join(words),
+        }
+
+
+def run_variant(variant: str, count: int, lookups: int, results: multiprocessing.Queue):
+    """Build one corpus representation and measure it (runs in a child process)."""
+    before = current_rss()
+    start = time.perf_counter()
+    if variant == "compressed":
+        ideas = CompressedIdeas(synthetic_ideas(count))
+    else:
+        ideas = list(synthetic_ideas(count))
+    build_seconds = time.perf_counter() - start
+    rss = current_rss() - before
+
+    rng = np.random.default_rng(1)
+    # 80% of lookups hit a hot 5% of ideas, like popular results being shown repeatedly
+    hot = rng.choice(count, max(1, count // 20), replace=False)
+    positions = np.where(rng.random(lookups) < 0.8, rng.choice(hot, lookups), rng.integers(0, count, lookups))
+    latencies = np.empty(lookups)
+    for i, position in enumerate(positions.tolist()):
+        start = time.perf_counter()
+        ideas[position]["description"]
+        latencies[i] = time.perf_counter() - start
+
+    report = {
+        "variant": variant,
+        "rss_mb": rss / 1e6,
+        "build_s": build_seconds,
+        "p50_us": float(np.percentile(latencies, 50)) * 1e6,
+        "p99_us": float(np.percentile(latencies, 99)) * 1e6,
+    }
+    if variant == "compressed":
+        report["text_mb"] = ideas.texts.nbytes / 1e6
+        report["hit_rate"] = ideas.texts.cache_hits / max(1, ideas.texts.cache_hits + ideas.texts.cache_misses)
+    results.put(report)
+
+
+def main():
+    """Run both variants and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark compressed idea descriptions")
+    parser.add_argument("--count", type=int, default=1000000, help="Number of ideas")
+    parser.add_argument("--lookups", type=int, default=100000, help="Random idea lookups to time")
+    args = parser.parse_args()
+
+    reports = []
+    for variant in ("plain", "compressed"):
+        print(f"Building {args.count:,} ideas ({variant})...")
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run_variant, args=(variant, args.count, args.lookups, results))
+        process.start()
+        reports.append(results.get())
+        process.join()
+
+    print("\n" + "=" * 66)
+    print(f"  {'variant':<12}{'RSS MB':>10}{'build s':>10}{'p50 us':>10}{'p99 us':>10}{'hit rate':>12}")
+    print("=" * 66)
+    for r in reports:
+        hit_rate = f"{r['hit_rate']:.1%}" if "hit_rate" in r else "-"
+        print(f"  {r['variant']:<12}{r['rss_mb']:>10.0f}{r['build_s']:>10.1f}{r['p50_us']:>10.2f}"
+              f"{r['p99_us']:>10.2f}{hit_rate:>12}")
+    print("=" * 66)
+    plain, compressed = reports
+    print(f"RSS reduction: {1 - compressed['rss_mb'] / plain['rss_mb']:.1%} "
+          f"(compressed descriptions: {compressed['text_mb']:.0f} MB)")
+    print(f"Added lookup latency: p50 +{compressed['p50_us'] - plain['p50_us']:.2f} us, "
+          f"p99 +{compressed['p99_us'] - plain['p99_us']:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Retrieval latency under concurrent sessions, in-process vs. retrieval worker pool.
+Each simulated session is a thread calling retrieve_similar_ideas in a loop, like
+Streamlit sessions sharing one server process.
+
+Run with: python benchmark_workers.py --count 50000 --sessions 1,10,25,50 --processes 4
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from benchmark_text_store import synthetic_ideas
+from rag_engine import HackathonRAGEngine
+from retrieval_workers import RetrievalWorkerPool
+
+QUERIES = [
+    "blockchain voting",
+    "AI mental health companion",
+    "smart campus energy",
+    "AR museum guide",
+    "food waste marketplace",
+    "telemedicine for rural clinics",
+    "collaborative code learning",
+    "wildlife tracking drones",
+]
+
+
+def run_sessions(engine: HackathonRAGEngine, sessions: int, requests: int, mode: str) -> List[float]:
+    """Run concurrent sessions and return every retrieval latency in seconds."""
+    latencies = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(sessions)
+
+    def session(seed):
+        rng = random.Random(seed)
+        local = []
+        start_barrier.wait()
+        for _ in range(requests):
+            start = time.perf_counter()
+            engine.retrieve_similar_ideas(rng.choice(QUERIES), k=3, mode=mode)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main():
+    """Run the benchmark and print a latency table."""
+    parser = argparse.ArgumentParser(description="Benchmark retrieval latency with and without worker processes")
+    parser.add_argument("--count", type=int, default=50000, help="Synthetic ideas added to the corpus")
+    parser.add_argument("--sessions", default="1,10,25,50", help="Comma-separated concurrent session counts")
+    parser.add_argument("--requests", type=int, default=20, help="Retrievals per session")
+    parser.add_argument("--mode", default="hybrid", choices=["keyword", "vector", "hybrid"], help="Retrieval mode")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Retrieval worker processes")
+    args = parser.parse_args()
+
+    if (os.cpu_count() or 1) < args.processes + 1:
+        print(f"Warning: {os.cpu_count()} CPU(s) for {args.processes} workers plus the app process; "
+              "worker p99 only stays flat with a CPU per worker")
+    print(f"Building a corpus of {args.count:,} synthetic ideas...")
+    ideas = list(synthetic_ideas(args.count))
+    pool = RetrievalWorkerPool(args.processes)
+    engines = {
+        "in-process": HackathonRAGEngine(gemini_api_key="benchmark-key"),
+        f"{args.processes} workers": HackathonRAGEngine(gemini_api_key="benchmark-key", retrieval_workers=pool),
+    }
+    for engine in engines.values():
+        engine.add_ideas(ideas)
+        engine.initialize_knowledge_base()
+        # Build the lazily created indexes before measuring
+        engine.retrieve_similar_ideas(QUERIES[0], mode=args.mode)
+
+    print("\n" + "=" * 60)
+    print(f"  {'engine':<16}{'sessions':>10}{'p50 ms':>12}{'p99 ms':>12}{'req/s':>10}")
+    print("=" * 60)
+    try:
+        for name, engine in engines.items():
+            for sessions in [int(s) for s in args.sessions.split(",")]:
+                start = time.perf_counter()
+                latencies = run_sessions(engine, sessions, args.requests, args.mode)
+                elapsed = time.perf_counter() - start
+                p50, p99 = (float(np.percentile(latencies, q)) * 1000 for q in (50, 99))
+                print(f"  {name:<16}{sessions:>10}{p50:>12.1f}{p99:>12.1f}{len(latencies) / elapsed:>10.1f}")
+    finally:
+        pool.close()
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Bulk idea generation for building an event's idea catalogue.
+Reads generation specs from a CSV or JSONL file, generates ideas concurrently and
+streams each result to a JSONL file as soon as it finishes.
+
+The output file doubles as the checkpoint: re-running the same command skips every
+spec that already has a successful result, so interrupted runs resume where they
+stopped without paying for the same generation twice.
+
+Run with: python bulk_generate.py specs.csv -o ideas.jsonl --concurrency 8
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from rag_engine import HackathonRAGEngine, IDEA_PARAMETERS
+
+
+def normalize_spec(raw: Dict) -> Dict:
+    """Keep generate_idea parameters and drop empty values."""
+    spec = {}
+    for field in IDEA_PARAMETERS:
+        value = raw.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        if field == "tech_stack" and isinstance(value, str):
+            # CSV cells list technologies separated by ';' or ','
+            value = [tech.strip() for tech in value.replace(";", ",").split(",") if tech.strip()]
+        if value not in (None, "", []):
+            spec[field] = value
+    return spec
+
+
+def spec_digest(spec: Dict) -> str:
+    """Short hash of a spec's content."""
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def spec_key(spec: Dict, occurrence: int = 1) -> str:
+    """
+    Build a stable key for the n-th occurrence of a spec in the input.
+
+    Keys depend only on the spec's content, so adding, removing or reordering other
+    rows doesn't invalidate finished results; repeated specs are told apart by count.
+    """
+    return f"{spec_digest(spec)}#{occurrence}"
+
+
+def read_specs(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (row number, spec) pairs from a CSV or JSONL file."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row, raw in enumerate(csv.DictReader(f), 1):
+                yield row, normalize_spec(raw)
+    else:
+        with open(path, encoding="utf-8") as f:
+            for row, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    raw = json.loads(line)
+                except ValueError:
+                    raise ValueError(f"{path}:{row}: invalid JSON")
+                if not isinstance(raw, dict):
+                    raise ValueError(f"{path}:{row}: expected a JSON object")
+                yield row, normalize_spec(raw)
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """
+    Read an existing output file and return the keys of completed specs.
+
+    Unreadable lines are skipped (their specs simply run again). A partially
+    written last line (from an interrupted run) is truncated away so new results
+    can be appended cleanly.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    good_bytes = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            good_bytes += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get("status") == "ok" and isinstance(record.get("key"), str):
+                completed.add(record["key"])
+
+    if good_bytes < os.path.getsize(output_path):
+        with open(output_path, "rb+") as f:
+            f.truncate(good_bytes)
+    return completed
+
+
+def generate_one(engine: HackathonRAGEngine, row: int, key: str, spec: Dict) -> Dict:
+    """Generate one idea and build its output record."""
+    start = time.perf_counter()
+    record = {"row": row, "key": key, "parameters": spec}
+    try:
+        result = engine.generate_idea(**spec)
+        record["status"] = "ok"
+        record["generated_idea"] = result["generated_idea"]
+        record["similar_ideas"] = [idea["metadata"]["title"] for idea in result["similar_ideas"]]
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+    record["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_bulk(
+    engine: HackathonRAGEngine,
+    input_path: str,
+    output_path: str,
+    concurrency: int = 8,
+    limit: Optional[int] = None,
+    progress_every: int = 25
+) -> Dict[str, int]:
+    """
+    Generate ideas for every pending spec and append results to the output file.
+
+    Args:
+        engine: RAG engine used for generation
+        input_path: CSV or JSONL file of generation specs
+        output_path: JSONL file receiving one record per finished spec
+        concurrency: Number of generations running at once
+        limit: Stop after submitting this many pending specs
+        progress_every: Print a progress line every N finished specs
+
+    Returns:
+        Counts of skipped, succeeded and failed specs
+    """
+    completed = load_checkpoint(output_path)
+    counts = {"skipped": 0, "ok": 0, "error": 0}
+
+    def pending() -> Iterator[Tuple[int, str, Dict]]:
+        submitted = 0
+        occurrences: Dict[str, int] = {}
+        for row, spec in read_specs(input_path):
+            digest = spec_digest(spec)
+            occurrences[digest] = occurrences.get(digest, 0) + 1
+            key = spec_key(spec, occurrences[digest])
+            if key in completed:
+                counts["skipped"] += 1
+                continue
+            if limit is not None and submitted >= limit:
+                return
+            submitted += 1
+            yield row, key, spec
+
+    start = time.monotonic()
+    specs = pending()
+    with open(output_path, "a", encoding="utf-8") as out:
+        def write(record: Dict):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            counts[record["status"]] += 1
+            finished = counts["ok"] + counts["error"]
+            if progress_every and finished % progress_every == 0:
+                rate = finished / max(time.monotonic() - start, 1e-9)
+                print(f"  {finished} done ({counts['error']} failed), {rate:.1f} ideas/s")
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        # Keep a bounded window in flight so huge spec files are streamed, not loaded
+        in_flight = set()
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < concurrency * 2:
+                    item = next(specs, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    in_flight.add(executor.submit(generate_one, engine, *item))
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+                    # Only forget a future once its record is written
+                    in_flight.discard(future)
+        except KeyboardInterrupt:
+            # Don't start queued specs, but keep what finished and running ones have already paid for
+            executor.shutdown(wait=False, cancel_futures=True)
+            running = [future for future in in_flight if not future.cancelled()]
+            if running:
+                print(f"\nInterrupted: saving {len(running)} finished or running generations...")
+            for future in running:
+                write(future.result())
+            raise
+        finally:
+            executor.shutdown(wait=True)
+    return counts
+
+
+def main():
+    """Parse arguments and run a bulk generation."""
+    parser = argparse.ArgumentParser(description="Generate hackathon ideas in bulk")
+    parser.add_argument("input", help="CSV or JSONL file of generation specs")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to append results to")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent generations")
+    parser.add_argument("--limit", type=int, default=None, help="Only process N pending specs")
+    args = parser.parse_args()
+
+    engine = HackathonRAGEngine()
+    engine.initialize_knowledge_base()
+
+    print(f"🚀 Generating ideas from {args.input} into {args.output}...")
+    try:
+        counts = run_bulk(engine, args.input, args.output,
+                          concurrency=args.concurrency, limit=args.limit)
+    except KeyboardInterrupt:
+        print("\nInterrupted. Re-run the same command to resume.")
+        sys.exit(130)
+
+    print(f"\n✅ Done: {counts['ok']} generated, {counts['error']} failed, "
+          f"{counts['skipped']} already completed")
+    if counts["error"]:
+        print("Failed specs are retried on the next run.")
+
+
+if __name__ == "__main__":
+    main()
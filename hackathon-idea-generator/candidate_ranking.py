@@ -0,0 +1,90 @@
+"""
+Local scoring of generated ideas, used to pick the best of several candidates.
+Each candidate is scored without another model call on:
+
+- novelty: how far it is from the closest idea already in the corpus
+- facet fit: whether it uses the requested theme, technologies and topic
+- sections: whether it has every section the prompt asks for
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from text_vectors import IdeaVectors
+from trigram_index import STOPWORDS, tokenize
+
+# Sections the generation prompt asks for, in order
+REQUIRED_SECTIONS = (
+    "Title",
+    "Description",
+    "Target Audience",
+    "Key Features",
+    "Technical Approach",
+    "Innovation Factor",
+    "Potential Challenges",
+    "Success Metrics",
+)
+
+# Weight of each component in the total score
+DEFAULT_WEIGHTS = {"novelty": 0.4, "facet_fit": 0.3, "sections": 0.3}
+
+
+def section_coverage(text: str) -> float:
+    """Share of the required sections that appear as a heading or bold label."""
+    lowered = text.lower()
+    found = sum(
+        1 for section in REQUIRED_SECTIONS
+        if re.search(rf"(^|\n)\s*(#+\s*|\d+\.\s*)?(\*\*)?{re.escape(section.lower())}(\*\*)?\s*:?", lowered)
+    )
+    return found / len(REQUIRED_SECTIONS)
+
+
+def facet_fit(
+    text: str,
+    topic: Optional[str] = None,
+    theme: Optional[str] = None,
+    tech_stack: Optional[List[str]] = None
+) -> float:
+    """Share of the requested theme, technologies and topic words the idea mentions (1.0 if none)."""
+    words = set(tokenize(text))
+    lowered = text.lower()
+    checks = []
+    if theme:
+        checks.append(theme.lower() in lowered)
+    for tech in tech_stack or []:
+        checks.append(tech.lower() in lowered)
+    if topic:
+        topic_words = [word for word in tokenize(topic) if word not in STOPWORDS]
+        if topic_words:
+            checks.append(sum(word in words for word in topic_words) / len(topic_words))
+    return sum(checks) / len(checks) if checks else 1.0
+
+
+def novelty(text: str, vectors: IdeaVectors) -> float:
+    """1 - cosine similarity to the closest corpus idea."""
+    closest = vectors.search(text, k=1)
+    return 1.0 - closest[0][0] if closest else 1.0
+
+
+def score_candidate(
+    text: str,
+    vectors: IdeaVectors,
+    topic: Optional[str] = None,
+    theme: Optional[str] = None,
+    tech_stack: Optional[List[str]] = None,
+    weights: Optional[Dict[str, float]] = None
+) -> Dict[str, float]:
+    """
+    Score one generated idea.
+
+    Returns:
+        The component scores and their weighted "total", all between 0 and 1
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    scores = {
+        "novelty": novelty(text, vectors),
+        "facet_fit": facet_fit(text, topic=topic, theme=theme, tech_stack=tech_stack),
+        "sections": section_coverage(text),
+    }
+    scores["total"] = sum(weights[name] * scores[name] for name in weights) / sum(weights.values())
+    return scores
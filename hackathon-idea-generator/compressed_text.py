@@ -0,0 +1,241 @@
+"""
+Compressed in-memory storage for idea descriptions.
+
+Descriptions are most of an idea's memory, but retrieval scores ideas on the
+indexes and only reads the full text of the few results it returns. So the text
+is kept in zlib-compressed blocks of a few dozen descriptions each, optionally
+with a preset dictionary trained on the corpus (which helps small blocks a lot),
+and blocks are decompressed on demand through a small LRU cache of hot blocks.
+
+CompressedIdeas is a drop-in, list-like replacement for the engine's idea list.
+"""
+
+import struct
+import sys
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Descriptions per compressed block
+DEFAULT_BLOCK_SIZE = 32
+
+# Decompressed blocks kept in the LRU cache
+DEFAULT_CACHE_BLOCKS = 256
+
+# Descriptions sampled to train the shared dictionary
+DEFAULT_TRAIN_SIZE = 2048
+
+# zlib preset dictionaries are limited to the 32 KB window
+MAX_DICTIONARY_SIZE = 32768
+
+# Short, repetitive fields worth sharing one string object across ideas
+INTERNED_FIELDS = ("theme", "difficulty", "team_size")
+
+
+def train_dictionary(samples: Iterable[str], size: int = MAX_DICTIONARY_SIZE) -> bytes:
+    """
+    Build a zlib preset dictionary from sample texts.
+
+    Frequent words and word pairs are concatenated with the most frequent last,
+    since zlib finds matches at the end of the dictionary with shorter distances.
+    """
+    counts = Counter()
+    for text in samples:
+        words = text.split()
+        counts.update(words)
+        counts.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    pieces, total = [], 0
+    for phrase, count in counts.most_common():
+        if count < 2:
+            break
+        encoded = (phrase + " ").encode("utf-8")
+        if total + len(encoded) > size:
+            break
+        pieces.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(pieces))
+
+
+class CompressedTextStore:
+    """Append-only texts in compressed blocks, decompressed through an LRU cache."""
+
+    def __init__(
+        self,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        level: int = 6,
+        dictionary: Optional[bytes] = None,
+        train_size: int = DEFAULT_TRAIN_SIZE
+    ):
+        """
+        Create an empty store.
+
+        Args:
+            block_size: Texts per compressed block (bigger compresses better, reads slower)
+            cache_blocks: Decompressed blocks kept in memory
+            level: zlib compression level
+            dictionary: Preset dictionary; if None, one is trained on the first train_size texts
+            train_size: Texts to collect before training a dictionary (0 = no dictionary)
+        """
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.level = level
+        self.dictionary = dictionary
+        self.train_size = 0 if dictionary is not None else train_size
+        self._blocks: List[bytes] = []
+        # Texts not yet compressed into a block
+        self._pending: List[str] = []
+        self._cache: "OrderedDict[int, List[str]]" = OrderedDict()
+        # Guards _blocks, _pending and the cache; appends are also serialized by _append_lock
+        self._lock = threading.Lock()
+        self._append_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self) -> int:
+        """Number of stored texts."""
+        with self._lock:
+            return len(self._blocks) * self.block_size + len(self._pending)
+
+    def append(self, text: str) -> int:
+        """Store a text and return its position (safe to call while other threads read)."""
+        with self._append_lock:
+            with self._lock:
+                position = len(self._blocks) * self.block_size + len(self._pending)
+                self._pending.append(text)
+                pending = len(self._pending)
+            if self.train_size and self.dictionary is None:
+                # Hold texts back until there are enough to train the dictionary on
+                if pending >= self.train_size:
+                    self.dictionary = train_dictionary(self._pending)
+                    self._seal_full_blocks()
+            elif pending >= self.block_size:
+                self._seal_full_blocks()
+            return position
+
+    def _seal_full_blocks(self):
+        """Compress every full block of pending texts, then swap them in at once."""
+        full = len(self._pending) // self.block_size * self.block_size
+        blocks = [
+            self._compress(self._pending[start:start + self.block_size])
+            for start in range(0, full, self.block_size)
+        ]
+        with self._lock:
+            self._blocks.extend(blocks)
+            del self._pending[:full]
+
+    def _compressor(self):
+        """A zlib compressor using the preset dictionary, if any."""
+        if self.dictionary:
+            return zlib.compressobj(self.level, zdict=self.dictionary)
+        return zlib.compressobj(self.level)
+
+    def _compress(self, texts: List[str]) -> bytes:
+        """Compress length-prefixed texts into one block."""
+        payload = b"".join(struct.pack("<I", len(data)) + data for data in (text.encode("utf-8") for text in texts))
+        compressor = self._compressor()
+        return compressor.compress(payload) + compressor.flush()
+
+    def _decompress(self, block: bytes) -> List[str]:
+        """Decompress a block back into its texts."""
+        decompressor = zlib.decompressobj(zdict=self.dictionary) if self.dictionary else zlib.decompressobj()
+        payload = decompressor.decompress(block) + decompressor.flush()
+        texts, offset = [], 0
+        while offset < len(payload):
+            (length,) = struct.unpack_from("<I", payload, offset)
+            offset += 4
+            texts.append(payload[offset:offset + length].decode("utf-8"))
+            offset += length
+        return texts
+
+    def __getitem__(self, position: int) -> str:
+        """Text at a position, decompressing its block if it is not cached."""
+        with self._lock:
+            sealed = len(self._blocks) * self.block_size
+            if position < 0:
+                position += sealed + len(self._pending)
+            if position >= sealed:
+                return self._pending[position - sealed]
+            block_number, offset = divmod(position, self.block_size)
+            texts = self._cache.get(block_number)
+            if texts is not None:
+                self._cache.move_to_end(block_number)
+                self.cache_hits += 1
+                return texts[offset]
+            block = self._blocks[block_number]
+        texts = self._decompress(block)
+        with self._lock:
+            self.cache_misses += 1
+            self._cache[block_number] = texts
+            while len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+        return texts[offset]
+
+    def __iter__(self) -> Iterator[str]:
+        """All texts in order, decompressing each block once without touching the cache."""
+        with self._lock:
+            blocks, pending = list(self._blocks), list(self._pending)
+        for block in blocks:
+            yield from self._decompress(block)
+        yield from pending
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by compressed blocks and pending texts."""
+        return (
+            sum(len(block) for block in self._blocks)
+            + sum(sys.getsizeof(text) for text in self._pending)
+            + len(self.dictionary or b"")
+        )
+
+
+class CompressedIdeas(Sequence):
+    """List-like idea corpus whose descriptions live in a CompressedTextStore."""
+
+    def __init__(self, ideas: Iterable[Dict] = (), texts: Optional[CompressedTextStore] = None):
+        """Store the given ideas."""
+        self._metadata: List[Dict] = []
+        self.texts = texts or CompressedTextStore()
+        self.extend(ideas)
+
+    def append(self, idea: Dict):
+        """Add an idea, compressing its description."""
+        metadata = {key: value for key, value in idea.items() if key != "description"}
+        for field in INTERNED_FIELDS:
+            if isinstance(metadata.get(field), str):
+                metadata[field] = sys.intern(metadata[field])
+        if isinstance(metadata.get("tech_stack"), list):
+            metadata["tech_stack"] = [sys.intern(tech) for tech in metadata["tech_stack"]]
+        # Text first, so an idea is never visible before its description
+        self.texts.append(idea.get("description", ""))
+        self._metadata.append(metadata)
+
+    def extend(self, ideas: Iterable[Dict]):
+        """Add several ideas."""
+        for idea in ideas:
+            self.append(idea)
+
+    def __len__(self) -> int:
+        """Number of ideas."""
+        return len(self._metadata)
+
+    def __getitem__(self, position):
+        """The idea at a position (a fresh dict, with its description decompressed)."""
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return {**self._metadata[position], "description": self.texts[position]}
+
+    def __iter__(self) -> Iterator[Dict]:
+        """All ideas in order, decompressing each block once."""
+        for metadata, description in zip(self._metadata, self.texts):
+            yield {**metadata, "description": description}
+
+    def metadata(self, position: int) -> Dict:
+        """An idea's fields except the description, without decompressing anything."""
+        return self._metadata[position]
+
+    def all_metadata(self) -> Sequence:
+        """Every idea's fields except the description, by position (a live view; don't modify it)."""
+        return self._metadata
@@ -0,0 +1,146 @@
+"""
+Copy-on-write knowledge-base overlays for running many hackathon events at once.
+
+Every event shares the engine's base corpus and indexes, which are never copied.
+An EventOverlay holds only what the event changes:
+
+- delta ideas, with their own small keyword, facet and vector indexes
+- tombstones: base idea positions the event excludes
+
+At query time the base search over-fetches by the number of tombstones (so
+excluded ideas can't crowd out results), the delta is searched separately, and the
+two rankings are merged. Memory per event is proportional to its delta only.
+"""
+
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from query_planner import FacetIndex, QueryPlan, QueryPlanner
+from text_vectors import IdeaVectors, TextVectorizer
+from trigram_index import TrigramIndex
+
+# Positions at or above this refer to an overlay's delta ideas rather than the base corpus
+DELTA_OFFSET = 1 << 40
+
+
+def is_delta(position: int) -> bool:
+    """Whether a merged result position refers to a delta idea."""
+    return position >= DELTA_OFFSET
+
+
+class EventOverlay:
+    """
+    Delta ideas and exclusions of one event, on top of a shared base corpus.
+
+    Updates are serialized and never change the ideas list or tombstone set in
+    place; they publish new ones. A search reads each once, so it sees a
+    consistent delta without locking, even while the event is being extended.
+    """
+
+    def __init__(self, name: str):
+        """Create an empty overlay."""
+        self.name = name
+        self.ideas: List[Dict] = []
+        self.tombstones: FrozenSet[int] = frozenset()
+        # Delta indexes of one version of the ideas list, built on first use
+        self._indexes: Optional[Tuple[List[Dict], TrigramIndex, FacetIndex]] = None
+        self._vectors: Optional[Tuple[List[Dict], IdeaVectors]] = None
+        self._update_lock = threading.Lock()
+
+    def add(self, ideas: Iterable[Dict]) -> int:
+        """Add event-specific ideas and return the delta size."""
+        ideas = list(ideas)
+        with self._update_lock:
+            # The delta indexes are rebuilt for the new list on the next search
+            self.ideas = self.ideas + ideas
+            return len(self.ideas)
+
+    def exclude(self, positions: Iterable[int]):
+        """Hide base ideas at these positions from this event."""
+        positions = frozenset(positions)
+        with self._update_lock:
+            self.tombstones = self.tombstones | positions
+
+    def idea(self, position: int) -> Dict:
+        """Delta idea for a merged result position."""
+        return self.ideas[position - DELTA_OFFSET]
+
+    def _get_indexes(self, ideas: List[Dict]) -> Tuple[TrigramIndex, FacetIndex]:
+        """Keyword and facet indexes over a version of the delta ideas."""
+        indexes = self._indexes
+        if indexes is None or indexes[0] is not ideas:
+            self._indexes = indexes = (ideas, TrigramIndex(ideas), FacetIndex(ideas))
+        return indexes[1], indexes[2]
+
+    def _get_planner(self, ideas: List[Dict], hard_filters: Iterable[str]) -> QueryPlanner:
+        """Query planner over a version of the delta ideas."""
+        index, facets = self._get_indexes(ideas)
+        return QueryPlanner(index, facets, hard_filters=tuple(hard_filters))
+
+    def get_vectors(self, vectorizer: TextVectorizer, ideas: Optional[List[Dict]] = None) -> IdeaVectors:
+        """Delta vectors, encoded with the base vectorizer so scores are comparable."""
+        ideas = self.ideas if ideas is None else ideas
+        cached = self._vectors
+        if cached is None or cached[0] is not ideas or cached[1].vectorizer is not vectorizer:
+            self._vectors = cached = (ideas, IdeaVectors(ideas, vectorizer=vectorizer))
+        return cached[1]
+
+    def _plan(self, ideas: List[Dict], plan: QueryPlan) -> Tuple[QueryPlanner, QueryPlan]:
+        """
+        Re-plan a base query plan for the delta.
+
+        Only the filters that are still hard on the base side are hard here, and
+        they are never relaxed, so the delta follows the base's decision.
+        """
+        planner = self._get_planner(ideas, plan.hard)
+        return planner, planner.plan(plan.text, {**plan.hard, **plan.soft}, relax=False)
+
+    def search_keyword(self, query: str, k: int, plan: Optional[QueryPlan] = None) -> List[Tuple[float, int]]:
+        """Keyword search over the delta ideas, with merged positions."""
+        ideas = self.ideas
+        if not ideas:
+            return []
+        if plan is None:
+            results = self._get_indexes(ideas)[0].search(query, k=k)
+        else:
+            planner, delta_plan = self._plan(ideas, plan)
+            results = planner.execute(delta_plan, k)
+        return [(score, DELTA_OFFSET + position) for score, position in results]
+
+    def search_vector(
+        self,
+        query: str,
+        k: int,
+        vectorizer: TextVectorizer,
+        plan: Optional[QueryPlan] = None
+    ) -> List[Tuple[float, int]]:
+        """Vector search over the delta ideas, with merged positions."""
+        ideas = self.ideas
+        if not ideas:
+            return []
+        vectors = self.get_vectors(vectorizer, ideas)
+        if plan is None:
+            results = vectors.search(query, k=k)
+        else:
+            planner, delta_plan = self._plan(ideas, plan)
+            results = planner.execute_vector(delta_plan, vectors, k)
+        return [(score, DELTA_OFFSET + position) for score, position in results]
+
+    def merge(
+        self,
+        base: List[Tuple[float, int]],
+        delta: List[Tuple[float, int]],
+        k: int
+    ) -> List[Tuple[float, int]]:
+        """Drop tombstoned base results and merge both rankings by score."""
+        tombstones = self.tombstones
+        visible = [(score, position) for score, position in base if position not in tombstones]
+        return sorted(visible + delta, key=lambda item: (-item[0], item[1]))[:k]
+
+    def stats(self) -> Dict[str, int]:
+        """Size of the overlay."""
+        return {
+            "ideas": len(self.ideas),
+            "tombstones": len(self.tombstones),
+            "vector_bytes": self._vectors[1].matrix.nbytes if self._vectors is not None else 0,
+        }
@@ -0,0 +1,132 @@
+"""
+Hybrid keyword + vector retrieval with reciprocal-rank fusion (RRF).
+The keyword side catches exact tech names ("WebRTC", "Solidity"); the vector side
+catches paraphrases. In-process, the keyword side is pure Python and holds the GIL,
+so the two sides run one after the other and hybrid latency is their sum. When both
+run in retrieval worker processes they run concurrently, and with two or more CPUs
+hybrid latency is roughly that of the slower side.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Ranked (score, idea position) pairs, best first
+Ranking = List[Tuple[float, int]]
+
+# Standard RRF smoothing constant
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Ranking],
+    k: int,
+    rrf_k: int = DEFAULT_RRF_K,
+    weights: Optional[Sequence[float]] = None
+) -> Ranking:
+    """
+    Fuse several rankings with reciprocal-rank fusion.
+
+    Each idea scores sum(weight / (rrf_k + rank)) over the rankings it appears in.
+    Scores are scaled so an idea ranked first everywhere scores 1.0.
+
+    Returns:
+        (fused score, idea position) pairs, best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, (_, position) in enumerate(ranking, 1):
+            fused[position] = fused.get(position, 0.0) + weight / (rrf_k + rank)
+    best_possible = sum(weights) / (rrf_k + 1)
+    ranked = sorted(fused.items(), key=lambda item: (-item[1], item[0]))[:k]
+    return [(score / best_possible, position) for position, score in ranked]
+
+
+class HybridRetriever:
+    """Runs a lexical and a vector search and fuses their rankings."""
+
+    def __init__(
+        self,
+        lexical_search: Callable[..., Ranking],
+        vector_search: Callable[..., Ranking],
+        lexical_depth: int = 50,
+        vector_depth: int = 50,
+        rrf_k: int = DEFAULT_RRF_K,
+        concurrent: bool = False,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        Create the retriever.
+
+        Args:
+            lexical_search: Function (query, depth) -> keyword ranking
+            vector_search: Function (query, depth) -> vector ranking
+            lexical_depth: Candidates taken from the keyword side
+            vector_depth: Candidates taken from the vector side
+            rrf_k: RRF smoothing constant (higher flattens rank differences)
+            concurrent: Run the vector side on a thread while the lexical side runs; only
+                worth it when both searches wait on other processes instead of holding the GIL
+            executor: Thread pool for the vector side (one is created if omitted)
+        """
+        self.lexical_search = lexical_search
+        self.vector_search = vector_search
+        self.lexical_depth = lexical_depth
+        self.vector_depth = vector_depth
+        self.rrf_k = rrf_k
+        self.concurrent = concurrent
+        self._executor = executor
+        if concurrent and executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-vector")
+
+    def search(self, query: str, k: int = 3, timings: Optional[Dict[str, float]] = None, **search_kwargs) -> Ranking:
+        """
+        Retrieve with both sides and fuse the results.
+
+        Args:
+            query: Free-text query
+            k: Number of fused results
+            timings: If given, filled with per-stage latencies in milliseconds
+            **search_kwargs: Passed on to both search functions (e.g. a query plan)
+
+        Returns:
+            (fused score, idea position) pairs, best first
+        """
+        start = time.perf_counter()
+        if self.concurrent:
+            # Both sides are waiting on worker processes, so the two waits overlap
+            vector_future = self._executor.submit(self._timed, self.vector_search, query, self.vector_depth, search_kwargs)
+            lexical, lexical_ms = self._timed(self.lexical_search, query, self.lexical_depth, search_kwargs)
+            vector, vector_ms = vector_future.result()
+        else:
+            # The keyword search holds the GIL for its whole run, so a concurrent vector
+            # search would only slow it down; run them back to back instead
+            lexical, lexical_ms = self._timed(self.lexical_search, query, self.lexical_depth, search_kwargs)
+            vector, vector_ms = self._timed(self.vector_search, query, self.vector_depth, search_kwargs)
+
+        fusion_start = time.perf_counter()
+        fused = reciprocal_rank_fusion([lexical, vector], k, rrf_k=self.rrf_k)
+        end = time.perf_counter()
+
+        if timings is not None:
+            timings.update({
+                "lexical_ms": lexical_ms,
+                "vector_ms": vector_ms,
+                "fusion_ms": (end - fusion_start) * 1000,
+                "total_ms": (end - start) * 1000,
+                "lexical_candidates": len(lexical),
+                "vector_candidates": len(vector),
+            })
+        return fused
+
+    @staticmethod
+    def _timed(search: Callable[..., Ranking], query: str, depth: int, search_kwargs: Dict) -> Tuple[Ranking, float]:
+        """Run a search and measure its latency in milliseconds."""
+        start = time.perf_counter()
+        ranking = search(query, depth, **search_kwargs)
+        return ranking, (time.perf_counter() - start) * 1000
+
+    def shutdown(self):
+        """Stop the thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,396 @@
+"""
+Persistent store for generated hackathon ideas using SQLite FTS5.
+Every generate_idea result is recorded with its parameters so ideas can be
+searched, filtered by facets and reused instead of being generated again.
+
+Writes are queued and committed in batches by a background thread, so recording
+an idea never blocks the request path.
+"""
+
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+# Default database location, overridable with IDEA_STORE_PATH
+DEFAULT_STORE_PATH = os.getenv("IDEA_STORE_PATH", "generated_ideas.db")
+
+# Facets that can be used to filter and count stored ideas
+FACETS = ("theme", "difficulty", "team_size")
+
+# Seconds promote() waits for queued ideas to be committed
+FLUSH_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ideas (
+    id INTEGER PRIMARY KEY,
+    idea_id TEXT UNIQUE NOT NULL,
+    created_at REAL NOT NULL,
+    title TEXT,
+    topic TEXT,
+    theme TEXT,
+    difficulty TEXT,
+    team_size TEXT,
+    tech_stack TEXT,
+    custom_requirements TEXT,
+    generated_idea TEXT NOT NULL,
+    similar_titles TEXT,
+    promoted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ideas_theme ON ideas(theme);
+CREATE INDEX IF NOT EXISTS ideas_difficulty ON ideas(difficulty);
+CREATE INDEX IF NOT EXISTS ideas_team_size ON ideas(team_size);
+CREATE INDEX IF NOT EXISTS ideas_promoted ON ideas(promoted);
+
+CREATE TABLE IF NOT EXISTS idea_tech (
+    idea_rowid INTEGER NOT NULL REFERENCES ideas(id),
+    tech TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idea_tech_tech ON idea_tech(tech, idea_rowid);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS ideas_fts USING fts5(
+    title, generated_idea, topic, custom_requirements, tech_stack,
+    content='ideas', content_rowid='id'
+);
+CREATE TABLE IF NOT EXISTS session_results (
+    session_id TEXT PRIMARY KEY,
+    saved_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS ideas_fts_insert AFTER INSERT ON ideas BEGIN
+    INSERT INTO ideas_fts(rowid, title, generated_idea, topic, custom_requirements, tech_stack)
+    VALUES (new.id, new.title, new.generated_idea, new.topic, new.custom_requirements, new.tech_stack);
+END;
+"""
+
+# Section labels are bolded with the colon outside or inside: **Title**: or **Title:**
+_TITLE_PATTERN = re.compile(r"\*\*Title\s*:?\s*\*\*\s*:?\s*(.+)", re.IGNORECASE)
+_DESCRIPTION_PATTERN = re.compile(
+    r"\*\*Description\s*:?\s*\*\*\s*:?\s*(.+?)(?=\n\s*\d+\.\s*\*\*|\Z)", re.IGNORECASE | re.DOTALL
+)
+
+
+def extract_title(generated_text: str) -> str:
+    """Pull the title out of a generated idea, falling back to its first line."""
+    match = _TITLE_PATTERN.search(generated_text)
+    if match:
+        return match.group(1).strip().strip("*").strip()
+    first_line = generated_text.strip().splitlines()[0] if generated_text.strip() else ""
+    return first_line.strip("#* ").strip()[:120]
+
+
+def extract_description(generated_text: str) -> str:
+    """Pull the description section out of a generated idea."""
+    match = _DESCRIPTION_PATTERN.search(generated_text)
+    if match:
+        return " ".join(match.group(1).split())
+    return " ".join(generated_text.split())[:1000]
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query (all terms, last one as a prefix)."""
+    terms = [term.replace('"', '""') for term in re.findall(r"\w[\w.+#-]*", text)]
+    if not terms:
+        return ""
+    parts = [f'"{term}"' for term in terms]
+    parts[-1] += "*"
+    return " ".join(parts)
+
+
+class IdeaStore:
+    """SQLite-backed store of generated ideas with full-text and facet search."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, batch_size: int = 100, flush_interval: float = 0.5):
+        """
+        Open (or create) the store and start the background writer.
+
+        Args:
+            path: SQLite database file (":memory:" is not supported, use a temp file)
+            batch_size: Maximum ideas committed per transaction
+            flush_interval: Seconds the writer waits to fill a batch
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        # Every thread's connection, so close() can close them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._closed = False
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name="idea-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._closed:
+                raise RuntimeError("IdeaStore is closed")
+            # Each connection is used by its own thread only; close() may close it from another
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # WAL lets readers search while the writer commits
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def record(self, result: Dict, idea_id: Optional[str] = None) -> str:
+        """
+        Queue a generate_idea result for storage and return its idea id.
+
+        The write happens asynchronously; call flush() to wait for it.
+        """
+        if self._closed:
+            raise RuntimeError("IdeaStore is closed")
+        idea_id = idea_id or uuid.uuid4().hex
+        params = result.get("parameters") or {}
+        generated = result.get("generated_idea") or ""
+        tech_stack = params.get("tech_stack") or []
+        row = (
+            idea_id,
+            time.time(),
+            extract_title(generated),
+            params.get("topic"),
+            params.get("theme"),
+            params.get("difficulty"),
+            params.get("team_size"),
+            ", ".join(tech_stack),
+            params.get("custom_requirements"),
+            generated,
+            json.dumps([idea["metadata"]["title"] for idea in result.get("similar_ideas", [])]),
+        )
+        self._queue.put((row, tech_stack))
+        return idea_id
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued idea has been committed; False if the timeout expired first."""
+        if self._closed:
+            # close() already committed everything that was queued
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _write_loop(self):
+        """Background writer: commit queued ideas in batches."""
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                conn.close()
+                return
+            batch, waiters = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    # A flush request commits immediately instead of waiting for a full batch
+                    deadline = 0
+                elif item is None:
+                    self._queue.put(None)
+                    break
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write_batch(conn, batch)
+                except sqlite3.Error as e:
+                    print(f"⚠️ IdeaStore failed to write {len(batch)} ideas: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List):
+        """Insert a batch of ideas in a single transaction."""
+        with conn:
+            for row, tech_stack in batch:
+                cursor = conn.execute(
+                    """INSERT OR IGNORE INTO ideas (idea_id, created_at, title, topic, theme, difficulty,
+                       team_size, tech_stack, custom_requirements, generated_idea, similar_titles)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    row,
+                )
+                if cursor.rowcount:
+                    conn.executemany(
+                        "INSERT INTO idea_tech (idea_rowid, tech) VALUES (?, ?)",
+                        [(cursor.lastrowid, tech) for tech in tech_stack],
+                    )
+
+    def _where(self, text: Optional[str], tech: Optional[str], filters: Dict[str, Optional[str]]):
+        """Build the WHERE clause shared by search and facet counts."""
+        clauses, args = [], []
+        match = _fts_query(text or "")
+        if match:
+            clauses.append("ideas.id IN (SELECT rowid FROM ideas_fts WHERE ideas_fts MATCH ?)")
+            args.append(match)
+        unknown = set(filters) - set(FACETS)
+        if unknown:
+            # Facet names become column names in the SQL below
+            raise ValueError(f"Unknown facets: {', '.join(sorted(unknown))} (expected one of: {', '.join(FACETS)})")
+        for facet, value in filters.items():
+            if value:
+                clauses.append(f"ideas.{facet} = ?")
+                args.append(value)
+        if tech:
+            clauses.append("ideas.id IN (SELECT idea_rowid FROM idea_tech WHERE tech = ?)")
+            args.append(tech)
+        where = " AND ".join(clauses) if clauses else "1"
+        return where, args, match
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        theme: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        team_size: Optional[str] = None,
+        tech: Optional[str] = None,
+        promoted: Optional[bool] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Search stored ideas by full text and facets.
+
+        Text matches are ranked by BM25; otherwise the newest ideas come first.
+        """
+        # Text is matched through the FTS join below so results can be ranked
+        match = _fts_query(text or "")
+        where, args, _ = self._where(None, tech, {"theme": theme, "difficulty": difficulty,
+                                                  "team_size": team_size})
+        if promoted is not None:
+            where += " AND ideas.promoted = ?"
+            args.append(int(promoted))
+        if match:
+            sql = f"""SELECT ideas.* FROM ideas_fts JOIN ideas ON ideas.id = ideas_fts.rowid
+                      WHERE ideas_fts MATCH ? AND {where}
+                      ORDER BY bm25(ideas_fts) LIMIT ? OFFSET ?"""
+            args = [match] + args
+        else:
+            sql = f"SELECT * FROM ideas WHERE {where} ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        rows = self._connect().execute(sql, args + [limit, offset]).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def facet_counts(self, text: Optional[str] = None, tech: Optional[str] = None,
+                     **filters: Optional[str]) -> Dict[str, Dict[str, int]]:
+        """Count matching ideas per value of each facet."""
+        where, args, _ = self._where(text, tech, filters)
+        conn = self._connect()
+        counts = {}
+        for facet in FACETS:
+            rows = conn.execute(
+                f"""SELECT {facet} AS value, COUNT(*) AS n FROM ideas WHERE {where}
+                    GROUP BY {facet} ORDER BY n DESC""",
+                args,
+            ).fetchall()
+            counts[facet] = {row["value"] or "Any": row["n"] for row in rows}
+        return counts
+
+    def get(self, idea_id: str) -> Optional[Dict]:
+        """Return one stored idea by id."""
+        row = self._connect().execute("SELECT * FROM ideas WHERE idea_id = ?", (idea_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def count(self) -> int:
+        """Return the number of stored ideas."""
+        return self._connect().execute("SELECT COUNT(*) FROM ideas").fetchone()[0]
+
+    def promote(self, idea_id: str) -> Dict:
+        """Mark a stored idea as promoted and return it in knowledge-base format."""
+        if not self.flush(timeout=FLUSH_TIMEOUT):
+            raise TimeoutError(f"Queued ideas were not written within {FLUSH_TIMEOUT:.0f} seconds")
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("UPDATE ideas SET promoted = 1 WHERE idea_id = ?", (idea_id,))
+        if not cursor.rowcount:
+            raise KeyError(f"No stored idea with id {idea_id}")
+        return self.to_knowledge_base_idea(self.get(idea_id))
+
+    def promoted_ideas(self) -> List[Dict]:
+        """Return all promoted ideas in knowledge-base format."""
+        rows = self._connect().execute("SELECT * FROM ideas WHERE promoted = 1 ORDER BY id").fetchall()
+        return [self.to_knowledge_base_idea(self._row_to_dict(row)) for row in rows]
+
+    @staticmethod
+    def to_knowledge_base_idea(stored: Dict) -> Dict:
+        """Convert a stored idea to the knowledge_base.HACKATHON_IDEAS format."""
+        return {
+            "title": stored["title"] or "Untitled Idea",
+            "description": extract_description(stored["generated_idea"]),
+            "theme": stored["theme"] or "General",
+            "difficulty": stored["difficulty"] or "Intermediate",
+            "tech_stack": stored["tech_stack"],
+            "team_size": stored["team_size"] or "Any",
+            "source": "generated",
+            "idea_id": stored["idea_id"],
+            "created_at": stored["created_at"],
+        }
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        """Convert a database row to a plain dictionary."""
+        stored = dict(row)
+        stored["tech_stack"] = [t.strip() for t in (stored["tech_stack"] or "").split(",") if t.strip()]
+        stored["similar_titles"] = json.loads(stored["similar_titles"] or "[]")
+        stored["promoted"] = bool(stored["promoted"])
+        return stored
+
+    def save_session_result(self, session_id: str, result: Dict):
+        """Keep an idle app session's full result until the session comes back."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO session_results (session_id, saved_at, payload) VALUES (?, ?, ?)",
+                (session_id, time.time(), json.dumps(result))
+            )
+
+    def load_session_result(self, session_id: str) -> Optional[Dict]:
+        """Return a saved session result, or None."""
+        row = self._connect().execute(
+            "SELECT payload FROM session_results WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    def delete_session_result(self, session_id: str):
+        """Forget a saved session result."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM session_results WHERE session_id = ?", (session_id,))
+
+    def purge_session_results(self, saved_before: float) -> int:
+        """Delete session results saved before a time; returns how many were deleted."""
+        conn = self._connect()
+        with conn:
+            return conn.execute("DELETE FROM session_results WHERE saved_at < ?", (saved_before,)).rowcount
+
+    def close(self):
+        """Commit pending writes, stop the background writer and close every thread's connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
@@ -0,0 +1,259 @@
+"""
+Record/replay layer for model calls, for offline and reproducible performance tests.
+
+A Cassette sits around HackathonRAGEngine._generate_text:
+
+- record: call the model and append (prompt, its hash, latency, response or error)
+  to a gzip-compressed JSONL file
+- replay: answer from the file without a network call, sleeping for the recorded
+  latency times latency_scale (1.0 = real, 0.5 = twice as fast, 0.0 = no wait)
+
+Recordings are keyed by the hash of their stored prompt when they are loaded, so a
+cassette can be inspected with Cassette.read and still replays if prompt_key changes.
+
+TraceWriter logs incoming generation requests with their arrival time, so the
+traffic can be replayed against another version of the engine with replay_trace.py.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+CASSETTE_MODES = ("record", "replay")
+
+# One gzip writer per cassette file: two writers appending to one file corrupt it
+_writers: Dict[str, List] = {}
+_writers_lock = threading.Lock()
+
+# Cassettes built from the environment, shared by every engine in the process
+_env_cassettes: Dict[Tuple[str, str, float], "Cassette"] = {}
+
+
+def _open_writer(path: str) -> Tuple[object, threading.Lock]:
+    """Shared (file, lock) appending to a cassette; release with _close_writer."""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        entry = _writers.get(key)
+        if entry is None:
+            entry = _writers[key] = [gzip.open(path, "at", encoding="utf-8"), threading.Lock(), 0]
+        entry[2] += 1
+        return entry[0], entry[1]
+
+
+def _close_writer(path: str):
+    """Drop one reference to a shared writer, closing it with the last one."""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        entry = _writers.get(key)
+        if entry is None:
+            return
+        entry[2] -= 1
+        if entry[2] <= 0:
+            del _writers[key]
+            with entry[1]:
+                entry[0].close()
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when the cassette has no recording for a prompt."""
+
+
+def prompt_key(prompt: str) -> str:
+    """Short, stable key for a prompt."""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:20]
+
+
+class Cassette:
+    """Records model calls to a file, or replays them from it."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency_scale: float = 1.0,
+        fallback: bool = False
+    ):
+        """
+        Open a cassette.
+
+        Args:
+            path: Cassette file (gzip-compressed JSONL)
+            mode: "record" appends live calls, "replay" serves recorded ones
+            latency_scale: Multiplier for recorded latencies when replaying (0 = no wait)
+            fallback: When replaying a prompt that was never recorded, serve the
+                recordings in order instead of raising CassetteMiss (for replaying
+                traffic against an engine whose prompts changed)
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"mode must be one of: {', '.join(CASSETTE_MODES)}")
+        if latency_scale < 0:
+            raise ValueError("latency_scale must not be negative.")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.fallback = fallback
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._start = time.monotonic()
+        # prompt key -> recordings, and the ones not yet replayed (refilled when exhausted)
+        self._by_key: Dict[str, List[Dict]] = {}
+        self._replay_queues: Dict[str, deque] = {}
+        self._recordings: List[Dict] = []
+        self._next = 0
+        if mode == "replay":
+            for record in self.read(path):
+                # Older recordings have only the hash
+                key = prompt_key(record["p"]) if "p" in record else record["k"]
+                self._recordings.append(record)
+                self._by_key.setdefault(key, []).append(record)
+            self._replay_queues = {key: deque(records) for key, records in self._by_key.items()}
+        else:
+            self._file, self._write_lock = _open_writer(path)
+
+    @staticmethod
+    def read(path: str) -> Iterator[Dict]:
+        """Yield the recordings in a cassette file, skipping a torn last line."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return
+            except (EOFError, OSError, zlib.error):
+                # Recording was interrupted mid-write, or the file is damaged from there on
+                return
+
+    def __len__(self) -> int:
+        """Number of recordings loaded for replay."""
+        return len(self._recordings)
+
+    def play(self, prompt: str, call_model: Callable[[str], str]) -> str:
+        """Run one model call through the cassette."""
+        if self.mode == "record":
+            return self._record(prompt, call_model)
+        return self._replay(prompt)
+
+    def _record(self, prompt: str, call_model: Callable[[str], str]) -> str:
+        """Call the model and append the outcome to the cassette."""
+        start = time.perf_counter()
+        record = {"k": prompt_key(prompt), "p": prompt, "t": round(time.monotonic() - self._start, 3)}
+        try:
+            response = call_model(prompt)
+            record["r"] = response
+            return response
+        except Exception as e:
+            record["e"] = str(e)
+            raise
+        finally:
+            record["ms"] = round((time.perf_counter() - start) * 1000, 1)
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            with self._write_lock:
+                self._file.write(line)
+                # Sync-flush so an interrupted recording keeps every finished call
+                self._file.flush()
+
+    def _replay(self, prompt: str) -> str:
+        """Serve a recorded call, waiting for its scaled latency."""
+        key = prompt_key(prompt)
+        with self._lock:
+            queue = self._replay_queues.get(key)
+            if queue is not None:
+                # Same prompt seen several times (e.g. best_of): replay in recorded order
+                if not queue:
+                    queue.extend(self._by_key[key])
+                record = queue.popleft()
+                self.hits += 1
+            elif self.fallback and self._recordings:
+                record = self._recordings[self._next % len(self._recordings)]
+                self._next += 1
+                self.misses += 1
+            else:
+                self.misses += 1
+                raise CassetteMiss(f"No recording for prompt {key} in {self.path}")
+        if self.latency_scale:
+            time.sleep(record["ms"] / 1000 * self.latency_scale)
+        if "e" in record:
+            raise Exception(record["e"])
+        return record["r"]
+
+    def close(self):
+        """Finish writing the cassette."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file = None
+        _close_writer(self.path)
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """
+        Build a cassette from LLM_CASSETTE (path), LLM_CASSETTE_MODE ("record" or
+        "replay") and LLM_CASSETTE_LATENCY (latency scale), or None if unset.
+
+        Every engine in the process gets the same cassette, so several engines
+        record into one file safely.
+        """
+        path = os.getenv("LLM_CASSETTE")
+        if not path:
+            return None
+        key = (os.path.abspath(path), os.getenv("LLM_CASSETTE_MODE", "replay"),
+               float(os.getenv("LLM_CASSETTE_LATENCY", "1.0")))
+        with _writers_lock:
+            cassette = _env_cassettes.get(key)
+        if cassette is None:
+            created = cls(path, mode=key[1], latency_scale=key[2])
+            with _writers_lock:
+                cassette = _env_cassettes.setdefault(key, created)
+            if cassette is not created:
+                # Another thread got there first
+                created.close()
+        return cassette
+
+
+class TraceWriter:
+    """Appends generation requests with their arrival offsets to a JSONL trace."""
+
+    def __init__(self, path: str):
+        """Open the trace file for appending."""
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+
+    def write(self, spec: Dict):
+        """Log one generate_idea spec."""
+        line = json.dumps({"t": round(time.monotonic() - self._start, 3), **spec}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        """Close the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+def read_trace(path: str) -> List[Tuple[float, Dict]]:
+    """Read (arrival offset in seconds, raw spec) pairs; lines without "t" arrive at 0."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for row, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                raise ValueError(f"{path}:{row}: invalid JSON")
+            entries.append((float(raw.pop("t", 0.0)), raw))
+    entries.sort(key=lambda entry: entry[0])
+    return entries
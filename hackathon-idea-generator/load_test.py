@@ -0,0 +1,156 @@
+"""
+Load test for the Hackathon Idea Generator API server.
+Runs the server in-process against a fake model (no Gemini calls) and reports
+throughput and latency percentiles.
+
+Run with: python load_test.py --clients 32 --duration 10 --model-latency 0.05
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Dict, List
+
+from api_server import create_server
+from rag_engine import HackathonRAGEngine
+
+FAKE_IDEA = """1. **Title**: LoadTest Idea
+
+2. **Description**: A placeholder idea returned by the fake model.
+"""
+
+
+class FakeModelEngine(HackathonRAGEngine):
+    """RAG engine whose model call sleeps instead of calling Gemini."""
+
+    def __init__(self, model_latency: float = 0.05):
+        """Initialize the engine with a dummy API key and a simulated latency."""
+        super().__init__(gemini_api_key="load-test-key")
+        self.model_latency = model_latency
+
+    def _generate_text(self, prompt: str) -> str:
+        """Pretend to call the model."""
+        time.sleep(self.model_latency)
+        return FAKE_IDEA
+
+
+REQUEST_MIX = {
+    "generate": ("POST", "/generate", {"topic": "AI for climate change", "theme": "Sustainability"}),
+    "retrieve": ("POST", "/retrieve", {"query": "blockchain voting", "k": 3}),
+    "random": ("GET", "/random", None),
+    "batch": ("POST", "/batch", {"specs": [{"theme": "Healthcare"}, {"theme": "Education"}]}),
+}
+
+
+def run_client(host: str, port: int, endpoints: List[str], deadline: float,
+               results: List, lock: threading.Lock):
+    """Send requests over one keep-alive connection until the deadline."""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    local = []
+    while time.monotonic() < deadline:
+        method, path, payload = REQUEST_MIX[random.choice(endpoints)]
+        body = json.dumps(payload) if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            status = 0
+        local.append((status, time.perf_counter() - start))
+        if status == 429:
+            # Back off briefly like a well-behaved client would
+            time.sleep(0.01)
+    conn.close()
+    with lock:
+        results.extend(local)
+
+
+def summarize(results: List, elapsed: float) -> Dict:
+    """Summarize status counts, throughput and latency percentiles."""
+    ok = sorted(latency for status, latency in results if status == 200)
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def pick(q):
+        return ok[min(len(ok) - 1, int(q * len(ok)))] * 1000 if ok else 0.0
+
+    return {
+        "requests": len(results),
+        "statuses": statuses,
+        "requests_per_second": len(ok) / elapsed if elapsed else 0.0,
+        "p50_ms": pick(0.50),
+        "p99_ms": pick(0.99),
+    }
+
+
+def main():
+    """Start the server, drive load against it and print a report."""
+    parser = argparse.ArgumentParser(description="Load test the idea API with a fake model")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--workers", type=int, default=16, help="Server worker threads")
+    parser.add_argument("--queue-size", type=int, default=64, help="Server queue size")
+    parser.add_argument("--model-latency", type=float, default=0.05,
+                        help="Simulated model latency in seconds")
+    parser.add_argument("--endpoints", default="generate,retrieve,random",
+                        help=f"Comma-separated mix of: {', '.join(REQUEST_MIX)}")
+    args = parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    for name in endpoints:
+        if name not in REQUEST_MIX:
+            parser.error(f"Unknown endpoint '{name}'")
+
+    engine = FakeModelEngine(model_latency=args.model_latency)
+    engine.initialize_knowledge_base()
+    server = create_server(engine, host="127.0.0.1", port=0,
+                           workers=args.workers, queue_size=args.queue_size)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    port = server.server_port
+
+    print(f"Running {args.clients} clients for {args.duration:.0f}s against port {port} "
+          f"({', '.join(endpoints)})...")
+    results = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+    start = time.monotonic()
+    clients = [
+        threading.Thread(target=run_client,
+                         args=("127.0.0.1", port, endpoints, deadline, results, lock))
+        for _ in range(args.clients)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.monotonic() - start
+
+    report = summarize(results, elapsed)
+    server_metrics = server.metrics.snapshot()
+    server.shutdown()
+    server.server_close()
+
+    print("\n" + "=" * 60)
+    print(f"  Requests sent:    {report['requests']}")
+    print(f"  Status counts:    {report['statuses']}")
+    print(f"  Throughput:       {report['requests_per_second']:.1f} req/s (200 OK only)")
+    print(f"  Latency p50:      {report['p50_ms']:.1f} ms")
+    print(f"  Latency p99:      {report['p99_ms']:.1f} ms")
+    print("=" * 60)
+    print("\nServer-side latency (ms):")
+    for endpoint, stats in server_metrics["latency_ms"].items():
+        print(f"  {endpoint}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
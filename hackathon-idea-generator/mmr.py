@@ -0,0 +1,58 @@
+"""
+Maximal Marginal Relevance (MMR) reranking for retrieved ideas.
+Picks context ideas that are relevant to the query but different from each other,
+so the prompt doesn't get two near-identical examples.
+"""
+
+from typing import List
+
+import numpy as np
+
+# Default balance between relevance (1.0) and diversity (0.0)
+DEFAULT_MMR_LAMBDA = 0.7
+
+
+def mmr_rerank(relevance: np.ndarray, vectors: np.ndarray, k: int, mmr_lambda: float = DEFAULT_MMR_LAMBDA) -> List[int]:
+    """
+    Select k candidates by Maximal Marginal Relevance.
+
+    Each step picks the candidate maximizing
+    mmr_lambda * relevance - (1 - mmr_lambda) * max similarity to already picked ones.
+    The candidate similarity matrix is computed once with a single matrix product,
+    so each step is a vectorized O(n) update.
+
+    Args:
+        relevance: Relevance score per candidate
+        vectors: L2-normalized candidate vectors, one row per candidate
+        k: Number of candidates to select
+        mmr_lambda: 1.0 ranks purely by relevance, 0.0 purely by diversity
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    if not 0.0 <= mmr_lambda <= 1.0:
+        raise ValueError("mmr_lambda must be between 0 and 1.")
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    relevance = np.asarray(relevance, dtype=np.float32)
+    spread = relevance.max() - relevance.min()
+    # Scale relevance to [0, 1] so it is comparable with cosine similarity
+    relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones(n, dtype=np.float32)
+
+    similarity = vectors @ vectors.T
+    max_similarity = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+
+    selected = [int(np.argmax(relevance))]
+    available[selected[0]] = False
+    for _ in range(k - 1):
+        np.maximum(max_similarity, similarity[selected[-1]], out=max_similarity)
+        scores = mmr_lambda * relevance - (1.0 - mmr_lambda) * max_similarity
+        scores[~available] = -np.inf
+        choice = int(np.argmax(scores))
+        selected.append(choice)
+        available[choice] = False
+    return selected
@@ -0,0 +1,347 @@
+"""
+Query planner for retrieval with structured filters.
+
+generate_idea's theme, difficulty, team size and tech stack are facets, not words:
+"Difficulty: Advanced" should select Advanced ideas, not ideas whose description
+happens to say "advanced". The planner treats each facet as a hard filter (must
+match) or a soft filter (boosts matching ideas), and uses corpus statistics to pick
+the cheaper execution order:
+
+- facet-first: intersect the hard-filter postings, then score text on just those ideas
+- text-first: walk the text postings and drop ideas that fail the hard filters
+
+QueryPlan.explain() shows the statistics and the decision.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from trigram_index import TrigramIndex
+
+# Facets the planner understands, mapped to idea fields
+FACETS = ("theme", "difficulty", "team_size", "tech_stack")
+
+# Facets that must match unless the caller says otherwise
+DEFAULT_HARD_FILTERS = ("theme",)
+
+# Score multiplier gained when an idea matches every soft filter
+SOFT_BOOST = 0.5
+
+# Vector search scores hard-filter candidates exactly up to this many; above it, it
+# searches the whole corpus with a growing depth until enough results pass the filters
+EXACT_VECTOR_CANDIDATES = 20000
+
+
+def _normalize_value(value: str) -> str:
+    """Facet values are compared case-insensitively."""
+    return value.strip().lower()
+
+
+class FacetIndex:
+    """Postings from facet values to idea positions, plus cardinality statistics."""
+
+    def __init__(self, ideas: Iterable[Dict] = ()):
+        """Index the facets of the given ideas."""
+        self._postings: Dict[str, Dict[str, set]] = {facet: defaultdict(set) for facet in FACETS}
+        self.size = 0
+        for idea in ideas:
+            self.add(idea)
+
+    def add(self, idea: Dict) -> int:
+        """Index one more idea and return its position."""
+        position = self.size
+        self.size += 1
+        for facet in FACETS:
+            values = idea.get(facet) or []
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                self._postings[facet][_normalize_value(value)].add(position)
+        return position
+
+    def lookup(self, facet: str, value) -> set:
+        """Positions of ideas matching a facet value (any of them, for lists)."""
+        values = [value] if isinstance(value, str) else list(value)
+        postings = self._postings[facet]
+        if len(values) == 1:
+            return postings.get(_normalize_value(values[0]), set())
+        matched = set()
+        for v in values:
+            matched |= postings.get(_normalize_value(v), set())
+        return matched
+
+    def cardinality(self, facet: str) -> int:
+        """Number of distinct values of a facet."""
+        return len(self._postings[facet])
+
+
+class QueryPlan:
+    """A planned retrieval: filters, statistics and the chosen execution strategy."""
+
+    def __init__(
+        self,
+        text: str,
+        hard: Dict[str, object],
+        soft: Dict[str, object],
+        strategy: str,
+        candidates: Optional[set],
+        soft_postings: Dict[str, set],
+        weighted_terms: List[Tuple[int, float]],
+        ideal: float,
+        statistics: Dict[str, object]
+    ):
+        """Hold the plan; created by QueryPlanner.plan()."""
+        self.text = text
+        self.hard = hard
+        self.soft = soft
+        self.strategy = strategy
+        self.candidates = candidates
+        self.soft_postings = soft_postings
+        self.weighted_terms = weighted_terms
+        self.ideal = ideal
+        self.statistics = statistics
+        self.touched = None
+        # explain() text of the plan a retrieval worker made for an unplanned query
+        self.explanation = None
+
+    @classmethod
+    def unplanned(cls, text: str, filters: Dict[str, object], hard_filters: Sequence[str]) -> "QueryPlan":
+        """
+        A query whose planning is left to a retrieval worker.
+
+        Only the filters are split into hard and soft; no index is touched. The
+        worker's decisions (relaxed filters, its explanation) are copied back with
+        adopt() when its results arrive.
+        """
+        filters = {facet: value for facet, value in filters.items() if facet in FACETS and value}
+        return cls(
+            text=text,
+            hard={facet: value for facet, value in filters.items() if facet in hard_filters},
+            soft={facet: value for facet, value in filters.items() if facet not in hard_filters},
+            strategy="unplanned",
+            candidates=None,
+            soft_postings={},
+            weighted_terms=[],
+            ideal=0.0,
+            statistics={"relaxed": []},
+        )
+
+    def summary(self) -> Dict[str, object]:
+        """The plan's decisions, small enough to send back from a worker process."""
+        return {"hard": self.hard, "soft": self.soft, "relaxed": self.statistics["relaxed"], "explanation": self.explain()}
+
+    def adopt(self, summary: Dict[str, object]):
+        """Take over the decisions of the same query planned in a worker process."""
+        self.hard, self.soft = summary["hard"], summary["soft"]
+        self.statistics["relaxed"] = summary["relaxed"]
+        self.explanation = summary["explanation"]
+
+    def spec(self) -> Tuple[str, Dict[str, object], List[str]]:
+        """(text, filters, hard filter names) that re-plan to this plan, for sending to another process."""
+        hard_names = list(self.hard) + list(self.statistics.get("relaxed", []))
+        return self.text, {**self.hard, **self.soft}, hard_names
+
+    def matches(self, idea: Dict) -> bool:
+        """Whether an idea passes the plan's hard filters (for ideas outside the indexes)."""
+        for facet, value in self.hard.items():
+            wanted = {_normalize_value(v) for v in ([value] if isinstance(value, str) else value)}
+            values = idea.get(facet) or []
+            if isinstance(values, str):
+                values = [values]
+            if not wanted & {_normalize_value(v) for v in values}:
+                return False
+        return True
+
+    def explain(self) -> str:
+        """Human-readable description of the plan and its cost estimates."""
+        if self.explanation is not None:
+            return self.explanation
+        if self.strategy == "unplanned":
+            return f"Strategy: planned by a retrieval worker\nText: {self.text!r}"
+        stats = self.statistics
+        lines = [f"Strategy: {self.strategy}", f"Corpus size: {stats['corpus_size']}"]
+        if self.text:
+            lines.append(f"Text: {self.text!r}")
+            for term, document_frequency in stats["terms"]:
+                lines.append(f"  term {term!r}: df={document_frequency}")
+            lines.append(f"  estimated postings to scan (text-first cost): {stats['text_cost']}")
+        for kind, filters in (("Hard filter", self.hard), ("Soft filter", self.soft)):
+            for facet, value in filters.items():
+                facet_stats = stats["facets"][facet]
+                lines.append(
+                    f"{kind} {facet}={value!r}: {facet_stats['matches']} ideas "
+                    f"(selectivity {facet_stats['selectivity']:.1%}, {facet_stats['cardinality']} distinct values)"
+                )
+        if stats.get("relaxed"):
+            lines.append(f"Relaxed to soft (no idea matched all hard filters): {', '.join(stats['relaxed'])}")
+        if self.candidates is not None:
+            lines.append(
+                f"Hard-filter candidates: {len(self.candidates)} "
+                f"(facet-first cost: {len(self.candidates) * len(stats['terms'])} term lookups)"
+            )
+        if self.touched is not None:
+            lines.append(f"Ideas touched: {self.touched} of {stats['corpus_size']}")
+        return "\n".join(lines)
+
+
+class QueryPlanner:
+    """Plans and executes filtered keyword retrieval over a TrigramIndex."""
+
+    def __init__(
+        self,
+        text_index: TrigramIndex,
+        facet_index: FacetIndex,
+        hard_filters: Sequence[str] = DEFAULT_HARD_FILTERS
+    ):
+        """Create a planner over a text index and a facet index of the same corpus."""
+        self.text_index = text_index
+        self.facet_index = facet_index
+        self.hard_filters = tuple(hard_filters)
+
+    def plan(
+        self,
+        text: str,
+        filters: Dict[str, object],
+        hard_filters: Optional[Sequence[str]] = None,
+        relax: bool = True
+    ) -> QueryPlan:
+        """
+        Plan a query.
+
+        Args:
+            text: Free-text part of the query (topic, requirements)
+            filters: Facet values, e.g. {"theme": "Healthcare", "tech_stack": ["React"]}
+            hard_filters: Facets that must match (defaults to the planner setting)
+            relax: Turn hard filters into soft ones when no idea matches all of them
+
+        Returns:
+            The plan, ready for execute() and explain()
+        """
+        hard_names = set(self.hard_filters if hard_filters is None else hard_filters)
+        filters = {facet: value for facet, value in filters.items() if facet in FACETS and value}
+        corpus_size = self.facet_index.size
+
+        postings = {facet: self.facet_index.lookup(facet, value) for facet, value in filters.items()}
+        facet_stats = {
+            facet: {
+                "matches": len(matched),
+                "selectivity": len(matched) / corpus_size if corpus_size else 0.0,
+                "cardinality": self.facet_index.cardinality(facet),
+            }
+            for facet, matched in postings.items()
+        }
+
+        hard = {facet: value for facet, value in filters.items() if facet in hard_names}
+        soft = {facet: value for facet, value in filters.items() if facet not in hard_names}
+
+        # Intersect hard filters smallest first, so the work is bounded by the most selective one
+        candidates = None
+        relaxed = []
+        if hard:
+            for facet in sorted(hard, key=lambda f: len(postings[f])):
+                candidates = set(postings[facet]) if candidates is None else candidates & postings[facet]
+                if not candidates:
+                    break
+            if not candidates and relax:
+                relaxed = sorted(hard)
+                soft.update(hard)
+                hard = {}
+                candidates = None
+
+        weighted_terms, ideal = self.text_index.match_query(text) if text else ([], 0.0)
+        term_ids = sorted({token_id for token_id, _ in weighted_terms})
+        terms = [(self.text_index.vocabulary[t], self.text_index.document_frequency(t)) for t in term_ids]
+        text_cost = sum(document_frequency for _, document_frequency in terms)
+
+        if not weighted_terms:
+            strategy = "facet-only" if (candidates is not None or soft) else "empty"
+        elif candidates is not None and len(candidates) * len(term_ids) < text_cost:
+            strategy = "facet-first"
+        else:
+            strategy = "text-first"
+
+        statistics = {
+            "corpus_size": corpus_size,
+            "terms": terms,
+            "text_cost": text_cost,
+            "facets": facet_stats,
+            "relaxed": relaxed,
+        }
+        return QueryPlan(
+            text=text,
+            hard=hard,
+            soft=soft,
+            strategy=strategy,
+            candidates=candidates,
+            soft_postings={facet: postings[facet] for facet in soft},
+            weighted_terms=weighted_terms,
+            ideal=ideal,
+            statistics=statistics,
+        )
+
+    def execute(self, plan: QueryPlan, k: int = 3) -> List[Tuple[float, int]]:
+        """Run a plan and return (score, idea position) pairs, best first."""
+        index = self.text_index
+        if plan.strategy == "facet-first":
+            scores = index.score_documents(plan.weighted_terms, plan.candidates)
+            plan.touched = len(plan.candidates)
+            ideal = plan.ideal
+        elif plan.strategy == "text-first":
+            scores = index.score_postings(plan.weighted_terms, plan.candidates)
+            plan.touched = plan.statistics["text_cost"]
+            ideal = plan.ideal
+        elif plan.strategy == "facet-only":
+            return self._execute_facets(plan, k)
+        else:
+            plan.touched = 0
+            return []
+        return index.top_k(self.apply_soft_filters(plan, scores), k, ideal)
+
+    def _execute_facets(self, plan: QueryPlan, k: int) -> List[Tuple[float, int]]:
+        """No usable text: rank the filtered ideas by how many soft filters they match."""
+        if plan.candidates is not None:
+            pool = plan.candidates
+        elif plan.soft_postings:
+            pool = set().union(*plan.soft_postings.values())
+        else:
+            plan.touched = 0
+            return []
+        scores = {position: 1.0 for position in pool}
+        plan.touched = len(pool)
+        return self.text_index.top_k(self.apply_soft_filters(plan, scores), k, 1.0 + SOFT_BOOST)
+
+    def execute_vector(self, plan: QueryPlan, vectors, k: int = 3) -> List[Tuple[float, int]]:
+        """Vector search restricted to the plan's hard filters and boosted by its soft ones."""
+        candidates = plan.candidates
+        if candidates is not None and len(candidates) <= EXACT_VECTOR_CANDIDATES:
+            # Score exactly the ideas that pass the hard filters, whatever the keyword plan chose
+            scored = vectors.search(plan.text, k=k, candidates=candidates) if candidates else []
+        elif candidates is not None:
+            # Many candidates: search the corpus, widening until k of them survive the filters
+            depth = k * 4
+            while True:
+                found = vectors.search(plan.text, k=depth)
+                scored = [(score, position) for score, position in found if position in candidates]
+                if len(scored) >= k or len(found) < depth or depth >= vectors.size:
+                    break
+                depth *= 4
+            scored = scored[:k]
+        else:
+            scored = vectors.search(plan.text, k=k)
+        if not scored:
+            # The text gives nothing to rank by: rank by the filters alone, like keyword search
+            return self._execute_facets(plan, k)
+        boosted = self.apply_soft_filters(plan, {position: score for score, position in scored})
+        ranked = sorted(boosted.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(min(1.0, score), position) for position, score in ranked]
+
+    def apply_soft_filters(self, plan: QueryPlan, scores: Dict[int, float]) -> Dict[int, float]:
+        """Boost ideas by the share of soft filters they satisfy."""
+        if not plan.soft_postings:
+            return scores
+        share = 1.0 / len(plan.soft_postings)
+        boosted = {}
+        for position, score in scores.items():
+            matched = sum(1 for matched_positions in plan.soft_postings.values() if position in matched_positions)
+            boosted[position] = score * (1.0 + SOFT_BOOST * matched * share)
+        return boosted
@@ -1,25 +1,111 @@
 """
 Simple RAG Engine for Hackathon Idea Generator using Google Gemini.
-Uses keyword matching instead of embeddings to avoid quota issues.
+Retrieves ideas by trigram keyword search, local hashed TF-IDF vectors or a fusion of both
+(no embedding API calls, so no quota issues), then picks varied context ideas with MMR.
 """
 
 import os
-from typing import List, Dict, Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Sequence, Tuple
+import numpy as np
 from dotenv import load_dotenv
 from knowledge_base import get_all_ideas
+from idea_store import IdeaStore
+from trigram_index import TrigramIndex
+from sampler import InspirationSampler, PermutationCursor
+from text_vectors import IdeaVectors
+from ann_index import DEFAULT_N_PROBE
+from mmr import mmr_rerank, DEFAULT_MMR_LAMBDA
+from hybrid_search import HybridRetriever
+from query_planner import FacetIndex, QueryPlan, QueryPlanner, DEFAULT_HARD_FILTERS
+from retrieval_workers import CorpusFingerprint, RetrievalWorkerPool
+from candidate_ranking import score_candidate
+from llm_cassette import Cassette
+from event_overlays import EventOverlay, DELTA_OFFSET, is_delta
+from compressed_text import CompressedIdeas
+from typeahead import TopicCompleter
+from tech_cooccurrence import TechCooccurrence, RELATED_TECH_BOOST
 import google.generativeai as genai
 
 # Load environment variables
 load_dotenv()
 
+# Fields accepted by generate_idea, shared by the API server and batch tools
+IDEA_PARAMETERS = (
+    "topic",
+    "theme",
+    "difficulty",
+    "tech_stack",
+    "team_size",
+    "custom_requirements",
+)
+
+# Supported retrieval strategies
+RETRIEVAL_MODES = ("keyword", "vector", "hybrid")
+
+# Most candidates generate_idea will request concurrently for best_of
+MAX_BEST_OF = 8
+
+# Random draws per requested idea before the no-match fallback scans for ideas passing the filters
+RANDOM_FALLBACK_ATTEMPTS = 32
+
 
 class HackathonRAGEngine:
     """RAG Engine for generating hackathon ideas with context retrieval."""
     
-    def __init__(self, gemini_api_key: Optional[str] = None):
-        """Initialize the RAG engine with Google Gemini."""
+    def __init__(
+        self,
+        gemini_api_key: Optional[str] = None,
+        idea_store: Optional[IdeaStore] = None,
+        random_seed: Optional[int] = None,
+        mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+        mmr_candidates: int = 20,
+        retrieval_mode: str = "keyword",
+        lexical_depth: int = 50,
+        vector_depth: int = 50,
+        ann_threshold: int = 50000,
+        ann_probes: int = DEFAULT_N_PROBE,
+        hard_filters: Tuple[str, ...] = DEFAULT_HARD_FILTERS,
+        retrieval_workers: Optional[RetrievalWorkerPool] = None,
+        cassette: Optional[Cassette] = None,
+        compress_text: bool = False,
+        related_tech_boost: float = RELATED_TECH_BOOST
+    ):
+        """
+        Initialize the RAG engine with Google Gemini.
+        
+        Args:
+            gemini_api_key: Gemini API key (defaults to GEMINI_API_KEY)
+            idea_store: Optional store that records every generated idea
+            random_seed: Seed for random inspiration and fallbacks (for reproducible tests)
+            mmr_lambda: Relevance/diversity balance for prompt context (1.0 = relevance only)
+            mmr_candidates: Number of retrieved candidates the diversity reranker chooses from
+            retrieval_mode: "keyword", "vector" or "hybrid" (both fused with reciprocal-rank fusion)
+            lexical_depth: Keyword candidates fed into hybrid fusion
+            vector_depth: Vector candidates fed into hybrid fusion
+            ann_threshold: Corpus size from which vector search uses the approximate (IVF) index
+            ann_probes: Clusters scanned per approximate vector search
+            hard_filters: Facets (theme, difficulty, team_size, tech_stack) that must match;
+                the others only boost matching ideas
+            retrieval_workers: Optional process pool that runs keyword and vector searches
+                outside this process (can be shared by several engines)
+            cassette: Records or replays model calls (defaults to the LLM_CASSETTE settings)
+            compress_text: Keep idea descriptions in compressed blocks, decompressed on
+                demand (less memory for large corpora, slightly slower idea lookups)
+            related_tech_boost: Score boost for retrieved ideas whose tech stacks are often
+                used with the requested technologies (0 = off)
+        """
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"retrieval_mode must be one of: {', '.join(RETRIEVAL_MODES)}")
         self.api_key = gemini_api_key or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
+        
+        # Model calls can be recorded to, or replayed offline from, a cassette
+        self.cassette = cassette if cassette is not None else Cassette.from_env()
+        replaying = self.cassette is not None and self.cassette.mode == "replay"
+        if not self.api_key and not replaying:
             raise ValueError("Gemini API key is required. Set GEMINI_API_KEY in .env file.")
         
         # Configure Gemini API
@@ -28,63 +114,475 @@ class HackathonRAGEngine:
         # Initialize the model with correct name
         self.model = genai.GenerativeModel('gemini-1.5-flash-latest')
         
-        # Load knowledge base
-        self.ideas = get_all_ideas()
+        # Load knowledge base (copied so promoted ideas don't leak into the shared list)
+        self.ideas = CompressedIdeas(get_all_ideas()) if compress_text else list(get_all_ideas())
+        
+        # Keyword index, facet index and idea vectors, built on first use
+        self._index = None
+        self._facets = None
+        self._vectors = None
+        self.hard_filters = tuple(hard_filters)
+        
+        # Topic typeahead and tech co-occurrence model, built once and then updated as ideas are added
+        self._completer = None
+        self._tech_model = None
+        self.related_tech_boost = related_tech_boost
+        
+        # Retrieval strategy (the hybrid retriever is created on first use)
+        self.retrieval_mode = retrieval_mode
+        self.lexical_depth = lexical_depth
+        self.vector_depth = vector_depth
+        self._hybrid = None
+        self.ann_threshold = ann_threshold
+        self.ann_probes = ann_probes
+        
+        # Searches run in worker processes against a published snapshot of the indexes,
+        # republished in the background as the corpus grows
+        self.retrieval_workers = retrieval_workers
+        self._snapshot = None
+        self._fingerprint = None
+        self._publisher = None
+        self._snapshot_lock = threading.Lock()
+        # Held while ideas are added and while a snapshot is written
+        self._corpus_lock = threading.RLock()
+        
+        # Per-event overlays on top of the shared corpus
+        self._events: Dict[str, EventOverlay] = {}
+        self._events_lock = threading.Lock()
+        
+        # Diversity reranking of the retrieved context
+        self.mmr_lambda = mmr_lambda
+        self.mmr_candidates = mmr_candidates
+        
+        # Random inspiration samplers, one per filter and weighting
+        self.random_seed = random_seed
+        self._rng = random.Random(random_seed)
+        self._samplers = {}
+        
+        # Persist generated ideas and include the ones promoted into the corpus
+        self.idea_store = idea_store
+        if idea_store is not None:
+            self.ideas.extend(idea_store.promoted_ideas())
         
     def initialize_knowledge_base(self):
-        """Initialize the knowledge base (just loads ideas)."""
+        """Initialize the knowledge base and build the keyword index and topic completer."""
+        self._get_index()
+        self._get_completer()
+        if self.retrieval_workers is not None:
+            self._get_snapshot()
         return len(self.ideas)
     
-    def retrieve_similar_ideas(self, query: str, k: int = 3) -> List[Dict]:
-        """Retrieve similar ideas using keyword matching."""
-        query_lower = query.lower()
-        
-        # Score ideas based on keyword matches
-        scored_ideas = []
-        for idea in self.ideas:
-            score = 0
-            searchable_text = f"{idea['title']} {idea['description']} {idea['theme']} {' '.join(idea['tech_stack'])}".lower()
-            
-            # Simple keyword scoring
-            for word in query_lower.split():
-                if len(word) > 3:  # Only consider words longer than 3 characters
-                    score += searchable_text.count(word)
-            
-            if score > 0:
-                scored_ideas.append((score, idea))
-        
-        # Sort by score and get top k
-        scored_ideas.sort(reverse=True, key=lambda x: x[0])
-        
-        similar_ideas = []
-        for i, (score, idea) in enumerate(scored_ideas[:k]):
-            similar_ideas.append({
-                "content": f"""Title: {idea['title']}
-Description: {idea['description']}
-Theme: {idea['theme']}
-Difficulty: {idea['difficulty']}
-Tech Stack: {', '.join(idea['tech_stack'])}
-Team Size: {idea['team_size']}""",
-                "metadata": idea,
-                "similarity_score": score / 10.0  # Normalize score
-            })
+    def add_ideas(self, ideas: List[Dict]) -> int:
+        """Add ideas to the retrieval corpus and return the new corpus size."""
+        with self._corpus_lock:
+            index, facets, completer, tech_model = self._index, self._facets, self._completer, self._tech_model
+            for idea in ideas:
+                self.ideas.append(idea)
+                if index is not None:
+                    index.add(idea)
+                if facets is not None:
+                    facets.add(idea)
+                if completer is not None:
+                    completer.add(idea)
+                if tech_model is not None:
+                    tech_model.add(idea)
+            if self._vectors is not None:
+                self._vectors.add(ideas)
+            if self._fingerprint is not None:
+                self._fingerprint.update(ideas)
+            return len(self.ideas)
+    
+    def promote_generated_idea(self, idea_id: str) -> Dict:
+        """Promote a stored generated idea into the retrieval corpus."""
+        if self.idea_store is None:
+            raise ValueError("No idea store configured for this engine.")
+        idea = self.idea_store.promote(idea_id)
+        if not any(existing.get("idea_id") == idea_id for existing in self._idea_metadata()):
+            self.add_ideas([idea])
+        return idea
+    
+    def create_event(
+        self,
+        name: str,
+        ideas: Optional[List[Dict]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> EventOverlay:
+        """
+        Create an event overlay, or extend an existing one.
+        
+        Args:
+            name: Event name, passed as event= to retrieval and generation
+            ideas: Ideas only this event sees
+            exclude: Titles of shared ideas this event should not see
+        
+        Returns:
+            The event's overlay
+        """
+        with self._events_lock:
+            overlay = self._events.get(name)
+            if overlay is None:
+                overlay = self._events[name] = EventOverlay(name)
+        if ideas:
+            overlay.add(ideas)
+        if exclude:
+            titles = {title.strip().lower() for title in exclude}
+            overlay.exclude(
+                position for position, idea in enumerate(self._idea_metadata())
+                if idea["title"].strip().lower() in titles
+            )
+        return overlay
+    
+    def _idea_metadata(self) -> Sequence[Dict]:
+        """Ideas by position for reading their fields, without decompressing descriptions."""
+        if isinstance(self.ideas, CompressedIdeas):
+            return self.ideas.all_metadata()
+        return self.ideas
+    
+    def drop_event(self, name: str):
+        """Forget an event overlay."""
+        self._events.pop(name, None)
+    
+    def get_event(self, name: Optional[str]) -> Optional[EventOverlay]:
+        """Look up an event overlay by name (None for the shared corpus)."""
+        if name is None:
+            return None
+        overlay = self._events.get(name)
+        if overlay is None:
+            raise ValueError(f"Unknown event: {name}")
+        return overlay
+    
+    def retrieve_similar_ideas(
+        self,
+        query: str,
+        k: int = 3,
+        mode: Optional[str] = None,
+        event: Optional[str] = None
+    ) -> List[Dict]:
+        """Retrieve similar ideas by keyword, vector or hybrid search (engine default if mode is None)."""
+        overlay = self.get_event(event)
+        return self._format_results(self._search(query, k=k, mode=mode, event=overlay), k, query, event=overlay)
+    
+    def plan_query(
+        self,
+        text: str,
+        theme: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        tech_stack: Optional[List[str]] = None,
+        team_size: Optional[str] = None
+    ) -> QueryPlan:
+        """Plan a retrieval that treats the structured parameters as facet filters."""
+        filters = {"theme": theme, "difficulty": difficulty, "tech_stack": tech_stack, "team_size": team_size}
+        return self._get_planner().plan(text, filters, hard_filters=self.hard_filters)
+    
+    def explain_query(self, topic: Optional[str] = None, custom_requirements: Optional[str] = None, **filters) -> str:
+        """Plan and run the keyword retrieval generate_idea would do, and describe it."""
+        text = " ".join(part for part in (topic, custom_requirements) if part)
+        plan = self.plan_query(text, **filters)
+        self._get_planner().execute(plan, k=max(3, self.mmr_candidates))
+        return plan.explain()
+    
+    def _search(
+        self,
+        query: str,
+        k: int,
+        mode: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+        plan: Optional[QueryPlan] = None,
+        event: Optional[EventOverlay] = None
+    ) -> List[Tuple[float, int]]:
+        """Return (score, corpus position) pairs for the best k matches, honoring a query plan and event."""
+        mode = mode or self.retrieval_mode
+        if mode == "hybrid":
+            return self._get_hybrid().search(query, k=k, timings=timings, plan=plan, event=event)
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"mode must be one of: {', '.join(RETRIEVAL_MODES)}")
+        
+        start = time.perf_counter()
+        if mode == "vector":
+            scored_ideas = self._vector_search(query, k, plan=plan, event=event)
+        else:
+            scored_ideas = self._lexical_search(query, k, plan=plan, event=event)
+        if timings is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            timings.update({f"{'lexical' if mode == 'keyword' else mode}_ms": elapsed_ms, "total_ms": elapsed_ms})
+        return scored_ideas
+    
+    def rerank_diverse(
+        self,
+        scored_ideas: List[Tuple[float, int]],
+        k: int = 3,
+        mmr_lambda: Optional[float] = None,
+        event: Optional[EventOverlay] = None
+    ) -> List[Tuple[float, int]]:
+        """Pick k of the scored ideas by Maximal Marginal Relevance."""
+        if len(scored_ideas) <= k:
+            return scored_ideas
+        mmr_lambda = self.mmr_lambda if mmr_lambda is None else mmr_lambda
+        positions = [position for _, position in scored_ideas]
+        relevance = np.array([score for score, _ in scored_ideas], dtype=np.float32)
+        vectors = self._vectors_at(positions, event)
+        return [scored_ideas[i] for i in mmr_rerank(relevance, vectors, k, mmr_lambda)]
+    
+    def _vectors_at(self, positions: List[int], event: Optional[EventOverlay] = None) -> np.ndarray:
+        """Vectors of result positions, including an event's delta ideas."""
+        base = self._get_vectors()
+        if event is None:
+            return base.matrix[positions]
+        delta = event.get_vectors(base.vectorizer).matrix
+        return np.stack([delta[p - DELTA_OFFSET] if is_delta(p) else base.matrix[p] for p in positions])
+    
+    def _idea_at(self, position: int, event: Optional[EventOverlay] = None) -> Dict:
+        """Idea at a result position, which may be an event's delta idea."""
+        return event.idea(position) if event is not None and is_delta(position) else self.ideas[position]
+    
+    def _format_results(
+        self,
+        scored_ideas: List[Tuple[float, int]],
+        k: int,
+        query: str,
+        event: Optional[EventOverlay] = None,
+        plan: Optional[QueryPlan] = None
+    ) -> List[Dict]:
+        """Format scored ideas, falling back to random ones (that pass the plan's hard filters) when nothing matched."""
+        similar_ideas = [
+            self._format_result(self._idea_at(position, event), score)
+            for score, position in scored_ideas
+        ]
         
         # If no matches, return random ideas
         if not similar_ideas:
-            import random
-            for idea in random.sample(self.ideas, min(k, len(self.ideas))):
-                similar_ideas.append({
-                    "content": f"""Title: {idea['title']}
+            for idea in self._random_ideas(k, query, event=event, plan=plan):
+                similar_ideas.append(self._format_result(idea, 0.5))
+        
+        return similar_ideas
+    
+    def _random_ideas(
+        self,
+        k: int,
+        query: str,
+        event: Optional[EventOverlay] = None,
+        plan: Optional[QueryPlan] = None
+    ) -> List[Dict]:
+        """
+        Up to k distinct random ideas the event can see that pass the plan's hard filters.
+        
+        Draws corpus positions and rejects tombstoned or filtered-out ones, so nothing
+        is copied or decompressed beyond the ideas returned. Only when the filters are
+        so selective that the draws keep missing does it scan for the matching ideas.
+        
+        With a cassette and no random_seed, the draws are seeded by the query, so a
+        replayed prompt picks the same ideas as the recorded one whatever the call order.
+        """
+        rng = random.Random(query) if self.cassette is not None and self.random_seed is None else self._rng
+        hard = plan is not None and bool(plan.hard)
+        tombstones = event.tombstones if event is not None else ()
+        delta = event.ideas if event is not None else []
+        metadata = self._idea_metadata()
+        base_size = len(metadata)
+        size = base_size + len(delta)
+        
+        def visible(position: int) -> bool:
+            if position >= base_size:
+                return not hard or plan.matches(delta[position - base_size])
+            return position not in tombstones and (not hard or plan.matches(metadata[position]))
+        
+        picked, seen = [], set()
+        for _ in range(RANDOM_FALLBACK_ATTEMPTS * k):
+            if len(picked) >= k or len(seen) >= size:
+                break
+            position = rng.randrange(size)
+            if position not in seen:
+                seen.add(position)
+                if visible(position):
+                    picked.append(position)
+        if len(picked) < k and hard:
+            # Rare filters: pick from the ideas that pass them
+            pool = sorted(plan.candidates) if plan.candidates is not None else range(base_size)
+            matching = [p for p in pool if p not in seen and visible(p)]
+            matching += [p for p in range(base_size, size) if p not in seen and visible(p)]
+            picked += rng.sample(matching, min(k - len(picked), len(matching)))
+        return [delta[p - base_size] if p >= base_size else self.ideas[p] for p in picked]
+    
+    def complete_topic(self, text: str, limit: int = 5) -> List[str]:
+        """Popularity-ranked completions for a partly typed topic."""
+        return self._get_completer().complete(text, limit)
+    
+    def _get_completer(self) -> TopicCompleter:
+        """Return the topic completer, building it on first use."""
+        if self._completer is None or self._completer.size != len(self.ideas):
+            self._completer = TopicCompleter(self._idea_metadata())
+        return self._completer
+    
+    def suggest_tech(self, selected: List[str], theme: Optional[str] = None, limit: int = 5) -> List[Tuple[str, float]]:
+        """Technologies often used with the selected ones (or popular in the theme), best first."""
+        return self._get_tech_model().suggest(selected, theme=theme, limit=limit)
+    
+    def known_technologies(self) -> List[str]:
+        """Every technology in the corpus, most used first."""
+        return self._get_tech_model().names()
+    
+    def _get_tech_model(self) -> TechCooccurrence:
+        """Return the tech co-occurrence model, building it on first use."""
+        if self._tech_model is None or self._tech_model.size != len(self.ideas):
+            self._tech_model = TechCooccurrence(self._idea_metadata())
+        return self._tech_model
+    
+    def _boost_related_tech(
+        self,
+        scored_ideas: List[Tuple[float, int]],
+        tech_stack: List[str],
+        event: Optional[EventOverlay] = None
+    ) -> List[Tuple[float, int]]:
+        """
+        Boost retrieved ideas whose stacks complement the requested technologies.
+        
+        Boosted scores can exceed 1; capping them would tie the best ideas again.
+        """
+        model = self._get_tech_model()
+        # Only the tech stacks are needed, so compressed descriptions stay compressed
+        metadata = self._idea_metadata()
+        boosted = []
+        for score, position in scored_ideas:
+            idea = event.idea(position) if event is not None and is_delta(position) else metadata[position]
+            affinity = model.affinity(tech_stack, idea.get("tech_stack"))
+            boosted.append((score * (1.0 + self.related_tech_boost * affinity), position))
+        boosted.sort(key=lambda item: (-item[0], item[1]))
+        return boosted
+    
+    def _get_index(self) -> TrigramIndex:
+        """Return the keyword index, building it on first use."""
+        if self._index is None or self._index.size != len(self.ideas):
+            self._index = TrigramIndex(self.ideas)
+        return self._index
+    
+    def _lexical_search(
+        self,
+        query: str,
+        k: int,
+        plan: Optional[QueryPlan] = None,
+        event: Optional[EventOverlay] = None
+    ) -> List[Tuple[float, int]]:
+        """Keyword search merged with an event's overlay."""
+        if event is None:
+            return self._base_lexical_search(query, k, plan=plan)
+        # Over-fetch by the tombstone count so excluded ideas can't crowd out results
+        base = self._base_lexical_search(query, k + len(event.tombstones), plan=plan)
+        return event.merge(base, event.search_keyword(query, k, plan=plan), k)
+    
+    def _base_lexical_search(self, query: str, k: int, plan: Optional[QueryPlan] = None) -> List[Tuple[float, int]]:
+        """Keyword search, executed through the query planner when there is a plan."""
+        if self.retrieval_workers is not None:
+            return self.retrieval_workers.search(self._get_snapshot(), "keyword", query, k, plan=plan)
+        if plan is not None:
+            return self._get_planner().execute(plan, k)
+        return self._get_index().search(query, k=k)
+    
+    def _vector_search(
+        self,
+        query: str,
+        k: int,
+        plan: Optional[QueryPlan] = None,
+        event: Optional[EventOverlay] = None
+    ) -> List[Tuple[float, int]]:
+        """Vector search merged with an event's overlay."""
+        if event is None:
+            return self._base_vector_search(query, k, plan=plan)
+        base = self._base_vector_search(query, k + len(event.tombstones), plan=plan)
+        delta = event.search_vector(query, k, self._get_vectors().vectorizer, plan=plan)
+        return event.merge(base, delta, k)
+    
+    def _base_vector_search(self, query: str, k: int, plan: Optional[QueryPlan] = None) -> List[Tuple[float, int]]:
+        """Vector search, restricted to the plan's hard filters and boosted by its soft ones."""
+        if self.retrieval_workers is not None:
+            return self.retrieval_workers.search(self._get_snapshot(), "vector", query, k, plan=plan)
+        if plan is not None:
+            return self._get_planner().execute_vector(plan, self._get_vectors(), k)
+        return self._get_vectors().search(query, k=k)
+    
+    def _get_snapshot(self) -> str:
+        """
+        Path of the retrieval workers' snapshot of the indexes.
+        
+        The first one is published right away. When the corpus has grown since, a new
+        snapshot is published in the background and searches keep using the previous
+        one (which simply lacks the newest ideas) until it is ready.
+        """
+        if self._snapshot is None:
+            self._publish_snapshot()
+        elif self._snapshot[0] != len(self.ideas):
+            with self._snapshot_lock:
+                if self._publisher is None or not self._publisher.is_alive():
+                    self._publisher = threading.Thread(
+                        target=self._publish_snapshot, name="snapshot-publisher", daemon=True
+                    )
+                    self._publisher.start()
+        return self._snapshot[1]
+    
+    def _publish_snapshot(self):
+        """Write and load the current indexes in the retrieval workers, then release the previous snapshot."""
+        with self._corpus_lock:
+            size = len(self.ideas)
+            if self._snapshot is not None and self._snapshot[0] == size:
+                return
+            vectors = self._get_vectors()
+            planner = self._get_planner()
+            if self._fingerprint is None:
+                self._fingerprint = CorpusFingerprint(self.ideas)
+            key = f"{self._fingerprint.key()}-{'ivf' if vectors.ann is not None else 'exact'}"
+            path = self.retrieval_workers.publish(key, planner.text_index, planner.facet_index, vectors)
+        # Load it in the workers before searches switch over to it
+        self.retrieval_workers.warm_up(path)
+        previous, self._snapshot = self._snapshot, (size, path)
+        if previous is not None:
+            self.retrieval_workers.release(previous[1])
+    
+    def _get_planner(self) -> QueryPlanner:
+        """Return a query planner over the current keyword and facet indexes."""
+        if self._facets is None or self._facets.size != len(self.ideas):
+            self._facets = FacetIndex(self.ideas)
+        return QueryPlanner(self._get_index(), self._facets, hard_filters=self.hard_filters)
+    
+    def _get_hybrid(self) -> HybridRetriever:
+        """Return the hybrid retriever, creating it on first use."""
+        if self._hybrid is None:
+            # Look the indexes up on every call so rebuilt indexes are picked up.
+            # The sides only overlap when both run in the worker processes.
+            self._hybrid = HybridRetriever(
+                lexical_search=lambda query, depth, plan=None, event=None: self._lexical_search(
+                    query, depth, plan=plan, event=event
+                ),
+                vector_search=lambda query, depth, plan=None, event=None: self._vector_search(
+                    query, depth, plan=plan, event=event
+                ),
+                lexical_depth=self.lexical_depth,
+                vector_depth=self.vector_depth,
+                concurrent=self.retrieval_workers is not None
+            )
+        return self._hybrid
+    
+    def _get_vectors(self) -> IdeaVectors:
+        """Return the idea vectors, building them on first use."""
+        if self._vectors is None or self._vectors.size != len(self.ideas):
+            vectors = IdeaVectors(self.ideas)
+            # Brute force stops fitting the latency budget on very large corpora
+            if vectors.size >= self.ann_threshold:
+                vectors.build_ann(n_probe=self.ann_probes)
+            self._vectors = vectors
+        return self._vectors
+    
+    @staticmethod
+    def _format_result(idea: Dict, score: float) -> Dict:
+        """Format a retrieved idea for the prompt and the UI."""
+        return {
+            "content": f"""Title: {idea['title']}
 Description: {idea['description']}
 Theme: {idea['theme']}
 Difficulty: {idea['difficulty']}
 Tech Stack: {', '.join(idea['tech_stack'])}
 Team Size: {idea['team_size']}""",
-                    "metadata": idea,
-                    "similarity_score": 0.5
-                })
-        
-        return similar_ideas
+            "metadata": idea,
+            "similarity_score": score
+        }
     
     def generate_idea(
         self,
@@ -93,7 +591,11 @@ Team Size: {idea['team_size']}""",
         difficulty: Optional[str] = None,
         tech_stack: Optional[List[str]] = None,
         team_size: Optional[str] = None,
-        custom_requirements: Optional[str] = None
+        custom_requirements: Optional[str] = None,
+        mmr_lambda: Optional[float] = None,
+        retrieval_mode: Optional[str] = None,
+        best_of: int = 1,
+        event: Optional[str] = None
     ) -> Dict:
         """
         Generate a new hackathon idea using RAG.
@@ -105,27 +607,46 @@ Team Size: {idea['team_size']}""",
             tech_stack: Preferred technologies
             team_size: Team size (e.g., "2-3", "4-5")
             custom_requirements: Any additional custom requirements
+            mmr_lambda: Override the engine's relevance/diversity balance for the context
+            retrieval_mode: Override the engine's retrieval mode ("keyword", "vector", "hybrid")
+            best_of: Generate this many candidates concurrently and return the best-scoring one
+            event: Retrieve context from this event's overlay (see create_event)
         
         Returns:
-            Dictionary containing the generated idea
+            Dictionary containing the generated idea (and all scored candidates when best_of > 1)
         """
-        # Build the query for retrieval
+        if not 1 <= best_of <= MAX_BEST_OF:
+            raise ValueError(f"best_of must be between 1 and {MAX_BEST_OF}.")
+        overlay = self.get_event(event)
+        
+        # Build the query for retrieval: free text is scored, structured parameters are facet filters
         query_parts = []
         if topic:
             query_parts.append(topic)
-        if theme:
-            query_parts.append(f"Theme: {theme}")
-        if difficulty:
-            query_parts.append(f"Difficulty: {difficulty}")
-        if tech_stack:
-            query_parts.append(f"Technologies: {', '.join(tech_stack)}")
         if custom_requirements:
             query_parts.append(custom_requirements)
         
-        query = " ".join(query_parts) if query_parts else "innovative hackathon project"
+        has_filters = any((theme, difficulty, tech_stack, team_size))
+        query = " ".join(query_parts) if query_parts or has_filters else "innovative hackathon project"
+        if self.retrieval_workers is not None:
+            # The workers plan the query next to the indexes; matching query words here would hold the GIL
+            filters = {"theme": theme, "difficulty": difficulty, "tech_stack": tech_stack, "team_size": team_size}
+            plan = QueryPlan.unplanned(query, filters, self.hard_filters)
+        else:
+            plan = self.plan_query(query, theme=theme, difficulty=difficulty, tech_stack=tech_stack, team_size=team_size)
         
-        # Retrieve similar ideas for context
-        similar_ideas = self.retrieve_similar_ideas(query, k=3)
+        # Retrieve a wider candidate set, then keep 3 relevant but varied ideas for context
+        retrieval_timings = {}
+        candidates = self._search(
+            query, k=max(3, self.mmr_candidates), mode=retrieval_mode, timings=retrieval_timings,
+            plan=plan, event=overlay
+        )
+        if tech_stack and self.related_tech_boost:
+            candidates = self._boost_related_tech(candidates, tech_stack, event=overlay)
+        similar_ideas = self._format_results(
+            self.rerank_diverse(candidates, k=3, mmr_lambda=mmr_lambda, event=overlay), 3, query,
+            event=overlay, plan=plan
+        )
         
         # Build context from retrieved ideas
         context = "Here are some similar hackathon ideas for inspiration:\n\n"
@@ -176,22 +697,18 @@ Make sure the idea is creative, feasible within a hackathon timeframe, and addre
 """
         
         # Generate the idea using Gemini
-        try:
-            model = genai.GenerativeModel('gemini-pro')
-            response = model.generate_content(prompt)
-            generated_text = response.text
-        except Exception as e:
-            # If gemini-pro fails, try with models/gemini-pro
-            try:
-                model = genai.GenerativeModel('models/gemini-pro')
-                response = model.generate_content(prompt)
-                generated_text = response.text
-            except Exception as e2:
-                raise Exception(f"Error generating idea: {str(e2)}")
+        candidates = None
+        if best_of > 1:
+            candidates = self._generate_candidates(prompt, best_of, topic=topic, theme=theme, tech_stack=tech_stack)
+            generated_text = candidates[0]["generated_idea"]
+        else:
+            generated_text = self._generate_text(prompt)
         
-        return {
+        result = {
             "generated_idea": generated_text,
             "similar_ideas": similar_ideas,
+            "retrieval_timings": retrieval_timings,
+            "query_plan": plan.explain(),
             "parameters": {
                 "topic": topic,
                 "theme": theme,
@@ -201,13 +718,97 @@ Make sure the idea is creative, feasible within a hackathon timeframe, and addre
                 "custom_requirements": custom_requirements
             }
         }
+        
+        if candidates is not None:
+            result["candidates"] = candidates
+        if event is not None:
+            result["event"] = event
+        
+        # Record the idea so it can be searched and reused later (written in the background)
+        if self.idea_store is not None:
+            result["idea_id"] = self.idea_store.record(result)
+        
+        return result
     
-    def get_random_inspiration(self) -> str:
-        """Get a random idea from the knowledge base for inspiration."""
-        import random
-        ideas = get_all_ideas()
-        if ideas:
-            idea = random.choice(ideas)
+    def _generate_candidates(
+        self,
+        prompt: str,
+        count: int,
+        topic: Optional[str] = None,
+        theme: Optional[str] = None,
+        tech_stack: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Run count generations concurrently and return them scored, best first."""
+        # A pool per call: a shared one would queue the candidates of concurrent requests
+        # behind each other, and threads are cheap next to a model call
+        texts, errors = [], []
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="best-of") as executor:
+            futures = [executor.submit(self._generate_text, prompt) for _ in range(count)]
+            for future in futures:
+                try:
+                    texts.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        # A few failed calls still leave candidates to choose from
+        if not texts:
+            raise errors[0]
+        
+        vectors = self._get_vectors()
+        candidates = [
+            {
+                "generated_idea": text,
+                "scores": score_candidate(text, vectors, topic=topic, theme=theme, tech_stack=tech_stack),
+            }
+            for text in texts
+        ]
+        candidates.sort(key=lambda candidate: -candidate["scores"]["total"])
+        return candidates
+    
+    def _generate_text(self, prompt: str) -> str:
+        """Generate text for a prompt, through the cassette if one is configured."""
+        if self.cassette is not None:
+            return self.cassette.play(prompt, self._call_gemini)
+        return self._call_gemini(prompt)
+    
+    def _call_gemini(self, prompt: str) -> str:
+        """Send the prompt to Gemini and return the generated text."""
+        try:
+            model = genai.GenerativeModel('gemini-pro')
+            response = model.generate_content(prompt)
+            return response.text
+        except Exception as e:
+            # If gemini-pro fails, try with models/gemini-pro
+            try:
+                model = genai.GenerativeModel('models/gemini-pro')
+                response = model.generate_content(prompt)
+                return response.text
+            except Exception as e2:
+                raise Exception(f"Error generating idea: {str(e2)}")
+    
+    def get_random_inspiration(
+        self,
+        cursor: Optional[PermutationCursor] = None,
+        theme: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        weighting: str = "uniform"
+    ) -> str:
+        """
+        Get a random idea from the knowledge base for inspiration.
+        
+        Args:
+            cursor: Per-session cursor; when given, ideas don't repeat until all were shown
+            theme: Only draw ideas with this theme
+            difficulty: Only draw ideas with this difficulty
+            weighting: Weighting scheme ("uniform", "popularity" for common themes and
+                tech stacks, or "freshness")
+        
+        Returns:
+            The idea formatted as markdown
+        """
+        sampler = self._get_sampler(theme, difficulty, weighting)
+        if sampler.size:
+            position = sampler.next_from(cursor) if cursor is not None else sampler.sample()
+            idea = self.ideas[position]
             return f"""**{idea['title']}**
 
 {idea['description']}
@@ -218,3 +819,26 @@ Make sure the idea is creative, feasible within a hackathon timeframe, and addre
 **Team Size**: {idea['team_size']}
 """
         return "No ideas available in the knowledge base."
+    
+    def _get_sampler(self, theme: Optional[str], difficulty: Optional[str], weighting: str) -> InspirationSampler:
+        """Return the sampler for a filter and weighting, rebuilding freshness ones as their weights decay."""
+        key = (theme, difficulty, weighting, len(self.ideas))
+        sampler = self._samplers.get(key)
+        if sampler is None or sampler.stale():
+            positions = [
+                position for position, idea in enumerate(self._idea_metadata())
+                if (not theme or idea['theme'].lower() == theme.lower())
+                and (not difficulty or idea['difficulty'].lower() == difficulty.lower())
+            ]
+            popularity = None
+            if weighting == "popularity":
+                # Ideas built on widely used themes and technologies come up more often
+                tech_model = self._get_tech_model()
+                popularity = lambda idea: max(0.01, tech_model.popularity(idea))
+            sampler = InspirationSampler(
+                self._idea_metadata(), positions, weighting=weighting, seed=self.random_seed, popularity=popularity
+            )
+            # Drop samplers built for an older, smaller corpus
+            self._samplers = {k: v for k, v in self._samplers.items() if k[3] == len(self.ideas)}
+            self._samplers[key] = sampler
+        return sampler
@@ -0,0 +1,151 @@
+"""
+Replay a traffic trace against the engine, with model calls served from a cassette.
+
+The trace is a JSONL file of generate_idea specs, each with an optional arrival
+offset "t" in seconds (api_server.py --record-trace writes this format; bulk JSONL
+spec files work too and arrive all at once). Model calls come from a cassette at
+the recorded latency, so the run needs no API key and measures only the engine.
+
+Record once against the live model, then replay on each version and compare:
+    python replay_trace.py trace.jsonl --cassette model.cassette.gz --record
+    python replay_trace.py trace.jsonl --cassette model.cassette.gz --save v1.json
+    python replay_trace.py trace.jsonl --cassette model.cassette.gz --baseline v1.json
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bulk_generate import normalize_spec
+from llm_cassette import Cassette, read_trace
+from rag_engine import HackathonRAGEngine
+
+
+def replay(
+    engine: HackathonRAGEngine,
+    trace: List[Tuple[float, Dict]],
+    concurrency: int = 16,
+    speed: float = 1.0
+) -> Dict:
+    """
+    Send the trace's requests to the engine and measure them.
+
+    Args:
+        engine: Engine under test (with a cassette for its model calls)
+        trace: (arrival offset, spec) pairs, sorted by offset
+        concurrency: Requests handled at once
+        speed: Arrival-time multiplier (2.0 = twice as fast, 0 = send everything at once)
+
+    Returns:
+        Summary with counts, throughput and latency percentiles
+    """
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def run(arrival: float, spec: Dict):
+        try:
+            engine.generate_idea(**spec)
+            failed = None
+        except Exception as e:
+            failed = str(e)
+        # Latency is measured from the scheduled arrival, so queueing counts too
+        latency = time.perf_counter() - arrival
+        with lock:
+            latencies.append(latency)
+            if failed is not None:
+                errors.append(failed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for offset, spec in trace:
+            arrival = start + (offset / speed if speed else 0.0)
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(run, max(arrival, start), spec)
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput": round((len(latencies) - len(errors)) / elapsed, 2) if elapsed else 0.0,
+    }
+    for q in (50, 95, 99):
+        summary[f"p{q}_ms"] = round(float(np.percentile(latencies, q)) * 1000, 1) if latencies else 0.0
+    if errors:
+        summary["first_error"] = errors[0]
+    return summary
+
+
+def print_comparison(summary: Dict, baseline: Optional[Dict] = None):
+    """Print the summary, with changes against a baseline run if given."""
+    print("\n" + "=" * 60)
+    print(f"  {'metric':<18}{'this run':>14}{'baseline':>14}{'change':>12}")
+    print("=" * 60)
+    for metric in ("requests", "errors", "throughput", "p50_ms", "p95_ms", "p99_ms"):
+        value = summary[metric]
+        line = f"  {metric:<18}{value:>14}"
+        if baseline is not None and metric in baseline:
+            before = baseline[metric]
+            change = f"{(value - before) / before:+.1%}" if before else "-"
+            line += f"{before:>14}{change:>12}"
+        print(line)
+    print("=" * 60)
+
+
+def main():
+    """Parse arguments and replay a trace."""
+    parser = argparse.ArgumentParser(description="Replay a traffic trace against the engine")
+    parser.add_argument("trace", help="JSONL trace of generate_idea specs")
+    parser.add_argument("--cassette", required=True, help="Cassette file (.gz) for model calls")
+    parser.add_argument("--record", action="store_true", help="Call the live model and record the cassette")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Replayed model latency multiplier (0 = no wait)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Fail prompts missing from the cassette instead of serving recordings in order")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Arrival-time multiplier (0 = send all requests at once)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests handled at once")
+    parser.add_argument("--seed", type=int, default=0, help="Engine random seed, for identical prompts")
+    parser.add_argument("--save", metavar="PATH", help="Write the summary as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Summary JSON of a previous run to compare with")
+    args = parser.parse_args()
+
+    trace = [(offset, normalize_spec(raw)) for offset, raw in read_trace(args.trace)]
+    cassette = Cassette(
+        args.cassette,
+        mode="record" if args.record else "replay",
+        latency_scale=args.latency_scale,
+        fallback=not args.strict
+    )
+    engine = HackathonRAGEngine(random_seed=args.seed, cassette=cassette)
+    engine.initialize_knowledge_base()
+
+    print(f"🔁 Replaying {len(trace)} requests from {args.trace}...")
+    try:
+        summary = replay(engine, trace, concurrency=args.concurrency, speed=args.speed)
+    finally:
+        cassette.close()
+    if not args.record:
+        summary["cassette_hits"], summary["cassette_misses"] = cassette.hits, cassette.misses
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_comparison(summary, baseline)
+    if not args.record:
+        print(f"Cassette: {cassette.hits} hits, {cassette.misses} misses")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Multi-process retrieval workers.
+
+Streamlit runs every session in a thread of a single process, so CPU-bound
+retrieval from many concurrent users serializes on the GIL. RetrievalWorkerPool
+runs keyword and vector searches in separate processes instead:
+
+- The engine publishes a snapshot of its indexes to disk once per corpus version,
+  in the background when the corpus grows; searches use the previous snapshot
+  until the new one is ready.
+- Workers memory-map the vector matrix, IVF lists and keyword postings read-only,
+  so all of them share one copy through the page cache. Each worker keeps its own
+  vocabulary lookups and facet postings.
+- A request is (snapshot, mode, query, k, filters); the worker plans the query and
+  replies with a short list of (score, position) tuples and the plan's decisions,
+  so each call pickles only a few hundred bytes.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import pickle
+import shutil
+import signal
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ann_index import DEFAULT_N_PROBE
+from query_planner import FacetIndex, QueryPlan, QueryPlanner
+from text_vectors import IdeaVectors
+from trigram_index import MappedTrigramIndex, TrigramIndex
+
+# Where snapshots are written unless the pool is given a directory
+DEFAULT_SNAPSHOT_ROOT = os.path.join(tempfile.gettempdir(), "hackathon-retrieval-snapshots")
+
+# Snapshots a worker keeps loaded (the current one and the one it replaced)
+LOADED_SNAPSHOTS = 2
+
+# Snapshots no engine uses any more that stay on disk for searches still queued against them
+RETIRED_SNAPSHOTS = 1
+
+# Seconds a warm-up task waits for the other workers to pick up theirs
+WARM_UP_TIMEOUT = 60.0
+
+# (text, filters, hard filter names), see QueryPlan.spec()
+PlanSpec = Tuple[str, Dict[str, object], List[str]]
+
+
+class CorpusFingerprint:
+    """Running key identifying a corpus, so engines with the same ideas share a snapshot."""
+
+    def __init__(self, ideas: Iterable[Dict] = ()):
+        """Hash the given ideas."""
+        self._digest = hashlib.sha1()
+        self.count = 0
+        self.update(ideas)
+
+    def update(self, ideas: Iterable[Dict]):
+        """Hash ideas appended to the corpus."""
+        for idea in ideas:
+            self.count += 1
+            self._digest.update(
+                f"{idea.get('idea_id', '')}\x1f{idea['title']}\x1f{idea['theme']}\x1f{idea['description']}\x1e".encode("utf-8")
+            )
+
+    def key(self) -> str:
+        """Short key of the corpus so far."""
+        return f"{self.count}-{self._digest.hexdigest()[:16]}"
+
+def write_snapshot(root: str, key: str, index: TrigramIndex, facets: FacetIndex, vectors: IdeaVectors) -> str:
+    """
+    Write the indexes under root/key, unless that snapshot already exists.
+
+    The snapshot is written to a temporary directory and renamed into place, so
+    workers never see a half-written one.
+
+    Returns:
+        The snapshot directory
+    """
+    path = os.path.join(root, key)
+    if os.path.isdir(path):
+        return path
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=root, prefix=f".{key}-")
+    try:
+        vectors.save(os.path.join(staging, "vectors"))
+        index.save(os.path.join(staging, "keyword"), size=vectors.size)
+        state = {"facets": facets, "ann_probes": vectors.ann.n_probe if vectors.ann is not None else DEFAULT_N_PROBE}
+        with open(os.path.join(staging, "indexes.pkl"), "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.rename(staging, path)
+    except OSError:
+        # Another engine published the same snapshot first
+        if not os.path.isdir(path):
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return path
+
+
+class RetrievalSnapshot:
+    """Indexes loaded from a snapshot directory inside a worker process."""
+
+    def __init__(self, path: str):
+        """Memory-map the keyword postings and vectors and load the facet index."""
+        with open(os.path.join(path, "indexes.pkl"), "rb") as f:
+            state = pickle.load(f)
+        self.index: TrigramIndex = MappedTrigramIndex.load(os.path.join(path, "keyword"))
+        self.facets: FacetIndex = state["facets"]
+        self.vectors = IdeaVectors.load(os.path.join(path, "vectors"), mmap_mode="r", n_probe=state["ann_probes"])
+
+    def search(
+        self,
+        mode: str,
+        query: str,
+        k: int,
+        plan_spec: Optional[PlanSpec] = None
+    ) -> Tuple[List[Tuple[float, int]], Optional[Dict]]:
+        """Run a keyword or vector search, planning the query when filters were given; returns (results, plan summary)."""
+        if plan_spec is None:
+            if mode == "vector":
+                return self.vectors.search(query, k=k), None
+            return self.index.search(query, k=k), None
+        text, filters, hard_names = plan_spec
+        planner = QueryPlanner(self.index, self.facets, hard_filters=hard_names)
+        plan = planner.plan(text, filters)
+        if mode == "vector":
+            results = planner.execute_vector(plan, self.vectors, k)
+        else:
+            results = planner.execute(plan, k)
+        return results, plan.summary()
+
+
+# Snapshots loaded in this worker process, least recently used first
+_loaded: "OrderedDict[str, RetrievalSnapshot]" = OrderedDict()
+
+# Shared by all workers of a pool, see RetrievalWorkerPool.warm_up()
+_warm_up_barrier = None
+
+
+def _init_worker(barrier):
+    """Leave Ctrl-C to the parent process, which shuts the pool down."""
+    global _warm_up_barrier
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _warm_up_barrier = barrier
+
+
+def _load_snapshot(path: str) -> RetrievalSnapshot:
+    """Return a loaded snapshot, loading it (and evicting the oldest) if needed."""
+    snapshot = _loaded.get(path)
+    if snapshot is None:
+        snapshot = _loaded[path] = RetrievalSnapshot(path)
+        while len(_loaded) > LOADED_SNAPSHOTS:
+            _loaded.popitem(last=False)
+    else:
+        _loaded.move_to_end(path)
+    return snapshot
+
+
+def _worker_warm_up(path: str) -> Optional[int]:
+    """
+    Load a snapshot, then wait until every worker has taken a warm-up task.
+
+    A worker blocked here can't take another warm-up task, so the pool's tasks
+    land on distinct processes. Returns the process id, or None if the others
+    didn't arrive in time.
+    """
+    _load_snapshot(path)
+    try:
+        _warm_up_barrier.wait(timeout=WARM_UP_TIMEOUT)
+    except threading.BrokenBarrierError:
+        return None
+    return os.getpid()
+
+
+def _worker_search(
+    path: str,
+    mode: str,
+    query: str,
+    k: int,
+    plan_spec: Optional[PlanSpec]
+) -> Tuple[List[Tuple[float, int]], Optional[Dict]]:
+    """Entry point run in the worker processes."""
+    return _load_snapshot(path).search(mode, query, k, plan_spec)
+
+
+class RetrievalWorkerPool:
+    """Process pool that serves keyword and vector searches from published snapshots."""
+
+    def __init__(self, processes: Optional[int] = None, snapshot_root: str = DEFAULT_SNAPSHOT_ROOT):
+        """
+        Start the worker processes.
+
+        Args:
+            processes: Number of worker processes (defaults to the CPU count)
+            snapshot_root: Directory that holds published snapshots
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.snapshot_root = snapshot_root
+        # Published snapshot path -> number of engines using it
+        self._users: Dict[str, int] = {}
+        self._retired: List[str] = []
+        self._lock = threading.Lock()
+        # One warm-up at a time, so its tasks are the only ones waiting at the barrier
+        self._warm_up_lock = threading.Lock()
+        # Spawn rather than fork: forking a process that already runs threads
+        # (Streamlit sessions, the API server) can deadlock the child
+        context = multiprocessing.get_context("spawn")
+        self._warm_up_barrier = context.Barrier(self.processes)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._warm_up_barrier,)
+        )
+
+    def publish(self, key: str, index: TrigramIndex, facets: FacetIndex, vectors: IdeaVectors) -> str:
+        """Write a snapshot of the indexes (once per key) and return its path; release() it when replaced."""
+        path = write_snapshot(self.snapshot_root, key, index, facets, vectors)
+        with self._lock:
+            self._users[path] = self._users.get(path, 0) + 1
+            if path in self._retired:
+                self._retired.remove(path)
+        return path
+
+    def release(self, path: str):
+        """An engine stopped using a snapshot; delete it once no engine uses it."""
+        with self._lock:
+            self._users[path] -= 1
+            if self._users[path] > 0:
+                return
+            del self._users[path]
+            self._retired.append(path)
+            expired = self._retired[:-RETIRED_SNAPSHOTS]
+            del self._retired[:-RETIRED_SNAPSHOTS]
+        for expired_path in expired:
+            shutil.rmtree(expired_path, ignore_errors=True)
+
+    def warm_up(self, snapshot: str) -> int:
+        """
+        Load a snapshot in every worker ahead of the first query.
+
+        Each worker holds its warm-up task at a barrier until all of them have one,
+        so no worker can take two. If some are too busy to join in time, they load
+        the snapshot on their first search instead.
+
+        Returns:
+            Number of workers that loaded the snapshot here
+        """
+        with self._warm_up_lock:
+            futures = [self._executor.submit(_worker_warm_up, snapshot) for _ in range(self.processes)]
+            pids = [future.result() for future in futures]
+            if None in pids:
+                self._warm_up_barrier.reset()
+        return len({pid for pid in pids if pid is not None})
+
+    def search(
+        self,
+        snapshot: str,
+        mode: str,
+        query: str,
+        k: int,
+        plan: Optional[QueryPlan] = None
+    ) -> List[Tuple[float, int]]:
+        """
+        Run a search in a worker process and wait for the result.
+
+        Args:
+            snapshot: Path returned by publish()
+            mode: "keyword" or "vector"
+            query: Free-text query
+            k: Number of results
+            plan: Query plan; only its filters are sent, the worker plans the query and
+                its decisions are copied back into the plan
+
+        Returns:
+            (score, idea position) pairs, best first
+        """
+        plan_spec = plan.spec() if plan is not None else None
+        results, summary = self._executor.submit(_worker_search, snapshot, mode, query, k, plan_spec).result()
+        if plan is not None:
+            plan.adopt(summary)
+        return results
+
+    def close(self):
+        """Stop the workers and delete the snapshots this pool published."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            paths = list(self._users) + self._retired
+            self._users.clear()
+            self._retired.clear()
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,227 @@
+"""
+Weighted random sampling for the "Random Inspiration" feature.
+
+AliasSampler draws weighted random ideas in O(1) using Vose's alias method.
+PermutationCursor walks a pseudo-random permutation of the corpus so a session
+sees every idea exactly once per cycle, while only storing a key and a counter.
+"""
+
+import random
+import time
+from array import array
+from typing import Callable, Dict, Optional, Sequence
+
+_MASK64 = (1 << 64) - 1
+
+# Seconds for a generated idea's freshness weight to halve
+FRESHNESS_HALF_LIFE = 30 * 24 * 3600
+
+# Freshness weight for ideas without a creation time (the built-in knowledge base)
+DEFAULT_FRESHNESS = 0.25
+
+# Seconds before a freshness-weighted sampler is rebuilt with decayed weights
+FRESHNESS_REFRESH = 3600
+
+
+def _mix(x: int) -> int:
+    """SplitMix64 finalizer: scramble a 64-bit integer."""
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK64
+    return x ^ (x >> 31)
+
+
+def _freshness(idea: Dict) -> float:
+    """Weight newer ideas more, halving every FRESHNESS_HALF_LIFE."""
+    created_at = idea.get("created_at")
+    if created_at is None:
+        return DEFAULT_FRESHNESS
+    age = max(0.0, time.time() - created_at)
+    return max(0.01, 0.5 ** (age / FRESHNESS_HALF_LIFE))
+
+
+# Named weighting schemes for inspiration sampling. Popularity depends on the whole
+# corpus, so its weight function is passed to InspirationSampler by the caller.
+WEIGHTINGS: Dict[str, Optional[Callable[[Dict], float]]] = {
+    "uniform": lambda idea: 1.0,
+    "popularity": None,
+    "freshness": _freshness,
+}
+
+
+class AliasSampler:
+    """O(1) weighted sampling over range(len(weights)) using Vose's alias method."""
+
+    def __init__(self, weights: Sequence[float]):
+        """Build the probability and alias tables in O(n)."""
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("Weights must be non-negative with a positive sum.")
+
+        self.size = n
+        self.prob = array("d", [0.0]) * n
+        self.alias = array("l", [0]) * n
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large[-1]
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                large.pop()
+                small.append(more)
+        # Whatever is left has probability 1 up to rounding error
+        for i in large + small:
+            self.prob[i] = 1.0
+            self.alias[i] = i
+
+    def draw(self, rng: random.Random) -> int:
+        """Draw one index."""
+        i = int(rng.random() * self.size)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class PermutationCursor:
+    """
+    Position in a pseudo-random permutation of range(size).
+
+    The permutation is a small Feistel network keyed by a seed and the cycle
+    number, so the state is a handful of integers no matter how large the corpus.
+    Each cycle visits every index exactly once, then a new order begins.
+    rewind() walks the same order again (a second sweep), for samplers that
+    skip ideas on the first sweep and show them on the second.
+    """
+
+    __slots__ = ("seed", "size", "cycle", "sweep", "position", "_half_bits", "_half_mask", "_keys")
+
+    ROUNDS = 4
+
+    def __init__(self, size: int = 0, seed: Optional[int] = None):
+        """Create a cursor; size may be bound later with bind()."""
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.size = -1
+        self.bind(size)
+
+    def bind(self, size: int):
+        """Attach the cursor to a population size, restarting if it changed."""
+        if size == self.size:
+            return
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self._half_bits = bits // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._start_cycle(0)
+
+    def _start_cycle(self, cycle: int):
+        """Begin a new cycle with its own round keys."""
+        self.cycle = cycle
+        self.sweep = 0
+        self.position = 0
+        self._keys = [_mix(self.seed ^ _mix(cycle * self.ROUNDS + r + 1)) for r in range(self.ROUNDS)]
+
+    def _feistel(self, x: int) -> int:
+        """One pass of the Feistel permutation over [0, 2**bits)."""
+        left, right = x >> self._half_bits, x & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right ^ key) & self._half_mask)
+        return (left << self._half_bits) | right
+
+    def _permute(self, x: int) -> int:
+        """Map a position to an index, cycle-walking values outside range(size)."""
+        y = self._feistel(x)
+        while y >= self.size:
+            y = self._feistel(y)
+        return y
+
+    def next(self) -> int:
+        """Return the next index of the permutation."""
+        if self.size <= 0:
+            raise ValueError("Cursor is not bound to a population.")
+        if self.position >= self.size:
+            self._start_cycle(self.cycle + 1)
+        index = self._permute(self.position)
+        self.position += 1
+        return index
+
+    def rewind(self):
+        """Walk the current cycle's order again from the start."""
+        self.sweep += 1
+        self.position = 0
+
+    def unit(self) -> float:
+        """Deterministic pseudo-random number in [0, 1) for the current step, the same in every sweep."""
+        return _mix(self._keys[0] ^ (self.position * 0x9E3779B97F4A7C15 & _MASK64)) / 2.0 ** 64
+
+
+class InspirationSampler:
+    """Weighted sampler over a (possibly filtered) set of ideas."""
+
+    def __init__(
+        self,
+        ideas: Sequence[Dict],
+        positions: Optional[Sequence[int]] = None,
+        weighting: str = "uniform",
+        seed: Optional[int] = None,
+        popularity: Optional[Callable[[Dict], float]] = None
+    ):
+        """
+        Build the sampler once; every draw afterwards is O(1).
+
+        Args:
+            ideas: The full corpus (descriptions are not needed)
+            positions: Corpus positions to sample from (defaults to all ideas)
+            weighting: Name of a scheme in WEIGHTINGS
+            seed: Seed for reproducible draws
+            popularity: Weight function for the "popularity" scheme
+        """
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"Unknown weighting '{weighting}'. Choose from: {', '.join(WEIGHTINGS)}")
+        weight_fn = popularity if weighting == "popularity" else WEIGHTINGS[weighting]
+        if weight_fn is None:
+            raise ValueError("Popularity weighting needs a popularity function.")
+        self.positions = array("l", range(len(ideas)) if positions is None else positions)
+        self.weights = array("d", (weight_fn(ideas[p]) for p in self.positions))
+        self.size = len(self.positions)
+        self.weighting = weighting
+        self.built_at = time.time()
+        self.rng = random.Random(seed)
+        self._alias = AliasSampler(self.weights) if self.size else None
+        self._max_weight = max(self.weights) if self.size else 0.0
+        # With equal weights the first sweep keeps every idea, so no second one is needed
+        self._sweeps = 2 if self.size and min(self.weights) < self._max_weight else 1
+
+    def stale(self) -> bool:
+        """Whether the weights have decayed enough since the build to rebuild the sampler."""
+        return self.weighting == "freshness" and time.time() - self.built_at >= FRESHNESS_REFRESH
+
+    def sample(self) -> int:
+        """Draw a corpus position, with replacement, proportional to its weight."""
+        if self._alias is None:
+            raise ValueError("No ideas to sample from.")
+        return self.positions[self._alias.draw(self.rng)]
+
+    def next_from(self, cursor: PermutationCursor) -> int:
+        """
+        Draw the next corpus position for a session, showing every idea once per cycle.
+
+        The first sweep of the cursor's permutation keeps each idea with probability
+        weight / max_weight, so heavier ideas come earlier; the second sweep replays
+        the same steps and shows the ideas the first one skipped. Each step is
+        visited at most twice a cycle, so a draw costs two steps on average.
+        """
+        if self._alias is None:
+            raise ValueError("No ideas to sample from.")
+        cursor.bind(self.size)
+        while True:
+            if cursor.position >= self.size and cursor.sweep + 1 < self._sweeps:
+                cursor.rewind()
+            index = cursor.next()
+            kept = cursor.unit() * self._max_weight < self.weights[index]
+            if kept == (cursor.sweep == 0):
+                return self.positions[index]
+
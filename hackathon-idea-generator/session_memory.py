@@ -0,0 +1,254 @@
+"""
+Memory accounting and idle eviction for per-session state in the Streamlit app.
+
+Streamlit keeps every session's state until the tab is closed, so large payloads
+(generate_idea results with their candidates, reference ideas and query plans) pile
+up for idle tabs. Each session keeps its payloads in a SessionSlot, which is also
+registered in a process-wide SessionRegistry:
+
+- results are detached from the engine's corpus and capped in size when stored
+- sweep() spills the results of sessions idle longer than the TTL to the IdeaStore
+  and frees them; the session restores its result from there when it comes back
+- slots idle much longer are forgotten, together with their spilled result; spilled
+  results left behind by a previous run are purged when the registry is created
+
+The registry has no thread of its own: every app rerun sweeps it, so idle sessions
+are evicted as long as anyone uses the app.
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from idea_store import IdeaStore
+
+# Seconds without a rerun after which a session's result is spilled
+DEFAULT_IDLE_TTL = 30 * 60
+
+# Seconds without a rerun after which a session is forgotten entirely
+DEFAULT_FORGET_AFTER = 24 * 60 * 60
+
+# Largest result kept in memory per session, in bytes
+DEFAULT_MAX_RESULT_BYTES = 256 * 1024
+
+# Reference idea text kept when a result has to be trimmed
+TRIMMED_CONTENT_CHARS = 500
+
+
+def deep_sizeof(obj, _seen: Optional[set] = None) -> int:
+    """Approximate bytes held by an object and everything it contains."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def process_rss() -> int:
+    """Resident memory of this process in bytes (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def detach_result(result: Dict) -> Dict:
+    """
+    A copy of a generate_idea result that holds nothing of the engine's corpus.
+
+    Each reference idea's metadata is the corpus' own idea dict, shared by every
+    session that retrieved it; only its title and id are kept, so the session's
+    size counts just what it owns.
+    """
+    if not result.get("similar_ideas"):
+        return result
+    result = dict(result)
+    result["similar_ideas"] = [
+        {
+            **idea,
+            "metadata": {key: idea["metadata"][key] for key in ("title", "idea_id") if key in idea["metadata"]},
+        }
+        for idea in result["similar_ideas"]
+    ]
+    return result
+
+
+def cap_result(result: Dict, max_bytes: int) -> Dict:
+    """
+    Shrink a generate_idea result until it fits max_bytes.
+
+    Dropped first: the texts of other best-of-N candidates, then the query plan,
+    then most of each reference idea's text. The generated idea itself is always
+    kept. Trimmed fields are listed under "trimmed".
+    """
+    if deep_sizeof(result) <= max_bytes:
+        return result
+    result = dict(result)
+    trimmed = []
+    if result.get("candidates"):
+        # The first candidate is the generated idea; keep only the others' scores
+        result["candidates"] = [result["candidates"][0]] + [
+            {"scores": candidate["scores"], "generated_idea": "(trimmed to save memory)"}
+            for candidate in result["candidates"][1:]
+        ]
+        trimmed.append("candidates")
+    if deep_sizeof(result) > max_bytes and result.get("query_plan"):
+        result["query_plan"] = None
+        trimmed.append("query_plan")
+    if deep_sizeof(result) > max_bytes and result.get("similar_ideas"):
+        result["similar_ideas"] = [
+            {**idea, "content": idea["content"][:TRIMMED_CONTENT_CHARS]} for idea in result["similar_ideas"]
+        ]
+        trimmed.append("similar_ideas")
+    result["trimmed"] = trimmed
+    return result
+
+
+class SessionSlot:
+    """One session's large payloads, shared between the session and the registry."""
+
+    def __init__(self):
+        """Create an empty slot with a fresh id."""
+        self.session_id = uuid.uuid4().hex
+        self.created_at = self.last_seen = time.time()
+        self.result: Optional[Dict] = None
+        self.result_bytes = 0
+        self.state_bytes = 0
+        # Whether the result currently lives in the IdeaStore instead of memory
+        self.spilled = False
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in memory for this session."""
+        return self.result_bytes + self.state_bytes
+
+
+class SessionRegistry:
+    """Process-wide view of every session's slot, with size caps and idle eviction."""
+
+    def __init__(
+        self,
+        store: Optional[IdeaStore] = None,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        forget_after: float = DEFAULT_FORGET_AFTER,
+        max_result_bytes: int = DEFAULT_MAX_RESULT_BYTES
+    ):
+        """
+        Create a registry.
+
+        Args:
+            store: Where idle sessions' results are spilled (if None they are dropped)
+            idle_ttl: Seconds idle before a session's result is evicted
+            forget_after: Seconds idle before a session is forgotten
+            max_result_bytes: Size cap for each stored result
+        """
+        self.store = store
+        self.idle_ttl = idle_ttl
+        self.forget_after = max(forget_after, idle_ttl)
+        self.max_result_bytes = max_result_bytes
+        self._slots: Dict[str, SessionSlot] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.restores = 0
+        # Sessions of an earlier run are gone, but their spilled results are still stored
+        self.purged = store.purge_session_results(time.time() - self.forget_after) if store is not None else 0
+
+    def touch(self, slot: SessionSlot, state_bytes: int = 0):
+        """Mark a session active (registering it again if it had been forgotten)."""
+        with self._lock:
+            slot.last_seen = time.time()
+            slot.state_bytes = state_bytes
+            self._slots[slot.session_id] = slot
+
+    def set_result(self, slot: SessionSlot, result: Dict):
+        """Store a session's latest result, detached from the corpus and capped in size."""
+        result = cap_result(detach_result(result), self.max_result_bytes)
+        size = deep_sizeof(result)
+        with self._lock:
+            slot.result, slot.result_bytes, slot.spilled = result, size, False
+
+    def get_result(self, slot: SessionSlot) -> Optional[Dict]:
+        """A session's result, restored from the store if it was spilled."""
+        with self._lock:
+            if slot.result is not None or not slot.spilled:
+                return slot.result
+        result = self.store.load_session_result(slot.session_id) if self.store is not None else None
+        with self._lock:
+            restored = slot.spilled
+            if restored:
+                slot.result, slot.result_bytes, slot.spilled = result, deep_sizeof(result), False
+                self.restores += 1
+            result = slot.result
+        if restored and self.store is not None:
+            self.store.delete_session_result(slot.session_id)
+        return result
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Spill the results of idle sessions and forget long-idle ones; returns evictions."""
+        now = time.time() if now is None else now
+        with self._lock:
+            idle = [slot for slot in self._slots.values() if now - slot.last_seen > self.idle_ttl]
+            forgotten = [slot for slot in idle if now - slot.last_seen > self.forget_after]
+            for slot in forgotten:
+                del self._slots[slot.session_id]
+                slot.result, slot.result_bytes, slot.spilled = None, 0, False
+            to_spill = [slot for slot in idle if slot.result is not None]
+        for slot in to_spill:
+            self._evict(slot, now)
+        if self.store is not None:
+            for slot in forgotten:
+                self.store.delete_session_result(slot.session_id)
+        return len(to_spill)
+
+    def _evict(self, slot: SessionSlot, now: float):
+        """Spill one session's result and free it, unless the session came back meanwhile."""
+        with self._lock:
+            result = slot.result
+            if result is None or now - slot.last_seen <= self.idle_ttl:
+                return
+        if self.store is not None:
+            self.store.save_session_result(slot.session_id, result)
+        with self._lock:
+            if slot.result is result and now - slot.last_seen > self.idle_ttl:
+                slot.result, slot.result_bytes = None, 0
+                slot.spilled = self.store is not None
+                self.evictions += 1
+
+    def stats(self) -> List[Dict]:
+        """Per-session memory and idle time, largest first."""
+        now = time.time()
+        with self._lock:
+            rows = [
+                {
+                    "session": slot.session_id[:8],
+                    "idle_seconds": round(now - slot.last_seen),
+                    "result_kb": round(slot.result_bytes / 1024, 1),
+                    "state_kb": round(slot.state_bytes / 1024, 1),
+                    "result": "spilled" if slot.spilled else ("in memory" if slot.result is not None else "none"),
+                }
+                for slot in self._slots.values()
+            ]
+        return sorted(rows, key=lambda row: -(row["result_kb"] + row["state_kb"]))
+
+    def total_bytes(self) -> int:
+        """Bytes held in memory by all sessions' payloads."""
+        with self._lock:
+            return sum(slot.nbytes for slot in self._slots.values())
+
+    def __len__(self) -> int:
+        """Number of tracked sessions."""
+        with self._lock:
+            return len(self._slots)
@@ -0,0 +1,147 @@
+"""
+Tech-stack co-occurrence model for stack suggestions and retrieval boosting.
+
+Ideas' tech stacks show which technologies are used together (React Native with
+Firebase, Solidity with Web3.js). The model keeps sparse co-occurrence counts - one
+Counter of neighbours per technology - plus technology counts per theme, updated
+one idea at a time. Suggesting complements for a selection walks the neighbours of
+each selected technology, so it costs O(selected x neighbours) whatever the corpus
+size.
+"""
+
+import heapq
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Pseudo-count added to a technology's usage, so a pair seen once is not a certainty
+SMOOTHING = 1.0
+
+# How strongly a theme's own technology mix reweights suggestions
+THEME_WEIGHT = 1.0
+
+# Score multiplier gained by a retrieved idea whose stack fully complements the selection
+RELATED_TECH_BOOST = 0.25
+
+
+def _key(name: str) -> str:
+    """Technologies and themes are compared case-insensitively."""
+    return name.strip().lower()
+
+
+class TechCooccurrence:
+    """Sparse technology co-occurrence counts, overall and per theme."""
+
+    def __init__(self, ideas: Iterable[Dict] = ()):
+        """Count the tech stacks of the given ideas."""
+        self.size = 0
+        self._names: Dict[str, str] = {}
+        self._counts: Counter = Counter()
+        self._pairs: Dict[str, Counter] = defaultdict(Counter)
+        self._themes: Dict[str, Counter] = defaultdict(Counter)
+        self._theme_sizes: Counter = Counter()
+        for idea in ideas:
+            self.add(idea)
+
+    def add(self, idea: Dict):
+        """Count one more idea's tech stack."""
+        self.size += 1
+        techs = []
+        for name in idea.get("tech_stack") or []:
+            key = _key(name)
+            if key and key not in techs:
+                techs.append(key)
+                self._names.setdefault(key, name.strip())
+        theme = _key(idea.get("theme") or "")
+        if theme:
+            self._theme_sizes[theme] += 1
+        for a in techs:
+            self._counts[a] += 1
+            if theme:
+                self._themes[theme][a] += 1
+            for b in techs:
+                if b != a:
+                    self._pairs[a][b] += 1
+
+    def __len__(self) -> int:
+        """Number of distinct technologies."""
+        return len(self._counts)
+
+    def names(self) -> List[str]:
+        """All technologies, most used first."""
+        return [self._names[key] for key, _ in self._counts.most_common()]
+
+    def association(self, a: str, b: str) -> float:
+        """Smoothed share of ideas using technology a that also use b."""
+        a, b = _key(a), _key(b)
+        if a == b:
+            return 1.0
+        neighbours = self._pairs.get(a)
+        if not neighbours:
+            return 0.0
+        return neighbours[b] / (self._counts[a] + SMOOTHING)
+
+    def suggest(
+        self,
+        selected: Iterable[str],
+        theme: Optional[str] = None,
+        limit: int = 5
+    ) -> List[Tuple[str, float]]:
+        """
+        Technologies that complement a selection, best first.
+
+        Each candidate scores its average association with the selected technologies,
+        reweighted by how common it is in the theme. With nothing (known) selected,
+        the theme's most used technologies are suggested instead.
+
+        Returns:
+            (technology, score) pairs
+        """
+        chosen = {_key(name) for name in selected}
+        known = [key for key in chosen if key in self._pairs]
+        theme_counts = self._themes.get(_key(theme)) if theme else None
+        theme_size = self._theme_sizes[_key(theme)] if theme_counts else 0
+
+        scores: Dict[str, float] = defaultdict(float)
+        if known:
+            for a in known:
+                total = self._counts[a] + SMOOTHING
+                for b, together in self._pairs[a].items():
+                    if b not in chosen:
+                        scores[b] += together / total / len(known)
+            if theme_counts:
+                for b in scores:
+                    scores[b] *= 1.0 + THEME_WEIGHT * theme_counts[b] / theme_size
+        else:
+            counts = theme_counts or self._counts
+            size = theme_size or self.size
+            for b, count in counts.items():
+                if b not in chosen:
+                    scores[b] = count / size
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(self._names[key], round(score, 4)) for key, score in best]
+
+    def popularity(self, idea: Dict) -> float:
+        """
+        How widely an idea's theme and technologies are used, from 0 to 1.
+
+        The average of its theme's share of the corpus and its technologies' mean share.
+        """
+        if not self.size:
+            return 0.0
+        techs = {_key(name) for name in idea.get("tech_stack") or []}
+        tech_share = sum(self._counts[key] for key in techs) / len(techs) / self.size if techs else 0.0
+        theme_share = self._theme_sizes[_key(idea.get("theme") or "")] / self.size
+        return (theme_share + tech_share) / 2
+
+    def affinity(self, selected: Iterable[str], tech_stack: Iterable[str]) -> float:
+        """
+        How well an idea's stack complements a selection, from 0 to 1.
+
+        For each selected technology, the idea's best-associated technology counts
+        (1.0 when the idea uses it); the result is the average over the selection.
+        """
+        chosen = [_key(name) for name in selected]
+        stack = [_key(name) for name in tech_stack or []]
+        if not chosen or not stack:
+            return 0.0
+        return sum(max(self.association(a, b) for b in stack) for a in chosen) / len(chosen)
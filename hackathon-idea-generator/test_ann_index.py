@@ -0,0 +1,69 @@
+"""
+Checks for the IVF approximate nearest-neighbour index and idea vectors.
+Runs offline (no API key or model calls): python test_ann_index.py
+"""
+
+import numpy as np
+
+from ann_index import IVFIndex, exact_search
+from benchmark_ann import make_queries
+from benchmark_text_store import synthetic_ideas
+from text_vectors import IdeaVectors, idea_text
+
+
+def test_ivf_full_probe_matches_exact():
+    """Probing every list makes the IVF index exact."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = IVFIndex(n_lists=10, seed=0).build(vectors)
+    for query in vectors[:5]:
+        approximate = index.search(query, 10, n_probe=10)
+        exact = exact_search(vectors, query, 10)
+        assert [p for _, p in approximate] == [p for _, p in exact]
+    print("✅ IVF search with all lists probed equals exact search")
+
+
+def test_default_probes_recall_on_idea_vectors():
+    """With the default probe count, IVF finds most exact neighbours of real idea vectors."""
+    vectors = IdeaVectors(list(synthetic_ideas(5000, seed=8)))
+    index = vectors.build_ann()
+    hits = total = 0
+    for text in make_queries(50, seed=9):
+        query = vectors.encode_query(text)
+        expected = {p for _, p in exact_search(vectors.matrix, query, 10)}
+        hits += len(expected & {p for _, p in index.search(query, 10)})
+        total += len(expected)
+    assert hits / total >= 0.85, hits / total
+    print(f"✅ Default IVF probes reach recall@10 of {hits / total:.2f} on idea vectors")
+
+
+def test_added_vectors_match_rebuilt():
+    """Ideas added one at a time get the rows a fresh transform gives, without disturbing older views."""
+    ideas = list(synthetic_ideas(3000, seed=6))
+    vectors = IdeaVectors(ideas[:1000])
+    before = vectors.matrix
+    for idea in ideas[1000:]:
+        vectors.add([idea])
+    assert vectors.size == len(vectors.matrix) == len(ideas)
+    assert np.array_equal(vectors.matrix[:1000], before)
+    expected = vectors.vectorizer.transform(idea_text(idea) for idea in ideas[1000:])
+    assert np.array_equal(vectors.matrix[1000:], expected)
+    assert vectors.search(ideas[2500]["title"], k=1)[0][1] == 2500
+    print("✅ Added idea vectors match a fresh transform")
+
+
+def main():
+    """Run all ANN index checks."""
+    tests = [
+        test_ivf_full_probe_matches_exact,
+        test_default_probes_recall_on_idea_vectors,
+        test_added_vectors_match_rebuilt,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} ANN index checks passed")
+
+
+if __name__ == "__main__":
+    main()
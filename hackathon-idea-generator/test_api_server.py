@@ -0,0 +1,133 @@
+"""
+Checks for the HTTP API server's request validation and backpressure.
+Runs offline against a fake model (no API key or model calls): python test_api_server.py
+"""
+
+import http.client
+import json
+import threading
+import time
+
+from api_server import MAX_RETRIEVE_K, create_server
+from load_test import FakeModelEngine
+
+
+class GatedEngine(FakeModelEngine):
+    """Fake engine whose model calls wait until the gate is opened."""
+
+    def __init__(self):
+        """Create the engine with a closed gate."""
+        super().__init__(model_latency=0)
+        self.gate = threading.Event()
+        self.calls = 0
+
+    def _generate_text(self, prompt: str) -> str:
+        """Count the call and wait for the gate."""
+        self.calls += 1
+        self.gate.wait(timeout=10)
+        return super()._generate_text(prompt)
+
+
+def start_server(engine=None, **kwargs):
+    """Serve on a free local port from a background thread."""
+    server = create_server(engine=engine or FakeModelEngine(model_latency=0), port=0, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def request(server, method, path, body=None, headers=None):
+    """Send one request and return (status, headers, decoded JSON)."""
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    try:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        connection.request(method, path, body=payload, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+
+
+def stop_server(server):
+    """Stop serving and shut the worker pool down."""
+    server.shutdown()
+    server.server_close()
+
+
+def test_malformed_requests_are_400():
+    """Wrongly typed fields, bad lengths and oversized requests are client errors."""
+    server = start_server(queue_size=4)
+    try:
+        for spec in ({"theme": 5}, {"topic": ["a"]}, {"tech_stack": [1, 2]}, {"tech_stack": "Rust"},
+                     {"team_size": 4}, {"unknown": "x"}):
+            status, _, payload = request(server, "POST", "/generate", spec)
+            assert status == 400, (spec, status, payload)
+            status, _, _ = request(server, "POST", "/batch", {"specs": [spec]})
+            assert status == 400, spec
+
+        for k in (0, MAX_RETRIEVE_K + 1, "3", True):
+            status, _, _ = request(server, "POST", "/retrieve", {"query": "voting", "k": k})
+            assert status == 400, k
+        status, _, payload = request(server, "POST", "/retrieve", {"query": "voting", "k": MAX_RETRIEVE_K})
+        assert status == 200 and payload["results"]
+
+        status, _, _ = request(server, "POST", "/retrieve", headers={"Content-Length": "abc"})
+        assert status == 400
+
+        # More specs than the queue holds could never be accepted, so no Retry-After
+        status, headers, _ = request(server, "POST", "/batch", {"specs": [{"theme": "Healthcare"}] * 5})
+        assert status == 400 and "Retry-After" not in headers
+        status, _, payload = request(server, "POST", "/batch", {"specs": [{"theme": "Healthcare"}] * 4})
+        assert status == 200 and all(result["ok"] for result in payload["results"])
+    finally:
+        stop_server(server)
+    print("✅ Malformed requests are answered with 400")
+
+
+def test_full_queue_is_429_and_timeouts_cancel():
+    """A full queue is answered with 429; a request that timed out is not run later."""
+    engine = GatedEngine()
+    server = start_server(engine, workers=1, queue_size=1, request_timeout=0.5)
+    try:
+        statuses = []
+        waiting = [
+            threading.Thread(target=lambda: statuses.append(request(server, "POST", "/generate", {})[0]))
+            for _ in range(2)
+        ]
+        waiting[0].start()
+        # One request runs on the only worker, the next one fills the queue
+        while server.pool.stats()["busy_workers"] < 1:
+            time.sleep(0.01)
+        waiting[1].start()
+        while server.pool.stats()["queue_depth"] < 1:
+            time.sleep(0.01)
+
+        status, headers, _ = request(server, "POST", "/generate", {})
+        assert status == 429 and headers["Retry-After"] == "1"
+
+        for thread in waiting:
+            thread.join()
+        assert sorted(statuses) == [504, 504]
+        engine.gate.set()
+        # The queued request was cancelled when it timed out, so only the first one ran
+        while server.pool.stats()["busy_workers"] or server.pool.stats()["queue_depth"]:
+            time.sleep(0.01)
+        assert engine.calls == 1
+    finally:
+        engine.gate.set()
+        stop_server(server)
+    print("✅ Full queues answer 429 and timed-out requests are cancelled")
+
+
+def main():
+    """Run all API server checks."""
+    tests = [
+        test_malformed_requests_are_400,
+        test_full_queue_is_429_and_timeouts_cancel,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} API server checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Checks for best-of-N generation and local candidate scoring.
+Runs offline against a fake model (no API key or model calls): python test_best_of.py
+"""
+
+import threading
+import time
+
+from candidate_ranking import REQUIRED_SECTIONS, facet_fit, section_coverage
+from load_test import FAKE_IDEA, FakeModelEngine
+from rag_engine import MAX_BEST_OF
+
+# Every section the prompt asks for, on the requested theme and stack
+COMPLETE_IDEA = "\n\n".join(
+    f"{i}. **{section}**: Solar-powered sustainability tracker built with Flutter."
+    for i, section in enumerate(REQUIRED_SECTIONS, 1)
+)
+
+
+class ScriptedEngine(FakeModelEngine):
+    """Fake engine answering with the given texts in turn; an Exception entry fails that call."""
+
+    def __init__(self, replies, model_latency=0.0):
+        """Queue the replies."""
+        super().__init__(model_latency=model_latency)
+        self.replies = list(replies)
+        self._lock = threading.Lock()
+
+    def _generate_text(self, prompt):
+        """Pretend to call the model and hand out the next reply."""
+        time.sleep(self.model_latency)
+        with self._lock:
+            reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def test_candidate_scores():
+    """Section coverage and facet fit reward complete, on-request ideas."""
+    assert section_coverage(COMPLETE_IDEA) == 1.0
+    assert section_coverage(FAKE_IDEA) == 2 / len(REQUIRED_SECTIONS)
+    assert facet_fit(COMPLETE_IDEA, theme="Sustainability", tech_stack=["Flutter"]) == 1.0
+    assert facet_fit(FAKE_IDEA, theme="Sustainability", tech_stack=["Flutter"]) == 0.0
+    assert facet_fit(FAKE_IDEA) == 1.0
+    print("✅ Candidates are scored on sections and requested facets")
+
+
+def test_best_candidate_returned():
+    """The best-scoring candidate is returned first, and failed calls are dropped."""
+    engine = ScriptedEngine([FAKE_IDEA, RuntimeError("quota"), COMPLETE_IDEA])
+    result = engine.generate_idea(theme="Sustainability", tech_stack=["Flutter"], best_of=3)
+    assert result["generated_idea"] == COMPLETE_IDEA
+    totals = [candidate["scores"]["total"] for candidate in result["candidates"]]
+    assert len(totals) == 2 and totals == sorted(totals, reverse=True)
+
+    engine = ScriptedEngine([RuntimeError("quota")] * 2)
+    try:
+        engine.generate_idea(theme="Sustainability", best_of=2)
+        assert False, "every candidate failed but an idea was returned"
+    except RuntimeError:
+        pass
+    for best_of in (0, MAX_BEST_OF + 1):
+        try:
+            engine.generate_idea(theme="Sustainability", best_of=best_of)
+            assert False, f"best_of={best_of} was accepted"
+        except ValueError:
+            pass
+    print("✅ Best-of-N returns the best candidate and survives failed calls")
+
+
+def test_candidates_generated_concurrently():
+    """N candidates take about one model call, also with several requests at once."""
+    latency = 0.2
+    engine = ScriptedEngine([FAKE_IDEA] * 13, model_latency=latency)
+    engine.generate_idea(theme="Education")
+    results = []
+
+    def generate():
+        results.append(engine.generate_idea(theme="Education", best_of=4))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=generate) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.perf_counter() - start < 2 * latency
+    assert [len(result["candidates"]) for result in results] == [4, 4, 4]
+    print("✅ Candidates of concurrent requests are generated in parallel")
+
+
+def main():
+    """Run all best-of-N checks."""
+    tests = [
+        test_candidate_scores,
+        test_best_candidate_returned,
+        test_candidates_generated_concurrently,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} best-of-N checks passed")
+
+
+if __name__ == "__main__":
+    main()
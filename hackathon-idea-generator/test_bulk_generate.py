@@ -0,0 +1,104 @@
+"""
+Checks for bulk generation and checkpoint resume.
+Runs offline against a fake model (no API key or model calls): python test_bulk_generate.py
+"""
+
+import json
+import os
+import tempfile
+
+from bulk_generate import load_checkpoint, read_specs, run_bulk, spec_key
+from load_test import FakeModelEngine
+
+SPECS = [
+    {"topic": "AI for climate change", "theme": "Sustainability"},
+    {"topic": "Blockchain voting", "theme": "Blockchain"},
+    {"topic": "AI for climate change", "theme": "Sustainability"},
+    {"topic": "Telemedicine", "theme": "Healthcare", "tech_stack": ["Flutter"]},
+]
+
+
+def write_jsonl(path, rows):
+    """Write one JSON value per line."""
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def read_records(path):
+    """Output records, one per line."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_skips_finished_specs():
+    """A second run only generates the specs the first one didn't finish, duplicates included."""
+    engine = FakeModelEngine(model_latency=0)
+    with tempfile.TemporaryDirectory() as directory:
+        specs_path = os.path.join(directory, "specs.jsonl")
+        output_path = os.path.join(directory, "ideas.jsonl")
+        write_jsonl(specs_path, SPECS)
+
+        counts = run_bulk(engine, specs_path, output_path, concurrency=2, limit=2, progress_every=0)
+        assert counts == {"skipped": 0, "ok": 2, "error": 0}
+        counts = run_bulk(engine, specs_path, output_path, concurrency=2, progress_every=0)
+        assert counts == {"skipped": 2, "ok": 2, "error": 0}
+
+        # The repeated spec was generated twice, under distinct keys
+        keys = [record["key"] for record in read_records(output_path)]
+        assert len(set(keys)) == len(SPECS)
+        assert spec_key(SPECS[0], 1) in keys and spec_key(SPECS[0], 2) in keys
+
+        # Keys don't depend on row numbers, so a row added on top doesn't re-run anything
+        write_jsonl(specs_path, [{"topic": "Smart campus", "theme": "Education"}] + SPECS)
+        counts = run_bulk(engine, specs_path, output_path, concurrency=2, progress_every=0)
+        assert counts == {"skipped": len(SPECS), "ok": 1, "error": 0}
+    print("✅ Re-runs resume from the checkpoint")
+
+
+def test_checkpoint_skips_bad_lines():
+    """Corrupt or keyless lines are skipped; only a partial last line is truncated."""
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, "ideas.jsonl")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"key": "a#1", "status": "ok"}) + "\n")
+            f.write("{not json\n")
+            f.write(json.dumps({"status": "ok"}) + "\n")
+            f.write(json.dumps(["not", "an", "object"]) + "\n")
+            f.write(json.dumps({"key": "b#1", "status": "error"}) + "\n")
+            f.write(json.dumps({"key": "c#1", "status": "ok"}) + "\n")
+            kept = f.tell()
+            f.write('{"key": "d#1", "sta')
+
+        assert load_checkpoint(output_path) == {"a#1", "c#1"}
+        assert os.path.getsize(output_path) == kept
+    print("✅ Checkpoint loading skips bad lines and truncates a partial one")
+
+
+def test_non_object_spec_is_reported_by_row():
+    """A JSONL spec that isn't an object fails with its row number."""
+    with tempfile.TemporaryDirectory() as directory:
+        specs_path = os.path.join(directory, "specs.jsonl")
+        write_jsonl(specs_path, [SPECS[0], ["AI", "Healthcare"]])
+        try:
+            list(read_specs(specs_path))
+            assert False, "a list spec was accepted"
+        except ValueError as e:
+            assert f"{specs_path}:2:" in str(e)
+    print("✅ Malformed specs are reported with their row")
+
+
+def main():
+    """Run all bulk generation checks."""
+    tests = [
+        test_resume_skips_finished_specs,
+        test_checkpoint_skips_bad_lines,
+        test_non_object_spec_is_reported_by_row,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} bulk generation checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Checks for compressed idea descriptions.
+Runs offline (no API key or model calls): python test_compressed_text.py
+"""
+
+import sys
+import threading
+
+from benchmark_text_store import synthetic_ideas
+from compressed_text import CompressedIdeas, CompressedTextStore
+from rag_engine import HackathonRAGEngine
+
+
+def test_compressed_ideas_round_trip():
+    """Compressed ideas read back exactly as stored."""
+    ideas = list(synthetic_ideas(3000, seed=5))
+    compressed = CompressedIdeas(ideas)
+    assert len(compressed) == len(ideas)
+    for position in (0, 1, 1234, 2999):
+        assert compressed[position] == ideas[position]
+    assert list(compressed) == ideas
+    assert all("description" not in idea for idea in compressed.all_metadata())
+    print("✅ Compressed ideas round-trip")
+
+
+def test_store_reads_while_appending():
+    """Texts read back while other threads append, the cache stays bounded and blocks are smaller."""
+    texts = [idea["description"] for idea in synthetic_ideas(3000, seed=14)]
+    store = CompressedTextStore(block_size=16, cache_blocks=4, train_size=500)
+    for text in texts[:1000]:
+        store.append(text)
+    errors = []
+
+    def read():
+        for position in range(0, 1000, 7):
+            if store[position] != texts[position]:
+                errors.append(position)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for text in texts[1000:]:
+        store.append(text)
+    for reader in readers:
+        reader.join()
+
+    assert not errors, errors[:5]
+    assert list(store) == texts
+    assert store.dictionary and len(store._cache) <= 4
+    assert store.nbytes < sum(sys.getsizeof(text) for text in texts) / 2
+    print("✅ Compressed store is readable while it grows")
+
+
+def test_engine_retrieval_unchanged():
+    """An engine with compressed text retrieves and formats the same ideas."""
+    ideas = list(synthetic_ideas(2000, seed=15))
+    engines = []
+    for compress_text in (False, True):
+        engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0, compress_text=compress_text)
+        engine.add_ideas(ideas)
+        engines.append(engine)
+    for query in ("blockchain voting", "mental health companion"):
+        for mode in ("keyword", "vector", "hybrid"):
+            plain, compressed = (engine.retrieve_similar_ideas(query, k=5, mode=mode) for engine in engines)
+            assert plain == compressed, (query, mode)
+    print("✅ Retrieval with compressed text matches plain text")
+
+
+def main():
+    """Run all compressed text checks."""
+    tests = [
+        test_compressed_ideas_round_trip,
+        test_store_reads_while_appending,
+        test_engine_retrieval_unchanged,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} compressed text checks passed")
+
+
+if __name__ == "__main__":
+    main()
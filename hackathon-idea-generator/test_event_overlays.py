@@ -0,0 +1,115 @@
+"""
+Checks for per-event overlays on the shared corpus.
+Runs offline (no API key or model calls): python test_event_overlays.py
+"""
+
+import threading
+
+from benchmark_text_store import synthetic_ideas
+from event_overlays import DELTA_OFFSET, EventOverlay
+from rag_engine import HackathonRAGEngine
+from test_api_server import request, start_server, stop_server
+
+
+def make_engine():
+    """Engine over the built-in knowledge base; no model calls are made."""
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0)
+    engine.initialize_knowledge_base()
+    return engine
+
+
+def test_overlay_tombstones_and_delta():
+    """An event hides excluded ideas and sees its own, leaving other events untouched."""
+    engine = make_engine()
+    query = "blockchain voting"
+    top_title = engine.retrieve_similar_ideas(query, k=1)[0]["metadata"]["title"]
+    delta_idea = {
+        "title": "ChainBallot - Blockchain Voting for Student Unions",
+        "description": "Blockchain voting for student union elections with verifiable ballots.",
+        "theme": "Blockchain",
+        "difficulty": "Beginner",
+        "tech_stack": ["Solidity"],
+        "team_size": "2-3",
+    }
+    engine.create_event("campus", ideas=[delta_idea], exclude=[top_title])
+
+    titles = [result["metadata"]["title"] for result in engine.retrieve_similar_ideas(query, k=5, event="campus")]
+    assert top_title not in titles
+    assert delta_idea["title"] in titles
+    shared = [result["metadata"]["title"] for result in engine.retrieve_similar_ideas(query, k=5)]
+    assert top_title in shared and delta_idea["title"] not in shared
+
+    overlay = EventOverlay("merge")
+    overlay.exclude([1])
+    merged = overlay.merge([(0.9, 1), (0.8, 2), (0.3, 3)], [(0.85, DELTA_OFFSET)], k=3)
+    assert merged == [(0.85, DELTA_OFFSET), (0.8, 2), (0.3, 3)]
+    print("✅ Event overlays apply tombstones and merge delta ideas")
+
+
+def test_overlay_extended_while_searched():
+    """Searches running while an event grows never fail and end up seeing every delta idea."""
+    engine = make_engine()
+    ideas = list(synthetic_ideas(300, seed=4))
+    engine.create_event("growing", ideas=ideas[:10])
+    errors = []
+    done = threading.Event()
+
+    def search(mode):
+        while not done.is_set():
+            try:
+                for result in engine.retrieve_similar_ideas("smart campus energy", k=5, mode=mode, event="growing"):
+                    assert result["metadata"]["title"]
+            except Exception as e:
+                errors.append(e)
+
+    readers = [threading.Thread(target=search, args=(mode,)) for mode in ("keyword", "vector", "hybrid")]
+    for reader in readers:
+        reader.start()
+    try:
+        for start in range(10, len(ideas), 10):
+            excluded = engine.ideas[start % len(engine.ideas)]["title"]
+            engine.create_event("growing", ideas=ideas[start:start + 10], exclude=[excluded])
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+
+    assert not errors, errors[:3]
+    overlay = engine.get_event("growing")
+    assert overlay.stats()["ideas"] == len(ideas)
+    last = ideas[-1]["title"]
+    assert last in [result["metadata"]["title"] for result in engine.retrieve_similar_ideas(last, k=3, event="growing")]
+    print("✅ Events can be extended while they are searched")
+
+
+def test_events_endpoint_validates_ideas():
+    """Event ideas with missing or wrongly typed fields are rejected with 400."""
+    server = start_server()
+    try:
+        idea = {"title": "T", "description": "D", "theme": "Education", "difficulty": "Beginner",
+                "tech_stack": ["Rust"], "team_size": "2-3"}
+        for bad in ({**idea, "tech_stack": "Rust"}, {**idea, "theme": 3}, {**idea, "title": ""},
+                    {key: value for key, value in idea.items() if key != "team_size"}):
+            status, _, _ = request(server, "POST", "/events", {"name": "hack", "ideas": [bad]})
+            assert status == 400, bad
+        status, _, payload = request(server, "POST", "/events", {"name": "hack", "ideas": [idea]})
+        assert status == 200 and payload["ideas"] == 1
+    finally:
+        stop_server(server)
+    print("✅ /events rejects malformed ideas")
+
+
+def main():
+    """Run all event overlay checks."""
+    tests = [
+        test_overlay_tombstones_and_delta,
+        test_overlay_extended_while_searched,
+        test_events_endpoint_validates_ideas,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} event overlay checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Checks for hybrid keyword + vector retrieval and reciprocal-rank fusion.
+Runs offline (no API key or model calls): python test_hybrid_search.py
+"""
+
+from hybrid_search import HybridRetriever, reciprocal_rank_fusion
+from rag_engine import HackathonRAGEngine
+
+
+def test_rrf_favours_ideas_ranked_high_everywhere():
+    """An idea near the top of both rankings beats ideas found by one side only."""
+    fused = reciprocal_rank_fusion([[(0.9, 7), (0.8, 3)], [(0.7, 7), (0.6, 5)]], k=3)
+    assert [position for _, position in fused] == [7, 3, 5]
+    assert fused[0][0] == 1.0
+    print("✅ Reciprocal-rank fusion favours ideas ranked high by both sides")
+
+
+def test_sequential_and_concurrent_fuse_alike():
+    """Running the sides back to back or concurrently fuses the same rankings."""
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0)
+    results = []
+    for concurrent in (False, True):
+        retriever = HybridRetriever(
+            lexical_search=lambda query, depth: engine._lexical_search(query, depth),
+            vector_search=lambda query, depth: engine._vector_search(query, depth),
+            concurrent=concurrent
+        )
+        timings = {}
+        results.append(retriever.search("blockchain voting", k=5, timings=timings))
+        retriever.shutdown()
+        assert timings["lexical_candidates"] and timings["vector_candidates"]
+    assert results[0] == results[1] and results[0]
+
+    # In-process engines run the sides back to back
+    assert not engine._get_hybrid().concurrent
+    print("✅ Sequential and concurrent hybrid retrieval fuse the same rankings")
+
+
+def main():
+    """Run all hybrid retrieval checks."""
+    tests = [
+        test_rrf_favours_ideas_ranked_high_everywhere,
+        test_sequential_and_concurrent_fuse_alike,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} hybrid retrieval checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Checks for the SQLite store of generated ideas.
+Runs offline (no API key or model calls): python test_idea_store.py
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+from idea_store import IdeaStore, extract_description, extract_title
+
+
+def make_result(title, theme="Education", tech_stack=("React",)):
+    """A generate_idea result as the engine returns it."""
+    return {
+        "generated_idea": f"1. **Title**: {title}\n\n2. **Description**: An idea about {title.lower()}.\n",
+        "parameters": {"topic": title, "theme": theme, "difficulty": "Beginner", "tech_stack": list(tech_stack)},
+        "similar_ideas": [],
+    }
+
+
+def test_extract_title_and_description():
+    """Section labels are found with the colon outside or inside the bold markers."""
+    for text in ("1. **Title**: Campus Swap\n2. **Description**: Trade textbooks.",
+                 "1. **Title:** Campus Swap\n2. **Description:** Trade textbooks.",
+                 "**title** Campus Swap\n2. **Description** Trade textbooks."):
+        assert extract_title(text) == "Campus Swap", text
+        assert extract_description(text) == "Trade textbooks.", text
+    assert extract_title("# Campus Swap\nMore text") == "Campus Swap"
+    print("✅ Titles and descriptions are extracted from both label styles")
+
+
+def test_search_facets_and_promote():
+    """Recorded ideas can be searched, counted by facet and promoted."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = IdeaStore(os.path.join(directory, "ideas.db"), flush_interval=0.01)
+        try:
+            first = store.record(make_result("Campus Swap"))
+            store.record(make_result("Clinic Queue", theme="Healthcare", tech_stack=("Flutter",)))
+            assert store.flush(timeout=5)
+
+            assert [idea["title"] for idea in store.search("campus")] == ["Campus Swap"]
+            assert [idea["title"] for idea in store.search(tech="flutter")] == ["Clinic Queue"]
+            counts = store.facet_counts(theme="Healthcare")
+            assert counts["theme"] == {"Healthcare": 1}
+            try:
+                store.facet_counts(**{"theme = theme OR 1=1 --": "x"})
+                assert False, "an unknown facet name reached the SQL"
+            except ValueError:
+                pass
+
+            promoted = store.promote(first)
+            assert promoted["title"] == "Campus Swap" and promoted["tech_stack"] == ["React"]
+            assert [idea["idea_id"] for idea in store.promoted_ideas()] == [first]
+        finally:
+            store.close()
+    print("✅ Stored ideas are searchable, countable and promotable")
+
+
+def test_close_closes_every_thread_connection():
+    """Connections opened by other threads are closed with the store."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = IdeaStore(os.path.join(directory, "ideas.db"))
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(store._connect()))
+        thread.start()
+        thread.join()
+        connections.append(store._connect())
+        store.close()
+        for conn in connections:
+            try:
+                conn.execute("SELECT 1")
+                assert False, "connection still open after close()"
+            except sqlite3.ProgrammingError:
+                pass
+        assert store.flush(timeout=1)
+    print("✅ Closing the store closes every thread's connection")
+
+
+def main():
+    """Run all idea store checks."""
+    tests = [
+        test_extract_title_and_description,
+        test_search_facets_and_promote,
+        test_close_closes_every_thread_connection,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} idea store checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Checks for recording and replaying model calls with a cassette.
+Runs offline against a fake model (no API key or model calls): python test_llm_cassette.py
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+from llm_cassette import Cassette, CassetteMiss, prompt_key
+from rag_engine import HackathonRAGEngine
+
+SPECS = [
+    {"theme": "Education", "difficulty": "Beginner"},
+    # Nothing matches these, so the context is filled with random ideas
+    {"topic": "zzqx"},
+    {"theme": "Social Impact", "difficulty": "Intermediate", "tech_stack": ["React Native", "Firebase"],
+     "team_size": "3-4", "custom_requirements": "Must help underprivileged communities and work offline"},
+]
+
+
+def make_engine(cassette):
+    """Unseeded engine whose model echoes the prompt's hash."""
+    engine = HackathonRAGEngine(gemini_api_key="test", cassette=cassette)
+    engine.initialize_knowledge_base()
+    engine._call_gemini = lambda prompt: f"idea for {prompt_key(prompt)}"
+    return engine
+
+
+def test_replay_matches_recording():
+    """A fresh engine replays every recorded prompt, random fallbacks included, in any order."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.cassette.gz")
+        cassette = Cassette(path, mode="record")
+        recorded = [make_engine(cassette).generate_idea(**spec)["generated_idea"] for spec in SPECS]
+        cassette.close()
+
+        for record in Cassette.read(path):
+            assert record["k"] == prompt_key(record["p"])
+
+        cassette = Cassette(path, mode="replay", latency_scale=0)
+        engine = make_engine(cassette)
+        engine._call_gemini = None
+        replayed = [engine.generate_idea(**spec)["generated_idea"] for spec in reversed(SPECS)]
+        assert replayed == list(reversed(recorded))
+        assert (cassette.hits, cassette.misses) == (len(SPECS), 0)
+    print("✅ Replayed prompts match the recorded ones")
+
+
+def test_recordings_rekeyed_from_prompts():
+    """Stored prompts decide the key on load; hash-only recordings still replay."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.cassette.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"k": "stale-key", "p": "first prompt", "r": "one", "ms": 1}) + "\n")
+            f.write(json.dumps({"k": prompt_key("second prompt"), "r": "two", "ms": 1}) + "\n")
+        cassette = Cassette(path, latency_scale=0)
+        assert cassette.play("first prompt", None) == "one"
+        assert cassette.play("second prompt", None) == "two"
+        try:
+            cassette.play("third prompt", None)
+            assert False, "an unrecorded prompt was answered"
+        except CassetteMiss:
+            pass
+    print("✅ Recordings are keyed by their stored prompt")
+
+
+def main():
+    """Run all cassette checks."""
+    tests = [
+        test_replay_matches_recording,
+        test_recordings_rekeyed_from_prompts,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} cassette checks passed")
+
+
+if __name__ == "__main__":
+    main()
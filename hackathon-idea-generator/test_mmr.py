@@ -0,0 +1,52 @@
+"""
+Checks for Maximal Marginal Relevance reranking of retrieved ideas.
+Runs offline (no API key or model calls): python test_mmr.py
+"""
+
+import numpy as np
+
+from knowledge_base import get_all_ideas
+from mmr import mmr_rerank
+from rag_engine import HackathonRAGEngine
+
+
+def test_mmr_rerank():
+    """MMR with lambda 1 keeps relevance order; with diversity on, near-duplicates are skipped."""
+    relevance = np.array([0.2, 0.9, 0.5, 0.7], dtype=np.float32)
+    vectors = np.eye(4, dtype=np.float32)
+    assert mmr_rerank(relevance, vectors, 3, mmr_lambda=1.0) == [1, 3, 2]
+
+    # Two near-duplicates: with diversity on, the second is skipped
+    vectors = np.array([[1, 0], [1, 0], [0, 1]], dtype=np.float32)
+    assert mmr_rerank(np.array([0.9, 0.85, 0.6], dtype=np.float32), vectors, 2, mmr_lambda=0.5) == [0, 2]
+    print("✅ MMR reranking balances relevance and diversity")
+
+
+def test_engine_context_skips_copies():
+    """The engine's reranking makes room for a different idea next to near-copies of the top one."""
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0)
+    original = get_all_ideas()[0]
+    engine.add_ideas([{**original, "title": f"{original['title']} {suffix}"} for suffix in ("Lite", "Plus")])
+    copies = {0, len(engine.ideas) - 2, len(engine.ideas) - 1}
+    candidates = engine._search(original["title"], k=10)
+
+    relevant = engine.rerank_diverse(candidates, k=3, mmr_lambda=1.0)
+    assert {position for _, position in relevant} == copies
+    diverse = engine.rerank_diverse(candidates, k=3, mmr_lambda=0.5)
+    assert diverse[0][1] == 0 and {position for _, position in diverse} - copies
+    print("✅ Engine reranking trades near-copies for variety")
+
+
+def main():
+    """Run all MMR checks."""
+    tests = [
+        test_mmr_rerank,
+        test_engine_context_skips_copies,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} MMR checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Checks for the query planner's hard and soft filters.
+Runs offline (no API key or model calls): python test_query_planner.py
+"""
+
+import copy
+
+from benchmark_text_store import synthetic_ideas
+from knowledge_base import get_all_ideas
+from query_planner import FacetIndex, QueryPlanner
+from rag_engine import HackathonRAGEngine
+from trigram_index import TrigramIndex
+
+
+def make_planner(ideas, hard_filters=("theme",)):
+    """Planner over a fresh text and facet index of the ideas."""
+    return QueryPlanner(TrigramIndex(ideas), FacetIndex(ideas), hard_filters=hard_filters)
+
+
+def make_engine(**kwargs):
+    """Engine over the built-in knowledge base; no model calls are made."""
+    return HackathonRAGEngine(gemini_api_key="test", random_seed=0, **kwargs)
+
+
+def test_plan_hard_and_soft_filters():
+    """Hard filters become candidates, soft ones only postings."""
+    ideas = get_all_ideas()
+    planner = make_planner(ideas)
+    plan = planner.plan("voting app", {"theme": "Blockchain", "difficulty": "Advanced"})
+
+    assert plan.hard == {"theme": "Blockchain"}
+    assert plan.soft == {"difficulty": "Advanced"}
+    assert plan.candidates == {i for i, idea in enumerate(ideas) if idea["theme"] == "Blockchain"}
+    assert plan.statistics["relaxed"] == []
+    for _, position in planner.execute(plan, k=10):
+        assert ideas[position]["theme"] == "Blockchain"
+    print("✅ Hard filters restrict results, soft filters only boost")
+
+
+def test_plan_relaxes_unmatched_hard_filters():
+    """A hard filter nothing matches is relaxed to soft, unless relax=False."""
+    planner = make_planner(get_all_ideas())
+    plan = planner.plan("voting app", {"theme": "Underwater Basket Weaving"})
+    assert plan.hard == {}
+    assert plan.candidates is None
+    assert plan.statistics["relaxed"] == ["theme"]
+    assert "theme" in plan.soft
+    assert planner.execute(plan, k=3)
+
+    strict = planner.plan("voting app", {"theme": "Underwater Basket Weaving"}, relax=False)
+    assert strict.hard and not strict.candidates
+    assert planner.execute(strict, k=3) == []
+    print("✅ Unmatched hard filters are relaxed to soft ones")
+
+
+def test_facet_first_equals_text_first():
+    """Both execution orders return the same ranking for the same plan."""
+    ideas = list(synthetic_ideas(2000, seed=3))
+    planner = make_planner(ideas, hard_filters=("theme", "difficulty"))
+    for text in ("carbon footprint tracker", "blockchain voting", "learning platform for students"):
+        plan = planner.plan(text, {"theme": "Education", "difficulty": "Beginner", "tech_stack": ["React"]})
+        assert plan.candidates
+        results = {}
+        for strategy in ("facet-first", "text-first"):
+            variant = copy.copy(plan)
+            variant.strategy = strategy
+            results[strategy] = planner.execute(variant, k=10)
+        assert results["facet-first"] == results["text-first"], text
+        assert results["facet-first"]
+    print("✅ Facet-first and text-first plans return identical results")
+
+
+def test_vector_search_honours_hard_filters():
+    """Vector and hybrid retrieval only return ideas passing the hard filters."""
+    engine = make_engine()
+    for mode in ("vector", "hybrid"):
+        plan = engine.plan_query("mobile app", theme="Blockchain")
+        scored = engine._search("mobile app", k=5, mode=mode, plan=plan)
+        assert scored
+        for _, position in scored:
+            assert engine.ideas[position]["theme"] == "Blockchain", mode
+    print("✅ Vector and hybrid retrieval honour hard filters")
+
+
+def main():
+    """Run all query planner checks."""
+    tests = [
+        test_plan_hard_and_soft_filters,
+        test_plan_relaxes_unmatched_hard_filters,
+        test_facet_first_equals_text_first,
+        test_vector_search_honours_hard_filters,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} query planner checks passed")
+
+
+if __name__ == "__main__":
+    main()
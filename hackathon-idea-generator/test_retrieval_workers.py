@@ -0,0 +1,77 @@
+"""
+Checks for the memory-mapped snapshots and the retrieval worker pool.
+Runs offline (no API key or model calls): python test_retrieval_workers.py
+"""
+
+import tempfile
+
+from benchmark_text_store import synthetic_ideas
+from query_planner import FacetIndex, QueryPlanner
+from rag_engine import HackathonRAGEngine
+from retrieval_workers import RetrievalWorkerPool
+from trigram_index import MappedTrigramIndex, TrigramIndex
+
+
+def test_mapped_index_matches_in_memory():
+    """A saved and memory-mapped keyword index plans and scores like the original."""
+    ideas = list(synthetic_ideas(1000, seed=11))
+    index = TrigramIndex(ideas)
+    with tempfile.TemporaryDirectory() as directory:
+        index.save(directory)
+        mapped = MappedTrigramIndex.load(directory)
+        facets = FacetIndex(ideas)
+        for text in ("blokchain votting", "carbon footprint", "mental health companion"):
+            assert mapped.search(text, k=10) == index.search(text, k=10), text
+            for strategy in ("facet-first", "text-first"):
+                results = []
+                for text_index in (index, mapped):
+                    planner = QueryPlanner(text_index, facets)
+                    plan = planner.plan(text, {"theme": "Education"})
+                    plan.strategy = strategy
+                    results.append(planner.execute(plan, k=10))
+                assert results[0] == results[1], (text, strategy)
+        del mapped
+    print("✅ Memory-mapped keyword index matches the in-memory one")
+
+
+def test_workers_warm_up_and_match_in_process():
+    """Every worker loads a published snapshot, and worker searches equal in-process ones."""
+    ideas = list(synthetic_ideas(2000, seed=12))
+    with tempfile.TemporaryDirectory() as directory:
+        pool = RetrievalWorkerPool(processes=2, snapshot_root=directory)
+        try:
+            engines = []
+            for workers in (None, pool):
+                engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0, retrieval_workers=workers)
+                engine.add_ideas(ideas)
+                engine.initialize_knowledge_base()
+                engines.append(engine)
+            local, remote = engines
+
+            snapshot = remote._get_snapshot()
+            for _ in range(5):
+                assert pool.warm_up(snapshot) == pool.processes
+
+            for mode in ("keyword", "vector", "hybrid"):
+                for query, filters in (("blockchain voting", {}), ("mental health", {"theme": "Healthcare"})):
+                    expected = local._search(query, k=5, mode=mode, plan=local.plan_query(query, **filters))
+                    actual = remote._search(query, k=5, mode=mode, plan=remote.plan_query(query, **filters))
+                    assert actual == expected, (mode, query)
+        finally:
+            pool.close()
+    print("✅ Worker pool warms every process and matches in-process retrieval")
+
+
+def main():
+    """Run all retrieval worker checks."""
+    tests = [
+        test_mapped_index_matches_in_memory,
+        test_workers_warm_up_and_match_in_process,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} retrieval worker checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Checks for weighted inspiration sampling and per-session cursors.
+Runs offline (no API key or model calls): python test_sampler.py
+"""
+
+import time
+
+from knowledge_base import get_all_ideas
+from rag_engine import HackathonRAGEngine
+from sampler import FRESHNESS_REFRESH, InspirationSampler, PermutationCursor
+
+
+def test_permutation_cursor_visits_each_once():
+    """Every cycle of the cursor is a permutation of the population."""
+    for size in (1, 7, 64, 1000):
+        cursor = PermutationCursor(size, seed=42)
+        for _ in range(2):
+            assert sorted(cursor.next() for _ in range(size)) == list(range(size))
+    print("✅ Permutation cursor visits every idea once per cycle")
+
+
+def test_inspiration_sampler():
+    """Draws stay inside the filtered positions and never repeat within a cycle."""
+    ideas = get_all_ideas()
+    positions = [i for i, idea in enumerate(ideas) if idea["difficulty"] == "Advanced"]
+    sampler = InspirationSampler(ideas, positions, seed=1)
+    cursor = PermutationCursor(seed=1)
+    drawn = [sampler.next_from(cursor) for _ in range(len(positions))]
+    assert sorted(drawn) == positions
+    assert all(sampler.sample() in positions for _ in range(50))
+
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0)
+    weights = engine._get_sampler(None, None, "popularity").weights
+    assert len(set(weights)) > 1 and min(weights) > 0
+    try:
+        InspirationSampler(ideas, weighting="popularity")
+        assert False, "popularity weighting without a popularity function"
+    except ValueError:
+        pass
+    print("✅ Inspiration sampler respects filters without repeats")
+
+
+def test_weighted_cycles_show_every_idea():
+    """With skewed weights a cycle still shows every idea once, heavier ones first."""
+    now = time.time()
+    # Undated ideas weigh DEFAULT_FRESHNESS, dated ones decay with age
+    ideas = [{"created_at": now - i * 86400} if i % 2 else {} for i in range(500)]
+    sampler = InspirationSampler(ideas, weighting="freshness", seed=0)
+    cursor = PermutationCursor(seed=3)
+    for _ in range(3):
+        drawn = [sampler.next_from(cursor) for _ in range(len(ideas))]
+        assert sorted(drawn) == list(range(len(ideas)))
+        first_half = sum(sampler.weights[p] for p in drawn[:250])
+        assert first_half > sum(sampler.weights[p] for p in drawn[250:])
+    print("✅ Weighted cycles cover every idea, heavier ones earlier")
+
+
+def test_freshness_sampler_rebuilt_as_weights_decay():
+    """Freshness weights are recomputed once the sampler is older than FRESHNESS_REFRESH."""
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0)
+    engine.add_ideas([{**get_all_ideas()[0], "title": "Fresh", "created_at": time.time()}])
+    sampler = engine._get_sampler(None, None, "freshness")
+    assert engine._get_sampler(None, None, "freshness") is sampler
+    assert not engine._get_sampler(None, None, "uniform").stale()
+
+    sampler.built_at -= FRESHNESS_REFRESH
+    rebuilt = engine._get_sampler(None, None, "freshness")
+    assert rebuilt is not sampler and not rebuilt.stale()
+    print("✅ Freshness samplers are rebuilt as their weights decay")
+
+
+def main():
+    """Run all sampler checks."""
+    tests = [
+        test_permutation_cursor_visits_each_once,
+        test_inspiration_sampler,
+        test_weighted_cycles_show_every_idea,
+        test_freshness_sampler_rebuilt_as_weights_decay,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} sampler checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Checks for per-session memory caps, spilling and eviction.
+Runs offline (no API key or model calls): python test_session_memory.py
+"""
+
+import os
+import tempfile
+import time
+
+from idea_store import IdeaStore
+from rag_engine import HackathonRAGEngine
+from session_memory import SessionRegistry, SessionSlot, cap_result, deep_sizeof
+
+
+def make_result(engine):
+    """A generate_idea result whose reference ideas come from the engine's corpus."""
+    similar = engine.retrieve_similar_ideas("blockchain voting", k=3)
+    return {"generated_idea": "An idea", "similar_ideas": similar}
+
+
+def test_session_registry_spill_and_purge():
+    """Idle results are spilled and restored, results left by an earlier run are purged."""
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0)
+    result = make_result(engine)
+    similar = result["similar_ideas"]
+    with tempfile.TemporaryDirectory() as directory:
+        store = IdeaStore(os.path.join(directory, "ideas.db"))
+        try:
+            store.save_session_result("stale", result)
+            registry = SessionRegistry(store, idle_ttl=0, forget_after=0)
+            assert registry.purged == 1 and store.load_session_result("stale") is None
+
+            registry = SessionRegistry(store, idle_ttl=60)
+            slot = SessionSlot()
+            registry.touch(slot)
+            registry.set_result(slot, result)
+            # Reference ideas keep their titles but not the corpus' own idea dicts
+            stored = registry.get_result(slot)
+            assert [idea["metadata"]["title"] for idea in stored["similar_ideas"]] == [
+                idea["metadata"]["title"] for idea in similar
+            ]
+            assert slot.result_bytes < deep_sizeof(result)
+
+            assert registry.sweep(now=time.time() + 120) == 1
+            assert slot.result is None and slot.spilled
+            assert registry.get_result(slot) == stored
+        finally:
+            store.close()
+    print("✅ Session registry spills, restores and purges results")
+
+
+def test_cap_result_keeps_generated_idea():
+    """Oversized results lose other candidates' texts first and always keep the idea."""
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0)
+    result = make_result(engine)
+    result["candidates"] = [{"generated_idea": "x" * 50000, "scores": {"total": 0.9 - i / 10}} for i in range(4)]
+    result["generated_idea"] = result["candidates"][0]["generated_idea"]
+
+    capped = cap_result(result, 80000)
+    assert capped["trimmed"] == ["candidates"] and deep_sizeof(capped) <= 80000
+    assert capped["generated_idea"] == result["generated_idea"]
+    assert [c["scores"] for c in capped["candidates"]] == [c["scores"] for c in result["candidates"]]
+    assert len(result["candidates"][1]["generated_idea"]) == 50000
+    assert cap_result(capped, 10 ** 6) is capped
+    print("✅ Capped results keep the generated idea")
+
+
+def test_long_idle_sessions_forgotten():
+    """Sessions idle past forget_after are dropped along with their spilled results."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = IdeaStore(os.path.join(directory, "ideas.db"))
+        try:
+            registry = SessionRegistry(store, idle_ttl=60, forget_after=600)
+            idle, active = SessionSlot(), SessionSlot()
+            for slot in (idle, active):
+                registry.touch(slot, state_bytes=100)
+                registry.set_result(slot, {"generated_idea": "An idea"})
+            assert registry.sweep(now=time.time() + 120) == 2
+            assert store.load_session_result(idle.session_id) is not None
+
+            idle.last_seen -= 1000
+            registry.sweep(now=time.time() + 120)
+            assert len(registry) == 1 and idle.result is None and not idle.spilled
+            assert store.load_session_result(idle.session_id) is None
+            assert registry.get_result(active) == {"generated_idea": "An idea"}
+        finally:
+            store.close()
+    print("✅ Long-idle sessions are forgotten with their spilled results")
+
+
+def main():
+    """Run all session memory checks."""
+    tests = [
+        test_session_registry_spill_and_purge,
+        test_cap_result_keeps_generated_idea,
+        test_long_idle_sessions_forgotten,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} session memory checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Checks for the tech-stack co-occurrence model and related-tech boosting.
+Runs offline (no API key or model calls): python test_tech_cooccurrence.py
+"""
+
+from compressed_text import CompressedIdeas
+from rag_engine import HackathonRAGEngine
+from tech_cooccurrence import SMOOTHING, TechCooccurrence
+
+IDEAS = [
+    {"theme": "Blockchain", "tech_stack": ["Solidity", "Web3.js", "React"]},
+    {"theme": "Blockchain", "tech_stack": ["Solidity", "Web3.js"]},
+    {"theme": "Healthcare", "tech_stack": ["React Native", "Firebase"]},
+    {"theme": "Healthcare", "tech_stack": ["React Native", "Firebase", "Python"]},
+    {"theme": "Education", "tech_stack": ["React", "Node.js"]},
+]
+
+
+def test_suggest_complements_selection():
+    """Suggestions are the selection's most frequent companions, or the theme's favourites."""
+    model = TechCooccurrence(IDEAS)
+    assert model.suggest(["solidity"])[0] == ("Web3.js", round(2 / (2 + SMOOTHING), 4))
+    assert [name for name, _ in model.suggest(["React Native"], limit=1)] == ["Firebase"]
+    # Nothing selected: the theme's most used technologies
+    assert [name for name, _ in model.suggest([], theme="Healthcare", limit=2)] == ["React Native", "Firebase"]
+    assert all(name != "Solidity" for name, _ in model.suggest(["Solidity"]))
+    print("✅ Suggestions complement the selected technologies")
+
+
+def test_affinity_ranges_from_zero_to_one():
+    """An idea using the selected technology scores 1, an unrelated stack 0."""
+    model = TechCooccurrence(IDEAS)
+    assert model.affinity(["Solidity"], ["solidity", "IPFS"]) == 1.0
+    assert 0 < model.affinity(["Solidity"], ["Web3.js"]) < 1
+    assert model.affinity(["Solidity"], ["Flutter"]) == 0.0
+    assert model.affinity([], ["Solidity"]) == 0.0
+    print("✅ Affinity scores how well a stack complements a selection")
+
+
+def test_boost_keeps_order_without_decompressing():
+    """Boosting reads tech stacks only and keeps boosted scores apart."""
+    engine = HackathonRAGEngine(gemini_api_key="test", random_seed=0, compress_text=True)
+    candidates = engine._search("mobile app", k=20)
+    reads = []
+    original = CompressedIdeas.__getitem__
+
+    def counting_getitem(self, position):
+        reads.append(position)
+        return original(self, position)
+
+    CompressedIdeas.__getitem__ = counting_getitem
+    try:
+        boosted = engine._boost_related_tech(candidates, ["React Native"])
+    finally:
+        CompressedIdeas.__getitem__ = original
+
+    assert not reads
+    assert sorted(position for _, position in boosted) == sorted(position for _, position in candidates)
+    scores = [score for score, _ in boosted]
+    assert scores == sorted(scores, reverse=True)
+    # Capping at 1 used to tie every idea boosted past it
+    assert scores.count(scores[0]) == 1
+    print("✅ Related-tech boosting skips descriptions and keeps a strict order")
+
+
+def main():
+    """Run all tech co-occurrence checks."""
+    tests = [
+        test_suggest_complements_selection,
+        test_affinity_ranges_from_zero_to_one,
+        test_boost_keeps_order_without_decompressing,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} tech co-occurrence checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Checks for the typo-tolerant trigram keyword index.
+Runs offline (no API key or model calls): python test_trigram_index.py
+"""
+
+from benchmark_text_store import synthetic_ideas
+from knowledge_base import get_all_ideas
+from trigram_index import TrigramIndex, tokenize, trigrams
+
+
+def test_tokens_and_trigrams():
+    """Names like c# and node.js stay whole, and words are padded once on each side."""
+    assert tokenize("Build it with Node.js, C# and IoT!") == ["build", "it", "with", "node.js", "c#", "and", "iot"]
+    assert trigrams("ai") == {"$ai", "ai$"}
+    assert trigrams("chain") == {"$ch", "cha", "hai", "ain", "in$"}
+    print("✅ Tokens keep tech names and trigrams have no '$$x' gram")
+
+
+def test_typos_and_prefixes_find_ideas():
+    """Misspelled and partly typed words match their vocabulary words; short words only exactly."""
+    index = TrigramIndex(get_all_ideas())
+    blockchain = index._token_ids["blockchain"]
+    assert blockchain in {token_id for token_id, _ in index.match_token("blokchain")}
+    assert (blockchain, 0.8) in index.match_token("block")
+    assert [index.vocabulary[token_id] for token_id, _ in index.match_token("iot")] == ["iot"]
+    assert index.match_token("iox") == []
+
+    top = index.search("helthcare blokchain", k=1)[0][1]
+    assert get_all_ideas()[top]["theme"] in ("Healthcare", "Blockchain")
+    print("✅ Typos and prefixes find their ideas")
+
+
+def test_added_ideas_match_rebuilt():
+    """Ideas added one at a time are scored as in an index built from scratch."""
+    ideas = list(synthetic_ideas(1500, seed=13))
+    incremental = TrigramIndex(ideas[:1000])
+    for idea in ideas[1000:]:
+        incremental.add(idea)
+    rebuilt = TrigramIndex(ideas)
+    for query in ("blokchain votting", "mental health companion", ideas[1200]["title"]):
+        assert incremental.search(query, k=10) == rebuilt.search(query, k=10), query
+    print("✅ Incrementally built index matches a rebuilt one")
+
+
+def main():
+    """Run all trigram index checks."""
+    tests = [
+        test_tokens_and_trigrams,
+        test_typos_and_prefixes_find_ideas,
+        test_added_ideas_match_rebuilt,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} trigram index checks passed")
+
+
+if __name__ == "__main__":
+    main()
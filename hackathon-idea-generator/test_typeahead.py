@@ -0,0 +1,63 @@
+"""
+Checks for topic typeahead completions.
+Runs offline (no API key or model calls): python test_typeahead.py
+"""
+
+from benchmark_text_store import synthetic_ideas
+from knowledge_base import get_all_ideas
+from test_api_server import request, start_server, stop_server
+from typeahead import MAX_COMPLETIONS, TopicCompleter
+
+
+def test_completions_ranked_by_popularity():
+    """Whole-text matches come first, then completions of the last word, most popular first."""
+    completer = TopicCompleter(get_all_ideas())
+    assert completer.complete("social im") == ["Social Impact"]
+    assert completer.complete("b", limit=2) == ["Blockchain", "Blockchain Education Game"]
+    assert all(completion.startswith("AI for He") for completion in completer.complete("AI for he"))
+    # The text itself, a finished word and unknown prefixes give nothing to add
+    assert "IoT" not in completer.complete("iot")
+    assert completer.complete("ai for ") == [] and completer.complete("zzz") == []
+    print("✅ Completions are ranked by popularity")
+
+
+def test_completer_add_matches_rebuild():
+    """Adding ideas one at a time gives the same completions as building from scratch."""
+    ideas = list(synthetic_ideas(1500, seed=7))
+    incremental = TopicCompleter(ideas[:1000])
+    for idea in ideas[1000:]:
+        incremental.add(idea)
+    rebuilt = TopicCompleter(ideas)
+    for prefix in ("b", "bl", "sm", "ai for cl", "social im", "react"):
+        assert incremental.complete(prefix) == rebuilt.complete(prefix), prefix
+    print("✅ Incremental typeahead matches a rebuilt one")
+
+
+def test_complete_endpoint():
+    """/complete returns completions and rejects limits outside 1..MAX_COMPLETIONS."""
+    server = start_server()
+    try:
+        status, _, payload = request(server, "GET", "/complete?q=social+im&limit=3")
+        assert status == 200 and payload == {"q": "social im", "completions": ["Social Impact"]}
+        for limit in ("0", str(MAX_COMPLETIONS + 1), "many"):
+            status, _, _ = request(server, "GET", f"/complete?q=b&limit={limit}")
+            assert status == 400, limit
+    finally:
+        stop_server(server)
+    print("✅ /complete serves completions and validates the limit")
+
+
+def main():
+    """Run all typeahead checks."""
+    tests = [
+        test_completions_ranked_by_popularity,
+        test_completer_add_matches_rebuild,
+        test_complete_endpoint,
+    ]
+    for test in tests:
+        test()
+    print(f"\n🎉 All {len(tests)} typeahead checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Lightweight text vectors for ideas, computed locally with NumPy.
+Uses hashed TF-IDF features (no embedding API calls, so no quota issues) to give
+every idea an L2-normalized vector; cosine similarity is then a dot product.
+"""
+
+import math
+import os
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ann_index import DEFAULT_N_PROBE, IVFIndex, exact_search
+from trigram_index import STOPWORDS, tokenize
+
+# Default number of hashed feature buckets
+DEFAULT_DIMENSIONS = 256
+
+# Rows reserved the first time ideas are added to a vector matrix
+MIN_CAPACITY = 1024
+
+
+def idea_text(idea: Dict) -> str:
+    """Text used to vectorize an idea (title and tech stack repeated for weight)."""
+    tech = " ".join(idea.get("tech_stack", []))
+    return f"{idea['title']} {idea['title']} {idea['theme']} {tech} {tech} {idea['description']}"
+
+
+class TextVectorizer:
+    """Hashed TF-IDF vectorizer with signed feature hashing."""
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        """Create a vectorizer with the given number of buckets."""
+        self.dimensions = dimensions
+        self.idf = np.ones(dimensions, dtype=np.float32)
+        self._bucket_cache = {}
+
+    def _bucket(self, token: str):
+        """Return (bucket, sign) for a token."""
+        cached = self._bucket_cache.get(token)
+        if cached is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            cached = (h % self.dimensions, 1.0 if (h >> 31) & 1 else -1.0)
+            if len(self._bucket_cache) < 200000:
+                self._bucket_cache[token] = cached
+        return cached
+
+    def _term_frequencies(self, text: str) -> np.ndarray:
+        """Signed, log-scaled term frequencies of a text."""
+        row = np.zeros(self.dimensions, dtype=np.float32)
+        counts = {}
+        for token in tokenize(text):
+            if token not in STOPWORDS:
+                counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            bucket, sign = self._bucket(token)
+            row[bucket] += sign * (1.0 + math.log(count))
+        return row
+
+    def fit(self, texts: Iterable[str]) -> np.ndarray:
+        """Learn bucket IDF weights from a corpus and return its vectors."""
+        rows = np.array([self._term_frequencies(text) for text in texts], dtype=np.float32)
+        if len(rows) == 0:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        document_frequency = np.count_nonzero(rows, axis=0)
+        self.idf = np.log((1.0 + len(rows)) / (1.0 + document_frequency)).astype(np.float32) + 1.0
+        return self._normalize(rows * self.idf)
+
+    def transform(self, texts: Iterable[str]) -> np.ndarray:
+        """Vectorize texts with the learned IDF weights."""
+        rows = np.array([self._term_frequencies(text) for text in texts], dtype=np.float32)
+        if len(rows) == 0:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return self._normalize(rows * self.idf)
+
+    @staticmethod
+    def _normalize(rows: np.ndarray) -> np.ndarray:
+        """L2-normalize rows, leaving all-zero rows as zeros."""
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return rows / norms
+
+
+class IdeaVectors:
+    """
+    Vectors for every idea in a corpus, kept in one contiguous matrix.
+
+    Added ideas go into spare rows of a larger buffer that doubles when full, so
+    adding is amortized O(1) per idea instead of copying the whole matrix.
+    """
+
+    def __init__(
+        self,
+        ideas: List[Dict],
+        dimensions: int = DEFAULT_DIMENSIONS,
+        vectorizer: Optional[TextVectorizer] = None
+    ):
+        """Vectorize the corpus, learning IDF weights unless a fitted vectorizer is given."""
+        if vectorizer is not None:
+            self.vectorizer = vectorizer
+            self.matrix = vectorizer.transform(idea_text(idea) for idea in ideas)
+        else:
+            self.vectorizer = TextVectorizer(dimensions)
+            self.matrix = self.vectorizer.fit(idea_text(idea) for idea in ideas)
+        self.size = len(self.matrix)
+        self.ann = None
+        # Allocated on the first add(); matrix is then a view of its first size rows
+        self._buffer = None
+    
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r", n_probe: int = DEFAULT_N_PROBE) -> "IdeaVectors":
+        """
+        Load vectors written by save().
+        
+        With mmap_mode="r" the matrix is memory-mapped read-only, so every process
+        that loads the same files shares a single copy.
+        """
+        vectors = cls.__new__(cls)
+        vectors.vectorizer = TextVectorizer()
+        vectors.vectorizer.idf = np.load(os.path.join(directory, "idf.npy"))
+        vectors.vectorizer.dimensions = len(vectors.vectorizer.idf)
+        vectors.matrix = np.load(os.path.join(directory, "matrix.npy"), mmap_mode=mmap_mode)
+        vectors.size = len(vectors.matrix)
+        vectors._buffer = None
+        ann_directory = os.path.join(directory, "ann")
+        vectors.ann = IVFIndex.load(ann_directory, n_probe, mmap_mode) if os.path.isdir(ann_directory) else None
+        return vectors
+    
+    def save(self, directory: str):
+        """Write the vectors (and ANN index, if built) as .npy files."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "idf.npy"), self.vectorizer.idf)
+        np.save(os.path.join(directory, "matrix.npy"), np.ascontiguousarray(self.matrix, dtype=np.float32))
+        if self.ann is not None:
+            self.ann.save(os.path.join(directory, "ann"))
+    
+    def build_ann(self, n_probe: int = DEFAULT_N_PROBE, **kwargs) -> IVFIndex:
+        """Build an approximate index so searches scan only a few clusters."""
+        self.ann = IVFIndex(n_probe=n_probe, **kwargs).build(self.matrix)
+        return self.ann
+
+    def add(self, ideas: List[Dict]):
+        """Vectorize more ideas with the existing IDF weights."""
+        if ideas:
+            rows = self.vectorizer.transform(idea_text(idea) for idea in ideas)
+            if self.ann is not None:
+                self.ann.add(rows, np.arange(self.size, self.size + len(rows)))
+            end = self.size + len(rows)
+            if self._buffer is None or len(self._buffer) < end:
+                capacity = max(end, 2 * self.size, MIN_CAPACITY)
+                buffer = np.empty((capacity, self.vectorizer.dimensions), dtype=np.float32)
+                buffer[:self.size] = self.matrix
+                self._buffer = buffer
+            # Rows past the current view are unused, so searches holding the old view are unaffected
+            self._buffer[self.size:end] = rows
+            self.matrix = self._buffer[:end]
+            self.size = end
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """Vectorize a free-text query."""
+        return self.vectorizer.transform([query])[0]
+
+    def search(self, query: str, k: int = 3, candidates: Optional[Sequence[int]] = None) -> List[Tuple[float, int]]:
+        """
+        Cosine search: (similarity, idea position) pairs, best first.
+        
+        Uses the ANN index if one was built; with candidates, scores exactly over just those ideas.
+        """
+        query_vector = self.encode_query(query)
+        if self.size == 0 or not query_vector.any():
+            return []
+        if candidates is not None:
+            positions = np.fromiter(candidates, dtype=np.int64)
+            results = [(score, int(positions[i])) for score, i in exact_search(self.matrix[positions], query_vector, k)]
+        elif self.ann is not None:
+            results = self.ann.search(query_vector, k)
+        else:
+            results = exact_search(self.matrix, query_vector, k)
+        return [(score, position) for score, position in results if score > 0]
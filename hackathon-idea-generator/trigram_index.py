@@ -0,0 +1,366 @@
+"""
+Character-trigram index for typo-tolerant keyword retrieval.
+Indexes the words of idea titles, descriptions, themes and tech stacks so that
+short tokens ("AI", "IoT", "AR") match exactly and misspelled words ("blokchain",
+"helthcare") still find their ideas.
+
+Query words are first matched against the vocabulary by trigram overlap, and only
+the best few candidates are checked with edit distance, so fuzzy matching stays
+fast on large corpora.
+"""
+
+import heapq
+import math
+import os
+import pickle
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Words that carry no meaning for retrieval
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have how in into is it its of on or that the
+their this to use uses using was were will with who what which your you our can
+theme difficulty technologies team size project idea app
+""".split())
+
+# How much a word counts depending on where it appears in an idea
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "theme": 2.0,
+    "tech_stack": 2.0,
+    "description": 1.0,
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, keeping names like 'c#' and 'node.js'."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(token: str) -> set:
+    """
+    Return the padded character trigrams of a token ('ai' -> {'$ai', 'ai$'}).
+
+    There is no '$$a' gram: every word starting with 'a' would share it, and its
+    huge postings list would dominate fuzzy lookups while adding little.
+    """
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Levenshtein distance, giving up early once it must exceed max_distance."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def max_edits(token: str) -> int:
+    """Number of typos tolerated for a query token of this length."""
+    if len(token) <= 3:
+        return 0
+    if len(token) <= 6:
+        return 1
+    return 2
+
+
+class TrigramIndex:
+    """Inverted index from words to ideas, with a trigram index over the words."""
+
+    def __init__(self, ideas: Iterable[Dict], candidate_limit: int = 12, min_overlap: float = 0.3):
+        """
+        Build the index.
+
+        Args:
+            ideas: Ideas in knowledge_base format
+            candidate_limit: Vocabulary words per query word checked with edit distance
+            min_overlap: Minimum trigram Dice overlap for a word to become a candidate
+        """
+        self.candidate_limit = candidate_limit
+        self.min_overlap = min_overlap
+        self.vocabulary: List[str] = []
+        self._token_ids: Dict[str, int] = {}
+        # token id -> list of (idea index, weighted term frequency)
+        self._postings: List[List[Tuple[int, float]]] = []
+        # idea index -> {token id: weighted term frequency}, for scoring single ideas
+        self._doc_terms: List[Dict[int, float]] = []
+        # trigram -> token ids containing it
+        self._trigram_postings: Dict[str, List[int]] = defaultdict(list)
+        self._trigram_counts: List[int] = []
+        self.size = 0
+        for idea in ideas:
+            self.add(idea)
+
+    def add(self, idea: Dict) -> int:
+        """Index one more idea and return its position."""
+        doc_id = self.size
+        self.size += 1
+        weights = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = idea.get(field, "")
+            if isinstance(value, list):
+                value = " ".join(value)
+            for token in tokenize(value):
+                if token not in STOPWORDS:
+                    weights[token] += weight
+        terms = {}
+        for token, weight in weights.items():
+            token_id = self._token_id(token)
+            self._postings[token_id].append((doc_id, weight))
+            terms[token_id] = weight
+        self._doc_terms.append(terms)
+        return doc_id
+
+    def _token_id(self, token: str) -> int:
+        """Return the id of a vocabulary word, adding it if new."""
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            token_id = len(self.vocabulary)
+            self._token_ids[token] = token_id
+            self.vocabulary.append(token)
+            self._postings.append([])
+            grams = trigrams(token)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_postings[gram].append(token_id)
+        return token_id
+
+    def idf(self, token_id: int) -> float:
+        """Inverse document frequency of a vocabulary word."""
+        return math.log(1 + self.size / len(self._postings[token_id]))
+
+    def match_token(self, token: str) -> List[Tuple[int, float]]:
+        """
+        Find vocabulary words matching a query word.
+
+        Returns (token id, similarity) pairs: 1.0 for an exact match, less for
+        prefixes ('block' -> 'blockchain') and typos ('blokchain' -> 'blockchain').
+        """
+        matches = []
+        exact = self._token_ids.get(token)
+        if exact is not None:
+            matches.append((exact, 1.0))
+
+        # Short words only match exactly; fuzzy matching them is mostly noise
+        if len(token) <= 3:
+            return matches
+
+        grams = trigrams(token)
+        overlap = Counter()
+        for gram in grams:
+            for token_id in self._trigram_postings.get(gram, ()):
+                overlap[token_id] += 1
+
+        candidates = []
+        for token_id, shared in overlap.items():
+            if token_id == exact:
+                continue
+            dice = 2.0 * shared / (len(grams) + self._trigram_counts[token_id])
+            if dice >= self.min_overlap:
+                candidates.append((dice, token_id))
+        candidates.sort(reverse=True)
+
+        allowed = max_edits(token)
+        for _, token_id in candidates[:self.candidate_limit]:
+            word = self.vocabulary[token_id]
+            if len(word) > len(token) and word.startswith(token):
+                matches.append((token_id, 0.8))
+                continue
+            distance = bounded_edit_distance(token, word, allowed)
+            if distance <= allowed:
+                matches.append((token_id, 1.0 - distance / max(len(token), len(word))))
+        return matches
+
+    def query_tokens(self, query: str) -> List[str]:
+        """Tokenize a query, dropping stopwords and duplicates."""
+        seen = []
+        for token in tokenize(query):
+            if token not in STOPWORDS and token not in seen:
+                seen.append(token)
+        return seen
+
+    def document_frequency(self, token_id: int) -> int:
+        """Number of ideas containing a vocabulary word."""
+        return len(self._postings[token_id])
+
+    def match_query(self, query: str) -> Tuple[List[Tuple[int, float]], float]:
+        """
+        Match every query word against the vocabulary.
+
+        Returns:
+            (token id, weight) pairs to score with, and the ideal score used to
+            normalize results into [0, 1]
+        """
+        weighted = []
+        ideal = 0.0
+        for token in self.query_tokens(query):
+            matches = self.match_token(token)
+            if not matches:
+                continue
+            ideal += max(self.idf(token_id) for token_id, _ in matches) * FIELD_WEIGHTS["title"]
+            for token_id, similarity in matches:
+                weighted.append((token_id, similarity * self.idf(token_id)))
+        return weighted, ideal
+
+    def score_postings(self, weighted: List[Tuple[int, float]], candidates: Optional[set] = None) -> Dict[int, float]:
+        """Score ideas by walking the postings of matched words (text-first)."""
+        scores = defaultdict(float)
+        for token_id, weight in weighted:
+            for doc_id, term_weight in self._postings[token_id]:
+                if candidates is None or doc_id in candidates:
+                    scores[doc_id] += weight * term_weight
+        return scores
+
+    def score_documents(self, weighted: List[Tuple[int, float]], doc_ids: Iterable[int]) -> Dict[int, float]:
+        """Score only the given ideas using their own term lists (facet-first)."""
+        scores = {}
+        for doc_id in doc_ids:
+            terms = self._doc_terms[doc_id]
+            score = sum(weight * terms[token_id] for token_id, weight in weighted if token_id in terms)
+            if score > 0:
+                scores[doc_id] = score
+        return scores
+
+    @staticmethod
+    def top_k(scores: Dict[int, float], k: int, ideal: float) -> List[Tuple[float, int]]:
+        """Best k (normalized score, idea position) pairs."""
+        if not scores or ideal <= 0:
+            return []
+        ranked = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(min(1.0, score / ideal), doc_id) for doc_id, score in ranked]
+
+    def search(self, query: str, k: int = 3, candidates: Optional[set] = None) -> List[Tuple[float, int]]:
+        """
+        Score ideas against a query.
+
+        Args:
+            query: Free-text query
+            k: Number of results to return
+            candidates: Only score ideas at these positions
+
+        Returns:
+            (similarity, idea position) pairs, best first, similarity in [0, 1]
+        """
+        weighted, ideal = self.match_query(query)
+        return self.top_k(self.score_postings(weighted, candidates), k, ideal)
+
+    def save(self, directory: str, size: Optional[int] = None):
+        """
+        Write the index as .npy files that MappedTrigramIndex can memory-map.
+
+        Postings and per-idea term lists become flat arrays with offsets; only the
+        vocabulary and its trigram postings are pickled.
+
+        Args:
+            directory: Where to write the files
+            size: Only write the first size ideas (defaults to all of them)
+        """
+        size = len(self._doc_terms) if size is None else size
+        vocabulary = self.vocabulary[:]
+        postings = [[(doc_id, weight) for doc_id, weight in self._postings[t] if doc_id < size] for t in range(len(vocabulary))]
+        doc_terms = self._doc_terms[:size]
+        os.makedirs(directory, exist_ok=True)
+        for name, rows in (("postings", postings), ("doc_terms", [list(terms.items()) for terms in doc_terms])):
+            lengths = [len(row) for row in rows]
+            np.save(os.path.join(directory, f"{name}_offsets.npy"), np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64))
+            np.save(os.path.join(directory, f"{name}_ids.npy"), np.fromiter((i for row in rows for i, _ in row), np.int32))
+            np.save(os.path.join(directory, f"{name}_weights.npy"), np.fromiter((w for row in rows for _, w in row), np.float32))
+        # Words whose ideas are all past size (added while saving) are left out of the lookups
+        state = {
+            "candidate_limit": self.candidate_limit,
+            "min_overlap": self.min_overlap,
+            "size": size,
+            "vocabulary": vocabulary,
+            "indexed": [token_id for token_id, row in enumerate(postings) if row],
+        }
+        with open(os.path.join(directory, "vocabulary.pkl"), "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class MappedTrigramIndex(TrigramIndex):
+    """
+    Read-only TrigramIndex loaded from files written by TrigramIndex.save().
+
+    Postings and term lists are memory-mapped, so processes that load the same
+    index share them through the page cache; each process only builds its own
+    vocabulary lookups.
+    """
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r") -> "MappedTrigramIndex":
+        """Load an index written by TrigramIndex.save()."""
+        with open(os.path.join(directory, "vocabulary.pkl"), "rb") as f:
+            state = pickle.load(f)
+        index = cls([], candidate_limit=state["candidate_limit"], min_overlap=state["min_overlap"])
+        index.size = state["size"]
+        index.vocabulary = state["vocabulary"]
+        index._trigram_counts = [len(trigrams(token)) for token in index.vocabulary]
+        for token_id in state["indexed"]:
+            token = index.vocabulary[token_id]
+            index._token_ids[token] = token_id
+            for gram in trigrams(token):
+                index._trigram_postings[gram].append(token_id)
+        for name in ("postings", "doc_terms"):
+            offsets = np.load(os.path.join(directory, f"{name}_offsets.npy"))
+            ids = np.load(os.path.join(directory, f"{name}_ids.npy"), mmap_mode=mmap_mode)
+            weights = np.load(os.path.join(directory, f"{name}_weights.npy"), mmap_mode=mmap_mode)
+            setattr(index, f"_{name}", (offsets, ids, weights))
+        return index
+
+    def add(self, idea: Dict) -> int:
+        """Mapped indexes are read-only."""
+        raise TypeError("A MappedTrigramIndex is read-only; rebuild and save a TrigramIndex instead.")
+
+    @staticmethod
+    def _row(arrays, row: int) -> Tuple[List[int], List[float]]:
+        """Ids and weights of one postings or term list."""
+        offsets, ids, weights = arrays
+        start, end = offsets[row], offsets[row + 1]
+        return ids[start:end].tolist(), weights[start:end].tolist()
+
+    def document_frequency(self, token_id: int) -> int:
+        """Number of ideas containing a vocabulary word."""
+        offsets = self._postings[0]
+        return int(offsets[token_id + 1] - offsets[token_id])
+
+    def idf(self, token_id: int) -> float:
+        """Inverse document frequency of a vocabulary word."""
+        return math.log(1 + self.size / self.document_frequency(token_id))
+
+    def score_postings(self, weighted: List[Tuple[int, float]], candidates: Optional[set] = None) -> Dict[int, float]:
+        """Score ideas by walking the postings of matched words (text-first)."""
+        scores = defaultdict(float)
+        for token_id, weight in weighted:
+            for doc_id, term_weight in zip(*self._row(self._postings, token_id)):
+                if candidates is None or doc_id in candidates:
+                    scores[doc_id] += weight * term_weight
+        return scores
+
+    def score_documents(self, weighted: List[Tuple[int, float]], doc_ids: Iterable[int]) -> Dict[int, float]:
+        """Score only the given ideas using their own term lists (facet-first)."""
+        scores = {}
+        for doc_id in doc_ids:
+            terms = dict(zip(*self._row(self._doc_terms, doc_id)))
+            score = sum(weight * terms[token_id] for token_id, weight in weighted if token_id in terms)
+            if score > 0:
+                scores[doc_id] = score
+        return scores
@@ -0,0 +1,159 @@
+"""
+Popularity-ranked typeahead completions for the topic input.
+
+Completion terms are title keywords, title phrases, themes and tech names, each
+scored by how many ideas use it. They are kept in one sorted array searched with
+bisect: a prefix maps to a contiguous slice of it. For short prefixes, whose slice
+is large, the best completions are precomputed at build time, so every lookup is
+either a cache hit or a scan of a small slice and takes microseconds.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from trigram_index import STOPWORDS
+
+# How much one idea using a term adds to its popularity, by where the term comes from
+TERM_WEIGHTS = {
+    "theme": 3.0,
+    "tech": 2.0,
+    "phrase": 1.5,
+    "keyword": 1.0,
+}
+
+# Most completions a lookup can return
+MAX_COMPLETIONS = 8
+
+# Prefix slices longer than this get their top completions precomputed
+SCAN_LIMIT = 64
+
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#]*(?:\.[A-Za-z0-9]+)*")
+
+
+def _terms_of(idea: Dict) -> Iterable[Tuple[str, str]]:
+    """(kind, display text) completion terms contributed by one idea."""
+    title = idea.get("title", "")
+    for word in _WORD_PATTERN.findall(title):
+        if len(word) > 1 and word.lower() not in STOPWORDS:
+            yield "keyword", word
+    # "BlockVote - Blockchain Voting System": the part after the name reads like a topic
+    if " - " in title:
+        yield "phrase", title.split(" - ", 1)[1].strip()
+    if idea.get("theme"):
+        yield "theme", idea["theme"]
+    for tech in idea.get("tech_stack") or []:
+        yield "tech", tech
+
+
+class TopicCompleter:
+    """Sorted array of completion terms with popularity-ranked prefix lookup."""
+
+    def __init__(self, ideas: Iterable[Dict] = (), max_results: int = MAX_COMPLETIONS):
+        """
+        Build the completer once from the corpus.
+
+        Args:
+            ideas: Ideas to take terms from (descriptions are not needed)
+            max_results: Most completions a lookup can return
+        """
+        self.max_results = max_results
+        self._scores: Dict[str, float] = Counter()
+        # Most common spelling of each term ("IoT" rather than "IOT")
+        spellings: Dict[str, Counter] = defaultdict(Counter)
+        self.size = 0
+        for idea in ideas:
+            self.size += 1
+            for kind, text in set(_terms_of(idea)):
+                key = text.lower()
+                self._scores[key] += TERM_WEIGHTS[kind]
+                spellings[key][text] += 1
+        self._keys: List[str] = sorted(self._scores)
+        self._terms: Dict[str, str] = {key: spellings[key].most_common(1)[0][0] for key in self._keys}
+        self._top: Dict[str, List[str]] = {}
+        self._precompute_top()
+
+    def __len__(self) -> int:
+        """Number of distinct completion terms."""
+        return len(self._keys)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        """Slice of the sorted keys that start with prefix."""
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + "\uffff")
+
+    def _best(self, lo: int, hi: int) -> List[str]:
+        """The most popular keys in a slice, best first."""
+        return heapq.nlargest(self.max_results, self._keys[lo:hi], key=self._scores.__getitem__)
+
+    def _precompute_top(self):
+        """Cache the best completions of every prefix whose slice is too long to scan."""
+        stack = sorted({key[:1] for key in self._keys})
+        while stack:
+            prefix = stack.pop()
+            lo, hi = self._range(prefix)
+            if hi - lo <= SCAN_LIMIT:
+                continue
+            self._top[prefix] = self._best(lo, hi)
+            depth = len(prefix) + 1
+            stack.extend({key[:depth] for key in self._keys[lo:hi] if len(key) >= depth})
+
+    def add(self, idea: Dict):
+        """Count a new idea's terms, updating only the cached prefixes they touch."""
+        self.size += 1
+        for kind, text in set(_terms_of(idea)):
+            key = text.lower()
+            if key not in self._scores:
+                insort(self._keys, key)
+                self._terms[key] = text
+            self._scores[key] += TERM_WEIGHTS[kind]
+            for depth in range(1, len(key) + 1):
+                prefix = key[:depth]
+                top = self._top.get(prefix)
+                if top is not None:
+                    if key not in top:
+                        top.append(key)
+                    top.sort(key=self._scores.__getitem__, reverse=True)
+                    del top[self.max_results:]
+                else:
+                    lo, hi = self._range(prefix)
+                    if hi - lo <= SCAN_LIMIT:
+                        # Longer prefixes have even shorter slices
+                        break
+                    self._top[prefix] = self._best(lo, hi)
+
+    def complete_term(self, prefix: str, limit: int = 5) -> List[str]:
+        """Most popular terms starting with prefix (case-insensitive)."""
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        best = self._top.get(prefix)
+        if best is None:
+            best = self._best(*self._range(prefix))
+        return [self._terms[key] for key in best[:limit]]
+
+    def complete(self, text: str, limit: int = 5) -> List[str]:
+        """
+        Completions for a partly typed topic.
+
+        The whole text is matched as a phrase ("social im" -> "Social Impact") and its
+        last word on its own ("AI for clim" -> "AI for Climate"); whole-text matches
+        come first.
+
+        Returns:
+            Full topic strings, without one identical to the text
+        """
+        stripped = text.strip()
+        if not stripped or text[-1:].isspace():
+            return []
+        completions = self.complete_term(stripped, limit)
+        head, _, last = stripped.rpartition(" ")
+        if head:
+            completions += [f"{head} {term}" for term in self.complete_term(last, limit)]
+        results, seen = [], {stripped.lower()}
+        for completion in completions:
+            if completion.lower() not in seen:
+                seen.add(completion.lower())
+                results.append(completion)
+        return results[:limit]